@@ -0,0 +1,316 @@
+import json
+import os
+import re
+import shlex
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from fuzzy_match import FuzzyMatcher
+
+# built-in apps, per OS a list of launch commands to try in order. On Linux a command is only
+# used when its program is installed; on Windows/macOS the first one is used as is.
+APP_MAP = {
+    "chrome": {
+        "windows": [["cmd", "/c", "start", "", "chrome"]],
+        "darwin": [["open", "-a", "Google Chrome"]],
+        "linux": [["google-chrome"], ["google-chrome-stable"], ["chromium"], ["chromium-browser"]],
+    },
+    "discord": {"windows": [["cmd", "/c", "start", "", "discord"]], "darwin": [["open", "-a", "Discord"]], "linux": [["discord"]]},
+    "spotify": {"windows": [["cmd", "/c", "start", "", "spotify"]], "darwin": [["open", "-a", "Spotify"]], "linux": [["spotify"]]},
+    "vscode": {"windows": [["cmd", "/c", "start", "", "code"]], "darwin": [["open", "-a", "Visual Studio Code"]], "linux": [["code"], ["codium"]]},
+    "terminal": {
+        "windows": [["cmd", "/c", "start", "", "cmd"]],
+        "darwin": [["open", "-a", "Terminal"]],
+        "linux": [["x-terminal-emulator"], ["gnome-terminal"], ["konsole"], ["xfce4-terminal"], ["xterm"]],
+    },
+    "notepad": {
+        "windows": [["notepad"]],
+        "darwin": [["open", "-a", "TextEdit"]],
+        "linux": [["gedit"], ["gnome-text-editor"], ["kate"], ["mousepad"], ["xed"]],
+    },
+    "whatsapp": {
+        "windows": [["cmd", "/c", "start", "", "whatsapp"]],
+        "darwin": [["open", "-a", "WhatsApp"]],
+        "linux": [["whatsapp-for-linux"], ["whatsapp-desktop"]],
+    },
+}
+
+# other ways people say the built-in names
+APP_ALIASES = {
+    "vs code": "vscode",
+    "visual studio code": "vscode",
+    "google chrome": "chrome",
+    "command prompt": "terminal",
+    "cmd": "terminal",
+    "note pad": "notepad",
+}
+
+FUZZY_THRESHOLD = 0.8
+CACHE_VERSION = 1
+REFRESH_EVERY = 2.0  # at most one directory check per this many seconds on lookup misses
+
+
+def app_key(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", " ", name.lower()).strip()
+
+
+@dataclass
+class AppEntry:
+    name: str
+    command: list[str]
+    source: str  # "builtin", "desktop", "app" (macOS bundle / Windows shortcut) or "path"
+
+
+def _desktop_dirs() -> list[Path]:
+    home = Path.home()
+    data_home = Path(os.environ.get("XDG_DATA_HOME") or home / ".local/share")
+    data_dirs = [Path(p) for p in (os.environ.get("XDG_DATA_DIRS") or "/usr/local/share:/usr/share").split(":") if p]
+    roots = [data_home, *data_dirs, home / ".local/share/flatpak/exports/share", Path("/var/lib/flatpak/exports/share")]
+    return list(dict.fromkeys(root / "applications" for root in roots))
+
+
+def _parse_desktop(path: Path) -> tuple[str, list[str]] | None:
+    # Name= and Exec= from the [Desktop Entry] group; hidden entries and non-apps are skipped
+    fields: dict[str, str] = {}
+    group = None
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                line = line.strip()
+                if line.startswith("["):
+                    if group == "[Desktop Entry]":
+                        break
+                    group = line
+                elif group == "[Desktop Entry]" and "=" in line:
+                    key, value = line.split("=", 1)
+                    fields.setdefault(key.strip(), value.strip())
+    except OSError:
+        return None
+    if fields.get("Type", "Application") != "Application" or fields.get("NoDisplay") == "true" or fields.get("Hidden") == "true":
+        return None
+    name, exec_line = fields.get("Name"), fields.get("Exec")
+    if not name or not exec_line:
+        return None
+    try:
+        # drop field codes (%u, %F, ...) that the launcher would fill in
+        command = [arg for arg in shlex.split(exec_line) if not re.fullmatch(r"%[a-zA-Z]", arg)]
+    except ValueError:
+        return None
+    return (name, command) if command else None
+
+
+def _scan_dir(system: str, kind: str, directory: Path) -> list[tuple[str, list[str], str]]:
+    entries = []
+    try:
+        items = list(os.scandir(directory))
+    except OSError:
+        return entries
+    exts = [e.lower() for e in os.environ.get("PATHEXT", ".EXE;.BAT;.CMD").split(";")] if system == "windows" else []
+    for item in items:
+        if kind == "path":
+            name = item.name
+            if system == "windows":
+                stem, ext = os.path.splitext(name)
+                if ext.lower() not in exts:
+                    continue
+                name = stem
+            elif not os.access(item.path, os.X_OK) or item.is_dir():
+                continue
+            entries.append((name, [item.path], "path"))
+        elif kind == "desktop" and item.name.endswith(".desktop"):
+            parsed = _parse_desktop(Path(item.path))
+            if parsed:
+                entries.append((parsed[0], parsed[1], "desktop"))
+        elif kind == "bundle" and item.name.endswith(".app"):
+            entries.append((item.name[:-4], ["open", "-a", item.path], "app"))
+        elif kind == "shortcuts":
+            if item.is_dir():
+                # Start Menu keeps most shortcuts one folder down ("Programs/<Vendor>/<App>.lnk")
+                entries += _scan_dir(system, kind, Path(item.path))
+            elif item.name.lower().endswith(".lnk"):
+                entries.append((item.name[:-4], ["cmd", "/c", "start", "", item.path], "app"))
+    return entries
+
+
+class AppIndex:
+    # Launchable apps by name: the built-in APP_MAP plus PATH executables, Linux .desktop entries,
+    # macOS .app bundles and Windows Start Menu shortcuts. Each scanned directory is cached on disk
+    # with its mtime, so a start only rescans directories that changed since the last run, and a
+    # lookup miss re-checks the mtimes (rate-limited) to pick up newly installed apps.
+    def __init__(self, system: str, cache_path: Path | str | None = "app_index.json"):
+        self.system = system
+        self.cache_path = Path(cache_path) if cache_path else None
+        self._dirs: dict[str, dict] = {}
+        self._exact: dict[str, AppEntry] = {}
+        self._compact: dict[str, AppEntry] = {}
+        self._words: dict[str, set[str]] = {}
+        self._spoken = FuzzyMatcher()
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._ready = threading.Event()
+        self._last_refresh = 0.0
+        self.rescanned = 0
+        self.build_ms = 0.0
+
+    def _sources(self) -> list[tuple[str, Path]]:
+        path_dirs = [Path(p) for p in os.environ.get("PATH", "").split(os.pathsep) if p]
+        sources = [("path", d) for d in dict.fromkeys(path_dirs)]
+        if self.system == "linux":
+            sources += [("desktop", d) for d in _desktop_dirs()]
+        elif self.system == "darwin":
+            sources += [("bundle", d) for d in (Path("/Applications"), Path("/System/Applications"), Path.home() / "Applications")]
+        elif self.system == "windows":
+            for root in (os.environ.get("APPDATA"), os.environ.get("PROGRAMDATA")):
+                if root:
+                    sources.append(("shortcuts", Path(root) / "Microsoft/Windows/Start Menu/Programs"))
+        return sources
+
+    def load(self):
+        started = time.perf_counter()
+        try:
+            self._refresh(self._read_cache())
+        finally:
+            self.build_ms = (time.perf_counter() - started) * 1000
+            self._ready.set()
+
+    def refresh(self) -> int:
+        # rescans directories whose mtime changed; returns how many were rescanned
+        return self._refresh(self._dirs)
+
+    def _refresh(self, known: dict[str, dict]) -> int:
+        with self._refresh_lock:
+            return self._refresh_locked(known)
+
+    def _refresh_locked(self, known: dict[str, dict]) -> int:
+        dirs: dict[str, dict] = {}
+        rescanned = 0
+        for kind, directory in self._sources():
+            try:
+                mtime = directory.stat().st_mtime
+            except OSError:
+                continue
+            key = f"{kind}:{directory}"
+            old = known.get(key)
+            if old and old["mtime"] == mtime:
+                dirs[key] = old
+                continue
+            dirs[key] = {"mtime": mtime, "entries": _scan_dir(self.system, kind, directory)}
+            rescanned += 1
+        self._last_refresh = time.monotonic()
+        if rescanned or dirs.keys() != self._dirs.keys() or not self._ready.is_set():
+            self._rebuild(dirs)
+        if rescanned or dirs.keys() != known.keys():
+            self._write_cache()
+        self.rescanned += rescanned
+        return rescanned
+
+    def _rebuild(self, dirs: dict[str, dict]):
+        exact: dict[str, AppEntry] = {}
+        entries = [e for d in dirs.values() for e in d["entries"]]
+        installed = {Path(cmd[0]).name for _n, cmd, source in entries if source == "path"}
+        # programs that only have a menu entry (e.g. /usr/share/code/code) still count as installed
+        launchers = {Path(cmd[0]).name: AppEntry(name, cmd, source) for name, cmd, source in entries if source == "desktop"}
+
+        def add(name: str, entry: AppEntry):
+            key = app_key(name)
+            if key:
+                # first one wins: built-ins, then desktop/app entries, then bare executables
+                exact.setdefault(key, entry)
+
+        for name, commands in APP_MAP.items():
+            for command in commands.get(self.system, []):
+                if self.system != "linux" or command[0] in installed:
+                    add(name, AppEntry(name, command, "builtin"))
+                    break
+                if command[0] in launchers:
+                    add(name, launchers[command[0]])
+                    break
+        for alias, name in APP_ALIASES.items():
+            if app_key(name) in exact:
+                add(alias, exact[app_key(name)])
+        ordered = sorted(entries, key=lambda e: e[2] == "path")
+        for name, command, source in ordered:
+            entry = AppEntry(name, command, source)
+            add(name, entry)
+            if source == "desktop":
+                # "Visual Studio Code" is also reachable by its program name ("code")
+                add(Path(command[0]).name, entry)
+        compact: dict[str, AppEntry] = {}
+        words: dict[str, set[str]] = {}
+        # loose matching (joined words, a subset of words, sound-alikes) only covers apps people say
+        # out loud; a bare PATH binary must be named exactly, or "shut down" would find shutdown
+        spoken = FuzzyMatcher()
+        for key, entry in exact.items():
+            if entry.source == "path":
+                continue
+            compact.setdefault(key.replace(" ", ""), entry)
+            for word in key.split():
+                words.setdefault(word, set()).add(key)
+            spoken.add(key, key)
+        with self._lock:
+            self._dirs, self._exact, self._compact, self._words, self._spoken = dirs, exact, compact, words, spoken
+
+    def lookup(self, name: str) -> AppEntry | None:
+        return self.resolve(name)[0]
+
+    def resolve(self, name: str) -> tuple[AppEntry | None, float]:
+        # (entry, confidence): 1.0 exact, 0.9 all words of a longer name, else the fuzzy score
+        self._ready.wait(5)
+        found = self._find(name)
+        if found[0] is None and time.monotonic() - self._last_refresh > REFRESH_EVERY and self.refresh():
+            found = self._find(name)
+        return found
+
+    def _find(self, name: str) -> tuple[AppEntry | None, float]:
+        key = app_key(name)
+        if not key:
+            return None, 0.0
+        with self._lock:
+            exact, compact, words, spoken = self._exact, self._compact, self._words, self._spoken
+        entry = exact.get(key) or compact.get(key.replace(" ", ""))
+        if entry:
+            return entry, 1.0
+        # every query word is a word of the name ("visual studio" -> "visual studio code"); shortest wins
+        sets = [words.get(word) for word in key.split()]
+        if all(sets):
+            candidates = set.intersection(*sets)
+            if candidates:
+                return exact[min(candidates, key=lambda k: (len(k), k))], 0.9
+        # misrecognized names ("disc cord", "spot if i")
+        match = spoken.best(key, FUZZY_THRESHOLD)
+        if match:
+            return exact[match.value], match.score
+        return None, 0.0
+
+    def names(self, spoken: bool = False) -> list[str]:
+        # spoken=True leaves out bare PATH binaries, which nobody says out loud
+        self._ready.wait(5)
+        with self._lock:
+            return [key for key, entry in self._exact.items() if not spoken or entry.source != "path"]
+
+    def _read_cache(self) -> dict[str, dict]:
+        if not self.cache_path:
+            return {}
+        try:
+            data = json.loads(self.cache_path.read_text())
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != CACHE_VERSION or data.get("system") != self.system:
+            return {}
+        return data.get("dirs", {})
+
+    def _write_cache(self):
+        if not self.cache_path:
+            return
+        tmp = self.cache_path.with_name(self.cache_path.name + ".tmp")
+        try:
+            tmp.write_text(json.dumps({"version": CACHE_VERSION, "system": self.system, "dirs": self._dirs}))
+            os.replace(tmp, self.cache_path)
+        except OSError as exc:
+            print(f"[apps] could not save index: {exc}")
+
+    def summary(self) -> str:
+        with self._lock:
+            return f"apps={len(self._exact)} dirs={len(self._dirs)} rescanned={self.rescanned} build={self.build_ms:.0f}ms"
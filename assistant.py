@@ -1,23 +1,51 @@
 import argparse
 import json
 import os
-import queue
+import signal
 import threading
-import tkinter.simpledialog as simpledialog
+import time
 from pathlib import Path
 from typing import Any
 
-import pyttsx3
-import sounddevice as sd
 from vosk import KaldiRecognizer, Model
 
+from audio_buffer import DROP_NEWEST, DROP_OLDEST, AudioRingBuffer, cbuffer
+from audio_files import wav_files, wav_sample_rate
 from automation import AutomationController
-from behavior import BehaviorEngine
-from gui import JarvisGUI
-from memory_store import MemoryStore
+from behavior import COMMAND_WORDS, FIXED_REPLIES, INTENTS, PROFILE_CHOICES, BehaviorEngine
+from command_grammar import CommandDecoder, command_phrases
+from gemini_planner import GEMINI_URL, GeminiPlanner
+from headless import HeadlessUI
+from ipc_server import DEFAULT_PORT, CommandServer
+from memory_store import BACKENDS, DURABILITY, open_memory_store
+from model_manager import MODEL_ALIASES, ModelManager
+from preferences import Preferences
+from replay import ReplayMetrics, replay_files, wait_for_idle
+from speech_queue import NORMAL, TTS_LANGUAGES, URGENT, SpeechQueue
+from startup_profile import StartupProfile
+from task_executor import TaskExecutor, current_task
+from text_input import STRATEGIES
+from tts_cache import PhraseCache
+from vad import VoiceActivityGate
+from wake_word import WAKE_WORD, WakeEvent, WakeWordDetector
+
+# speech output and the microphone are optional: --headless runs without them, and
+# sounddevice fails to import (OSError) when the PortAudio library is missing
+try:
+    import pyttsx3
+except Exception:
+    pyttsx3 = None
+
+try:
+    import sounddevice as sd
+except Exception:
+    sd = None
+
+PROCESS_START = time.perf_counter()
 
-WAKE_WORD = "jarvis"
 DEFAULT_SAMPLE_RATE = 16000
+AUDIO_BLOCKSIZE = 4000
+COMMAND_WINDOW_SECONDS = 8.0
 
 
 class JarvisAssistant:
@@ -28,47 +56,137 @@ class JarvisAssistant:
         mic_name: str | None = None,
         sample_rate: int | None = None,
         debug_asr: bool = False,
+        wake_stage: bool = True,
+        command_grammar: bool = True,
+        vad_options: dict[str, float] | None = None,
+        audio_buffer_blocks: int = 32,
+        audio_overflow: str = DROP_OLDEST,
+        replay: list[Path] | None = None,
+        replay_speed: float = 1.0,
+        replay_report: Path | None = None,
+        replay_all_models: bool = False,
+        profile_startup: bool = False,
+        model_cache_mb: float = 4096.0,
+        prewarm_models: list[str] | None = None,
+        tts_cache_dir: Path | None = Path("tts_cache"),
+        memory_backend: str = "sqlite",
+        memory_durability: str = "batch",
+        planner_url: str = GEMINI_URL,
+        plan_cache: Path | None = Path("plan_cache.json"),
+        plan_cache_ttl_hours: float = 168.0,
+        show_fps: bool = False,
+        animation: str = "full",
+        speculative_plans: bool = True,
+        planner_budget: float = 2.5,
+        headless: bool = False,
+        ipc_port: int | None = None,
+        ipc_socket: Path | None = None,
+        workers: int = 8,
+        typing: str = "auto",
+        typing_interval: float = 0.06,
     ):
+        self.startup = StartupProfile(profile_startup, PROCESS_START, {"window usable", "tts ready", "voice ready"})
         self.model_path = model_path
         self.mic_device = mic_device
         self.mic_name = mic_name
         self.sample_rate = sample_rate
         self.debug_asr = debug_asr
-
-        self.audio_queue: queue.Queue[bytes] = queue.Queue()
-        self.tts_queue: queue.Queue[str] = queue.Queue()
+        self.wake_stage = wake_stage
+        self.command_grammar = command_grammar
+        self.vad_options = vad_options
+
+        self.replay = replay
+        self.replay_speed = replay_speed
+        self.replay_report = replay_report
+        self.replay_all_models = replay_all_models
+        self.metrics: ReplayMetrics | None = ReplayMetrics() if replay else None
+
+        self.audio_buffer = AudioRingBuffer(audio_buffer_blocks, AUDIO_BLOCKSIZE * 2, audio_overflow)
+        self.tts_queue = SpeechQueue(on_interrupt=self._stop_speech)
         self.stop_event = threading.Event()
+        # commands and automation actions share one pool; "input" (keyboard/mouse) runs one at a time.
+        # Commands (manual, voice and IPC alike) wait for a "command" slot before they take a worker,
+        # so a chained command blocked on its steps always leaves workers free for those steps
+        self.executor = TaskExecutor(max_workers=workers, limits={"input": 1, "shell": 2, "command": max(1, workers // 2)})
+        self.headless = headless
+        self.ipc: CommandServer | None = None
 
         self.awaiting_command = False
         self.awaiting_profile_choice = False
         self.pending_action: tuple[str, str] | None = None
         self.current_task = ""
 
-        self.memory = MemoryStore("jarvis_memory.json")
-        self.automation = AutomationController()
-        self.behavior = BehaviorEngine(self)
-
-        self.tts_engine = pyttsx3.init()
+        with self.startup.phase("memory store"):
+            self.memory = open_memory_store(memory_backend, memory_durability)
+            self.prefs = Preferences(self.memory)
+        self.planner = GeminiPlanner(planner_url, plan_cache, ttl=plan_cache_ttl_hours * 3600)
+        self.speculative_plans = speculative_plans
+        self.planner_budget = planner_budget
+        with self.startup.phase("automation + behavior"):
+            self.automation = AutomationController(typing=typing, typing_interval=typing_interval)
+            self.automation.watch_prefs(self.prefs)
+            self.behavior = BehaviorEngine(self)
+
+        # TTS and the Vosk model load in the background so the window and manual input are usable at once
+        self.tts_busy = False
+        self._playing_clip = False
+        self.tts_engine = None
+        self.tts_ready = threading.Event()
+        self._tts_stop = threading.Event()
+        self.tts_rate = 178
+        self.tts_voice = ""
+        self.phrase_cache = PhraseCache(tts_cache_dir) if tts_cache_dir else None
         self.current_language = "english"
-        self.tts_engine.setProperty("rate", 178)
-        pref_lang = self.memory.get_pref("language") or "english"
-        self.set_tts_language(pref_lang, announce=False)
-        threading.Thread(target=self._tts_worker, daemon=True).start()
+        if headless:
+            # replies go to IPC clients as events instead of being spoken
+            self.tts_ready.set()
+            self.startup.milestone("tts ready")
+        else:
+            threading.Thread(target=self._tts_worker, daemon=True).start()
 
-        self.gui = JarvisGUI(self._on_manual_command)
+        if headless:
+            self.gui = HeadlessUI()
+        else:
+            from gui import JarvisGUI  # Tk is only imported when there is a window
+
+            with self.startup.phase("gui build"):
+                self.gui = JarvisGUI(self._on_manual_command, show_fps=show_fps, animation=animation)
         self.gui.root.protocol("WM_DELETE_WINDOW", self.shutdown)
-        self._ensure_one_time_gemini_prompt()
+        self.gui.root.after(0, self.startup.milestone, "window usable")
+        if not self.replay and not headless:
+            self.gui.root.after(100, self._ensure_one_time_gemini_prompt)
 
         self.voice_enabled = False
+        self.models = ModelManager(model_cache_mb)
+        self.prewarm_models = prewarm_models or []
         self.model: Model | None = None
+        self.active_model_path: Path | None = None
+        self._pending_stack: tuple | None = None
         self.recognizer: KaldiRecognizer | None = None
-        self._initialize_voice_recognition()
+        self.wake_detector: WakeWordDetector | None = None
+        self.command_decoder: CommandDecoder | None = None
+        self.vad: VoiceActivityGate | None = None
+        self._command_samples = 0
+        self._loading: tuple[str, float] | None = None
+        if headless and not self.replay:
+            # no microphone on a headless box; replay still runs the full voice pipeline
+            self.gui.set_mode("Headless - voice OFF")
+            self.startup.milestone("voice ready")
+        else:
+            self.gui.set_mode("Loading voice model…")
+            threading.Thread(target=self._initialize_voice_recognition, daemon=True).start()
 
+        if ipc_port is not None or ipc_socket:
+            self.ipc = CommandServer(self, ipc_port, ipc_socket)
+            self.ipc.start()
+            print(f"[ipc] {self.ipc.describe()}")
 
     def _ensure_one_time_gemini_prompt(self):
-        if self.memory.get_pref("gemini_prompted") == "yes":
+        if self.prefs.get("gemini_prompted"):
             return
 
+        import tkinter.simpledialog as simpledialog
+
         prompt = (
             "Optional setup for heavy 3-step+ tasks:\n"
             "Enter your Gemini API key now (leave blank to skip).\n"
@@ -76,14 +194,14 @@ class JarvisAssistant:
         )
         key = simpledialog.askstring("Jarvis Setup", prompt, parent=self.gui.root, show="*")
         if key and key.strip():
-            self.memory.set_pref("gemini_api_key", key.strip())
+            self.prefs.set("gemini_api_key", key.strip())
             self.say("Gemini key saved. I will only use it for heavy multi-step tasks, sir.")
         else:
             self.say("No Gemini key saved. I will run tasks locally, sir.")
-        self.memory.set_pref("gemini_prompted", "yes")
+        self.prefs.set("gemini_prompted", True)
 
     def _resolve_input_device(self) -> int | None:
-        if self.mic_name:
+        if self.mic_name and sd is not None:
             devices = sd.query_devices()
             for idx, dev in enumerate(devices):
                 if dev.get("max_input_channels", 0) > 0 and self.mic_name.lower() in str(dev.get("name", "")).lower():
@@ -93,7 +211,7 @@ class JarvisAssistant:
     def _resolve_sample_rate(self, device_index: int | None) -> int:
         if self.sample_rate:
             return int(self.sample_rate)
-        if device_index is not None:
+        if device_index is not None and sd is not None:
             try:
                 dev: dict[str, Any] = sd.query_devices(device_index)
                 default_sr = dev.get("default_samplerate")
@@ -105,41 +223,128 @@ class JarvisAssistant:
 
     def trace_decision(self, user_said: str, tool: str, reason: str):
         print(f"user said: '{user_said}' so i will use {tool} to {reason}")
+        if self.ipc:
+            self.ipc.emit("trace", tool=tool, reason=reason)
 
     def start_task(self, description: str):
         self.current_task = description
-        self.say(f"Starting task: {description}")
+        self.say(f"Starting task: {description}", key="status")
 
     def finish_task(self, message: str):
         self.current_task = ""
         self.say(message)
 
-    def say(self, text: str):
+    def cancel_tasks(self, task_id: int | None = None) -> str:
+        stopped = self.executor.cancel(task_id)
+        if task_id is not None and not stopped:
+            return f"There is no task {task_id}, sir."
+        self.tts_queue.clear()
+        self.current_task = ""
+        if not stopped:
+            return "Nothing is running, sir."
+        return f"Cancelled {stopped[0].name}, sir." if len(stopped) == 1 else f"Cancelled {len(stopped)} tasks, sir."
+
+    def describe_tasks(self) -> str:
+        me = current_task()
+        tasks = [t for t in self.executor.active() if t is not me]
+        if not tasks:
+            return "Nothing is running, sir."
+        return "; ".join(t.describe() for t in tasks)
+
+    def say(self, text: str, priority: int = NORMAL, key: str | None = None):
+        # key marks narration that a newer line with the same key supersedes while still queued
         self.gui.set_status(f"Jarvis: {text}")
         self.gui.pulse_speaking(0.85)
-        self.tts_queue.put(text)
+        if self.ipc:
+            self.ipc.emit("say", text=text)
+        if self.headless:
+            if self.metrics:
+                self.metrics.on_tts_start(text)
+            return
+        self.tts_queue.put(text, priority, key)
+
+    def _stop_speech(self):
+        # called from whichever thread barged in; pyttsx3 drivers are thread-affine, so the
+        # engine is only asked to stop from its own callbacks on the TTS thread (_on_tts_word)
+        self._tts_stop.set()
+        try:
+            if self._playing_clip:
+                sd.stop()
+        except Exception:
+            pass
+
+    def _on_tts_word(self, *_args, **_kwargs):
+        if self._tts_stop.is_set():
+            self.tts_engine.stop()
+
+    def _init_tts(self):
+        try:
+            if pyttsx3 is None:
+                raise RuntimeError("pyttsx3 is not installed")
+            with self.startup.phase("tts engine init"):
+                engine = pyttsx3.init()
+                engine.setProperty("rate", self.tts_rate)
+                engine.connect("started-utterance", self._on_tts_word)
+                engine.connect("started-word", self._on_tts_word)
+                self.tts_voice = str(engine.getProperty("voice") or "")
+            self.tts_engine = engine
+            with self.startup.phase("tts voice selection"):
+                self._apply_tts_language(self.prefs.get("language", "english"))
+            # later language changes (voice command or any other writer) switch the voice right away
+            self.prefs.subscribe("language", lambda _key, value: self._apply_tts_language(value))
+            if self.phrase_cache:
+                self.phrase_cache.warm(FIXED_REPLIES, self.tts_voice, self.tts_rate)
+        except Exception as exc:
+            print(f"[tts] speech output unavailable: {exc}")
+            self.tts_engine = None
+        finally:
+            self.tts_ready.set()
+            self.startup.milestone("tts ready")
+
+    def _wait_for_tts(self) -> bool:
+        if self.tts_engine is None:
+            self.tts_ready.wait(15)
+        return self.tts_engine is not None
 
     def _tts_worker(self):
+        self._init_tts()
         while not self.stop_event.is_set():
-            try:
-                text = self.tts_queue.get(timeout=0.2)
-            except queue.Empty:
+            # cleared before the next item becomes current, so a barge-in on it is never lost
+            self._tts_stop.clear()
+            item = self.tts_queue.get(timeout=0.2)
+            if item is None:
+                # idle: render one cached phrase at a time so queued speech is never held up for long
+                if self.phrase_cache and self.tts_engine and self.phrase_cache.has_pending():
+                    self.phrase_cache.render_next(self.tts_engine)
                 continue
+            text = item.text
             try:
-                self.gui.root.after(0, self.gui.set_speaking, True)
-                self.tts_engine.say(text)
-                self.tts_engine.runAndWait()
+                self.tts_busy = True
+                if self.metrics:
+                    self.metrics.on_tts_start(text)
+                self.gui.set_speaking(True)
+                clip = self.phrase_cache.get(text, self.tts_voice, self.tts_rate) if self.phrase_cache and sd is not None else None
+                if clip is not None:
+                    self._playing_clip = True
+                    sd.play(clip.samples, clip.sample_rate)
+                    sd.wait()
+                else:
+                    self.tts_engine.say(text)
+                    self.tts_engine.runAndWait()
             except Exception:
                 continue
             finally:
-                self.gui.root.after(0, self.gui.set_speaking, False)
+                self._playing_clip = False
+                self.tts_busy = False
+                self.tts_queue.done(item)
+                self.gui.set_speaking(False)
 
     def available_tts_languages(self) -> list[str]:
-        voices = self.tts_engine.getProperty("voices") or []
+        voices = (self.tts_engine.getProperty("voices") or []) if self._wait_for_tts() else []
         found = set()
         for v in voices:
             blob = f"{getattr(v, 'name', '')} {getattr(v, 'id', '')}".lower()
-            for lang in ["english", "hindi", "spanish", "french", "german", "italian", "japanese", "korean", "chinese", "arabic", "russian", "portuguese"]:
+            for lang in TTS_LANGUAGES:
                 if lang in blob:
                     found.add(lang)
         if not found:
@@ -155,21 +360,38 @@ class JarvisAssistant:
             "zh": "chinese", "cn": "chinese", "ar": "arabic", "ru": "russian", "pt": "portuguese",
         }
         target = aliases.get(target, target)
-        voices = self.tts_engine.getProperty("voices") or []
-        for v in voices:
-            blob = f"{getattr(v, 'name', '')} {getattr(v, 'id', '')}".lower()
-            if target in blob:
-                self.tts_engine.setProperty("voice", v.id)
-                self.current_language = target
-                self.memory.set_pref("language", target)
-                if announce:
-                    self.say(f"Language switched to {target} sir")
-                return True
+        if self._find_voice(target) is not None:
+            if self.prefs.get("language") == target:
+                self._apply_tts_language(target)
+            else:
+                self.prefs.set("language", target)
+            if announce:
+                self.say(f"Language switched to {target} sir")
+            return True
         if announce:
             langs = ", ".join(self.available_tts_languages())
             self.say(f"I could not find {target}. Available: {langs}")
         return False
 
+    def _find_voice(self, language: str):
+        voices = (self.tts_engine.getProperty("voices") or []) if self._wait_for_tts() else []
+        for v in voices:
+            blob = f"{getattr(v, 'name', '')} {getattr(v, 'id', '')}".lower()
+            if language in blob:
+                return v
+        return None
+
+    def _apply_tts_language(self, language: str) -> bool:
+        voice = self._find_voice(language)
+        if voice is None:
+            return False
+        self.tts_engine.setProperty("voice", voice.id)
+        self.tts_voice = str(voice.id)
+        if self.phrase_cache:
+            self.phrase_cache.warm(FIXED_REPLIES, self.tts_voice, self.tts_rate)
+        self.current_language = language
+        return True
+
     def _candidate_model_paths(self) -> list[Path]:
         candidates = []
         if self.model_path:
@@ -185,102 +407,347 @@ class JarvisAssistant:
         ]
         return candidates
 
-    def _initialize_voice_recognition(self):
-        self.mic_device = self._resolve_input_device()
-        self.sample_rate = self._resolve_sample_rate(self.mic_device)
+    def _available_model_paths(self) -> list[Path]:
+        return [p for p in self._candidate_model_paths() if p.exists() and (p / "am").exists() and (p / "conf").exists()]
+
+    def resolve_model(self, name: str) -> Path | None:
+        key = name.strip().lower()
+        key = MODEL_ALIASES.get(key, key).replace(" ", "-")
+        for path in self._available_model_paths():
+            if key in path.name.lower():
+                return path
+        path = Path(name.strip())
+        if (path / "am").exists() and (path / "conf").exists():
+            return path
+        return None
+
+    def _build_voice_stack(self, path: Path) -> tuple:
+        with self.startup.phase(f"vosk model load ({path.name})"):
+            model = self.models.get(path)
+        with self.startup.phase("recognizer create"):
+            recognizer = KaldiRecognizer(model, self.sample_rate)
+            recognizer.SetWords(True)
+        wake_detector = None
+        if self.wake_stage:
+            try:
+                with self.startup.phase("wake-word grammar"):
+                    wake_detector = WakeWordDetector(model, self.sample_rate)
+            except Exception:
+                wake_detector = None
+        command_decoder = None
+        if wake_detector and self.command_grammar:
+            # the follow-up after the wake word is decoded against known commands first
+            try:
+                with self.startup.phase("command grammar"):
+                    command_decoder = CommandDecoder(model, self.sample_rate, self._command_phrases(), recognizer)
+            except Exception:
+                command_decoder = None
+        return path, model, recognizer, wake_detector, command_decoder
+
+    def _command_phrases(self) -> list[str]:
+        return command_phrases(
+            INTENTS,
+            verbs=COMMAND_WORDS,
+            apps=self.automation.apps.names(spoken=True),
+            models=MODEL_ALIASES,
+            languages=TTS_LANGUAGES,
+            profiles=[k for k in PROFILE_CHOICES if not k[-1].isdigit()],
+            extra=(WAKE_WORD,),
+        )
 
-        for path in self._candidate_model_paths():
-            if not (path.exists() and (path / "am").exists() and (path / "conf").exists()):
-                continue
+    def _apply_voice_stack(self, stack: tuple):
+        # only called from the thread that feeds audio (or before it starts), so decoding never sees a half swap
+        path, self.model, self.recognizer, self.wake_detector, self.command_decoder = stack
+        self.models.activate(path)
+        self.active_model_path = path
+        self.awaiting_command = False
+        if self.vad is None and self.vad_options is not None:
+            self.vad = VoiceActivityGate(self.sample_rate, **self.vad_options)
+
+    def _load_model(self, path: Path):
+        self._apply_voice_stack(self._build_voice_stack(path))
+
+    def switch_model(self, name: str) -> str:
+        path = self.resolve_model(name)
+        if path is None:
+            names = ", ".join(p.name for p in self._available_model_paths()) or "none"
+            return f"I could not find a voice model called {name}. Installed: {names}"
+        if path == self.active_model_path:
+            return f"{path.name} is already active sir."
+        if not self.models.is_loaded(path):
+            self.say(f"Loading {path.name} sir. I will keep listening with the current model meanwhile.")
+        try:
+            stack = self._build_voice_stack(path)
+        except Exception:
+            return f"I could not load {path.name}."
+        if self.voice_enabled:
+            self._pending_stack = stack
+        else:
+            self._apply_voice_stack(stack)
+            self.voice_enabled = True
+            threading.Thread(target=self._listen_loop, daemon=True).start()
+        self.gui.set_mode(f"Listening for wake word ({path.name})")
+        return f"Voice model switched to {path.name} sir."
+
+    def prewarm_model(self, name: str) -> str:
+        path = self.resolve_model(name)
+        if path is None:
+            return f"I could not find a voice model called {name}."
+        if self.models.is_loaded(path):
+            return f"{path.name} is already loaded sir."
+        self.models.prewarm(path)
+        return f"Warming up {path.name} in the background sir."
+
+    def _initialize_voice_recognition(self):
+        with self.startup.phase("audio device lookup"):
+            self.mic_device = self._resolve_input_device()
+            self.sample_rate = self._resolve_sample_rate(self.mic_device)
+
+        for path in self._available_model_paths():
+            polling = self._loading is not None
+            self._loading = (path.name, time.perf_counter())
+            if not polling:
+                # queued only once _loading is set, or the Tk thread could see None and never reschedule
+                self.gui.call(self._show_loading, key="loading")
             try:
-                self.model = Model(str(path))
-                self.recognizer = KaldiRecognizer(self.model, self.sample_rate)
-                self.recognizer.SetWords(True)
-                self.voice_enabled = True
-                self.gui.set_mode("Listening for wake word")
-                self.gui.set_status(
-                    f"Voice ON. Mic={self.mic_device if self.mic_device is not None else 'default'}, "
-                    f"sample_rate={self.sample_rate}. Listening for wake word '{WAKE_WORD}'."
-                )
-                return
+                self._load_model(path)
             except Exception:
                 continue
+            self._loading = None
+            self.voice_enabled = True
+            self.gui.set_mode("Listening for wake word")
+            self.gui.set_status(
+                f"Voice ON. Mic={self.mic_device if self.mic_device is not None else 'default'}, "
+                f"sample_rate={self.sample_rate}. Listening for wake word '{WAKE_WORD}'."
+            )
+            self.startup.milestone("voice ready")
+            threading.Thread(target=self._replay_loop if self.replay else self._listen_loop, daemon=True).start()
+            for name in self.prewarm_models:
+                print(f"[models] {self.prewarm_model(name)}")
+            return
 
+        self._loading = None
         self.voice_enabled = False
         self.gui.set_mode("Voice OFF - manual mode")
         self.gui.set_status("Voice OFF: model missing/invalid. Manual mode active.")
+        self.startup.milestone("voice ready")
+        if self.replay:
+            print("[replay] no usable Vosk model found")
+            self.gui.call(self.shutdown, key="shutdown")
+
+    def _show_loading(self):
+        if self._loading is None:
+            return
+        name, started = self._loading
+        self.gui.set_mode(f"Loading {name}… {time.perf_counter() - started:.0f}s")
+        self.gui.root.after(500, self._show_loading)
 
     def _on_manual_command(self, text: str):
         self.gui.set_heard(f"Manual: {text}")
-        threading.Thread(target=self.behavior.handle_command, args=(text,), daemon=True).start()
+        self.executor.submit(self.behavior.handle_command, text, name=text, resource="command")
 
     def _audio_callback(self, indata, _frames, _time_info, status):
         if status:
             print(status)
-        self.audio_queue.put(bytes(indata))
+        self.audio_buffer.put(indata)
 
-    def _handle_recognized_text(self, text: str):
+    def _handle_recognized_text(self, text: str, decoder: str = "open"):
         if self.debug_asr:
-            print(f"[asr-final] {text}")
-        self.gui.root.after(0, self.gui.set_heard, f"Heard: {text}")
+            print(f"[asr-final] ({decoder}) {text}")
+        if self.metrics:
+            self.metrics.on_final(text, decoder)
+        self.gui.set_heard(f"Heard: {text}")
         self._route_speech(text)
 
     def _listen_loop(self):
         if not self.recognizer:
             return
+        if sd is None:
+            self.voice_enabled = False
+            self.gui.set_mode("Voice OFF - manual mode")
+            self.gui.set_status("Voice OFF: sounddevice/PortAudio is not installed. Manual mode active.")
+            return
         try:
             with sd.RawInputStream(
                 samplerate=self.sample_rate,
-                blocksize=4000,
+                blocksize=AUDIO_BLOCKSIZE,
                 dtype="int16",
                 channels=1,
                 device=self.mic_device,
                 callback=self._audio_callback,
             ):
                 while not self.stop_event.is_set():
-                    data = self.audio_queue.get()
-
-                    # partial results improve wake-word responsiveness
-                    if self.recognizer.AcceptWaveform(data):
-                        result = json.loads(self.recognizer.Result())
-                        text = result.get("text", "").strip().lower()
-                        if text:
-                            self._handle_recognized_text(text)
-                    else:
-                        partial = json.loads(self.recognizer.PartialResult()).get("partial", "").strip().lower()
-                        if partial and self.debug_asr:
-                            print(f"[asr-partial] {partial}")
-                        if partial and WAKE_WORD in partial and not self.awaiting_command:
-                            self.awaiting_command = True
-                            self.say("Yes sir?")
+                    data = self.audio_buffer.get(timeout=0.2)
+                    if data is not None:
+                        self._process_audio(data)
         except Exception:
             self.voice_enabled = False
-            self.gui.root.after(0, self.gui.set_mode, "Voice OFF - manual mode")
-            self.gui.root.after(0, self.gui.set_status, "Voice OFF: microphone unavailable. Manual mode active.")
+            self.gui.set_mode("Voice OFF - manual mode")
+            self.gui.set_status("Voice OFF: microphone unavailable. Manual mode active.")
+
+    def _process_audio(self, data: memoryview | bytes):
+        if self._pending_stack is not None:
+            stack, self._pending_stack = self._pending_stack, None
+            self._apply_voice_stack(stack)
+
+        if self.wake_detector and self.awaiting_command:
+            self._command_samples += len(data) // 2
+            if self._command_samples > COMMAND_WINDOW_SECONDS * self.sample_rate:
+                # nothing usable heard after the wake word, go back to idle listening
+                self.awaiting_command = False
+                self.recognizer.Reset()
+                if self.command_decoder:
+                    self.command_decoder.reset()
+
+        if not self.vad:
+            self._process_block(data)
+            return
+        gated = self.vad.process(data)
+        for frame in gated.frames:
+            self._process_block(frame)
+        if gated.ended:
+            self._end_utterance()
+
+    def _process_block(self, data: memoryview | bytes):
+        # idle audio only goes through the wake-word grammar; the full recognizer wakes with it
+        if self.wake_detector and not self.awaiting_command:
+            event = self.wake_detector.accept(data)
+            if event:
+                self._on_wake_event(event, self.wake_detector.take_preroll())
+            return
+        self._decode(data)
+
+    def _end_utterance(self):
+        if self.wake_detector and not self.awaiting_command:
+            event = self.wake_detector.finish()
+            if event:
+                self._on_wake_event(event, [])
+            return
+        if self.command_decoder and self.awaiting_command:
+            text = self.command_decoder.finish().lower()
+            if text:
+                self._handle_recognized_text(text, self.command_decoder.last_decoder)
+            return
+        text = json.loads(self.recognizer.FinalResult()).get("text", "").strip().lower()
+        self.recognizer.Reset()
+        if text:
+            self._handle_recognized_text(text)
+
+    def _on_wake_event(self, event: WakeEvent, preroll: list[bytes]):
+        if self.debug_asr:
+            print(f"[wake] at {event.audio_position:.2f}s detect={event.detect_latency * 1000:.1f}ms")
+        self._on_wake_word()
+        self.recognizer.Reset()
+        if self.command_decoder:
+            self.command_decoder.reset()
+        self._command_samples = 0
+        for frame in preroll:
+            self._decode(frame)
+
+    def _decode(self, data: memoryview | bytes):
+        if self.command_decoder and self.awaiting_command:
+            text = self.command_decoder.accept(data)
+            if text:
+                self._handle_recognized_text(text.lower(), self.command_decoder.last_decoder)
+            elif text is None and self.debug_asr:
+                partial = self.command_decoder.partial()
+                if partial:
+                    print(f"[asr-partial] (grammar) {partial}")
+            return
+        # partial results improve wake-word responsiveness
+        if self.recognizer.AcceptWaveform(cbuffer(data)):
+            result = json.loads(self.recognizer.Result())
+            text = result.get("text", "").strip().lower()
+            if text:
+                self._handle_recognized_text(text)
+        elif self.debug_asr or not self.wake_detector:
+            partial = json.loads(self.recognizer.PartialResult()).get("partial", "").strip().lower()
+            if partial and self.debug_asr:
+                print(f"[asr-partial] {partial}")
+            if partial and WAKE_WORD in partial and not self.awaiting_command:
+                self._on_wake_word()
+
+    def _on_wake_word(self):
+        self.awaiting_command = True
+        if self.metrics:
+            self.metrics.on_wake()
+        # barge-in: drop queued narration and cut off whatever is being said
+        self.tts_queue.clear()
+        self.say("Yes sir?", priority=URGENT)
+
+    def _dispatch_command(self, text: str):
+        if self.metrics:
+            self.metrics.on_command()
+        self.executor.submit(self.behavior.handle_command, text, name=text, resource="command")
 
     def _route_speech(self, text: str):
         cleaned = self.behavior.cleanup(text)
         if self.awaiting_command:
+            if self.wake_detector and not cleaned:
+                # only the wake word itself was decoded (from pre-roll); keep waiting for the command
+                return
             self.awaiting_command = False
             if cleaned and cleaned != WAKE_WORD:
-                threading.Thread(target=self.behavior.handle_command, args=(cleaned,), daemon=True).start()
+                self._dispatch_command(cleaned)
             return
 
         if WAKE_WORD in cleaned:
             stripped = cleaned.replace(WAKE_WORD, "").strip()
             if stripped:
-                threading.Thread(target=self.behavior.handle_command, args=(stripped,), daemon=True).start()
+                self._dispatch_command(stripped)
             else:
-                self.awaiting_command = True
-                self.say("Yes sir?")
+                self._on_wake_word()
+
+    def _replay_loop(self):
+        paths = self._available_model_paths() if self.replay_all_models else [self.active_model_path]
+        for path in paths:
+            if path != self.active_model_path:
+                try:
+                    self._load_model(path)
+                except Exception:
+                    print(f"[replay] could not load {path}")
+                    continue
+            self.metrics.model = path.name
+            started = time.perf_counter()
+            replay_files(self, self.replay, self.replay_speed, AUDIO_BLOCKSIZE)
+            wait_for_idle(self)
+            print(f"[replay] {path.name}: {len(self.replay)} file(s) in {time.perf_counter() - started:.1f}s")
+        if self.replay_report:
+            self.metrics.write(self.replay_report)
+            print(f"[replay] wrote {len(self.metrics.rows)} utterance timing(s) to {self.replay_report}")
+        self.gui.call(self.shutdown, key="shutdown")
 
     def run(self):
-        if self.voice_enabled:
-            threading.Thread(target=self._listen_loop, daemon=True).start()
-        self.gui.root.mainloop()
+        if self.headless:
+            signal.signal(signal.SIGTERM, lambda *_: self.gui.call(self.shutdown, key="shutdown"))
+        try:
+            self.gui.root.mainloop()
+        except KeyboardInterrupt:
+            self.shutdown()
 
     def shutdown(self):
         self.stop_event.set()
+        if self.ipc:
+            print(f"[ipc] {self.ipc.summary()}")
+            self.ipc.close()
+        print(f"[audio] {self.audio_buffer.summary()}")
+        if self.vad:
+            print(f"[vad] {self.vad.summary()}")
+        if self.phrase_cache:
+            print(f"[tts-cache] {self.phrase_cache.summary()}")
+        print(f"[tts] {self.tts_queue.summary()}")
+        if self.command_decoder:
+            print(f"[grammar] {self.command_decoder.summary()}")
+        print(f"[planner] {self.planner.summary()}")
+        print(f"[ready] {self.automation.ready.summary()}")
+        print(f"[typing] {self.automation.text.summary()}")
+        print(f"[apps] {self.automation.apps.summary()}")
+        if not self.headless:
+            print(f"[gui] {self.gui.frame_stats()} {self.gui.ui.summary()}")
+        self.planner.close()
+        self.prefs.flush()
+        self.memory.close()
+        self.executor.shutdown()
         self.gui.root.destroy()
 
 
@@ -291,11 +758,48 @@ def parse_args():
     parser.add_argument("--mic-name", type=str, default=None, help="Microphone name substring (case-insensitive), e.g. 'headset'")
     parser.add_argument("--sample-rate", type=int, default=None, help="Input sample rate for recognition (defaults to selected mic native rate)")
     parser.add_argument("--debug-asr", action="store_true", help="Print partial/final speech recognition results to terminal")
+    parser.add_argument("--no-wake-stage", action="store_true", help="Decode all audio with the full recognizer instead of gating on a wake-word grammar")
+    parser.add_argument("--no-command-grammar", action="store_true", help="Decode the command after the wake word with the open-vocabulary recognizer only")
+    parser.add_argument("--no-vad", action="store_true", help="Send every audio block to the recognizer, silence included")
+    parser.add_argument("--vad-start-db", type=float, default=-42.0, help="Block level (dBFS) that starts an utterance")
+    parser.add_argument("--vad-stop-db", type=float, default=-48.0, help="Level (dBFS) the audio must stay under for the hangover to end an utterance")
+    parser.add_argument("--vad-hangover-ms", type=int, default=500, help="Quiet time before an utterance is considered finished")
+    parser.add_argument("--vad-preroll-ms", type=int, default=300, help="Audio kept from before speech onset and replayed into the recognizer")
+    parser.add_argument("--audio-buffer-blocks", type=int, default=32, help="Audio blocks buffered between the mic callback and the recognizer")
+    parser.add_argument("--audio-overflow", choices=[DROP_OLDEST, DROP_NEWEST], default=DROP_OLDEST, help="Which audio to drop when the recognizer falls behind")
+    parser.add_argument("--replay", type=Path, default=None, help="Feed a wav file (or a directory of wavs) through the voice pipeline instead of the mic")
+    parser.add_argument("--replay-speed", type=float, default=1.0, help="Replay speed multiplier; 0 replays as fast as possible")
+    parser.add_argument("--replay-report", type=Path, default=None, help="Write per-utterance timings to this .json or .csv file")
+    parser.add_argument("--replay-all-models", action="store_true", help="Repeat the replay for every installed Vosk model")
+    parser.add_argument("--profile-startup", action="store_true", help="Print a startup-time breakdown once the window, TTS, and voice model are ready")
+    parser.add_argument("--model-cache-mb", type=float, default=4096.0, help="Memory budget for Vosk models kept loaded for instant switching")
+    parser.add_argument("--prewarm-model", action="append", default=[], help="Model to load in the background after startup, e.g. 'large' or a model folder name (repeatable)")
+    parser.add_argument("--tts-cache-dir", type=Path, default=Path("tts_cache"), help="Folder for pre-rendered reply audio")
+    parser.add_argument("--no-tts-cache", action="store_true", help="Synthesize every reply live instead of playing cached audio")
+    parser.add_argument("--memory-backend", choices=BACKENDS, default="sqlite", help="sqlite keeps every note with full-text recall; json keeps the last 100 in jarvis_memory.json")
+    parser.add_argument("--memory-durability", choices=DURABILITY, default="batch", help="async: OS-buffered, batch: fsync each journal batch, sync: each write waits for fsync")
+    parser.add_argument("--planner-url", type=str, default=GEMINI_URL, help="Gemini generateContent endpoint (point at a local stub server for testing)")
+    parser.add_argument("--plan-cache", type=Path, default=Path("plan_cache.json"), help="File that keeps Gemini plans between runs")
+    parser.add_argument("--plan-cache-ttl-hours", type=float, default=168.0, help="How long a cached plan stays valid")
+    parser.add_argument("--no-plan-cache", action="store_true", help="Keep planned steps in memory only")
+    parser.add_argument("--planner-budget", type=float, default=2.5, help="Seconds to wait for a Gemini plan before continuing with the local steps")
+    parser.add_argument("--no-speculation", action="store_true", help="Wait for the Gemini plan before starting any step")
+    parser.add_argument("--show-fps", action="store_true", help="Show the orb animation's frame rate and per-frame render time")
+    parser.add_argument("--low-power", action="store_true", help="Animate the orb at a lower frame rate")
+    parser.add_argument("--no-animation", action="store_true", help="Draw the orb once and never animate it (kiosk/headless)")
+    parser.add_argument("--typing", choices=STRATEGIES, default="auto", help="How automation enters text: clipboard paste, bulk keys, human-like typing, or auto (per target)")
+    parser.add_argument("--typing-interval", type=float, default=0.06, help="Average seconds between keys for --typing human")
+    parser.add_argument("--headless", action="store_true", help="Run without a window, speech output or microphone; commands come in over the IPC API")
+    parser.add_argument("--ipc-port", type=int, default=None, help=f"Accept commands on http://127.0.0.1:PORT (headless default {DEFAULT_PORT})")
+    parser.add_argument("--ipc-socket", type=Path, default=None, help="Accept commands on this Unix domain socket")
+    parser.add_argument("--workers", type=int, default=8, help="Worker threads for commands and automation tasks")
     parser.add_argument("--list-mics", action="store_true", help="List input microphone devices and exit")
     return parser.parse_args()
 
 
 def list_mics() -> None:
+    if sd is None:
+        raise SystemExit("sounddevice is not available (is the PortAudio library installed?)")
     for idx, dev in enumerate(sd.query_devices()):
         if dev.get("max_input_channels", 0) > 0:
             print(f"[{idx}] {dev.get('name')} (inputs={dev.get('max_input_channels')}, default_sr={dev.get('default_samplerate')})")
@@ -306,10 +810,48 @@ if __name__ == "__main__":
     if args.list_mics:
         list_mics()
         raise SystemExit(0)
+    replay = wav_files(args.replay) if args.replay else None
+    if args.headless and args.ipc_port is None and not args.ipc_socket and not replay:
+        args.ipc_port = DEFAULT_PORT
+    if replay and not args.sample_rate:
+        args.sample_rate = wav_sample_rate(replay[0])
     JarvisAssistant(
         model_path=args.model_path,
         mic_device=args.mic_device,
         mic_name=args.mic_name,
         sample_rate=args.sample_rate,
         debug_asr=args.debug_asr,
+        wake_stage=not args.no_wake_stage,
+        command_grammar=not args.no_command_grammar,
+        vad_options=None if args.no_vad else {
+            "start_db": args.vad_start_db,
+            "stop_db": args.vad_stop_db,
+            "hangover_ms": args.vad_hangover_ms,
+            "preroll_ms": args.vad_preroll_ms,
+        },
+        audio_buffer_blocks=args.audio_buffer_blocks,
+        audio_overflow=args.audio_overflow,
+        replay=replay,
+        replay_speed=args.replay_speed,
+        replay_report=args.replay_report,
+        replay_all_models=args.replay_all_models,
+        profile_startup=args.profile_startup,
+        model_cache_mb=args.model_cache_mb,
+        prewarm_models=args.prewarm_model,
+        tts_cache_dir=None if args.no_tts_cache else args.tts_cache_dir,
+        memory_backend=args.memory_backend,
+        memory_durability=args.memory_durability,
+        planner_url=args.planner_url,
+        plan_cache=None if args.no_plan_cache else args.plan_cache,
+        plan_cache_ttl_hours=args.plan_cache_ttl_hours,
+        show_fps=args.show_fps,
+        animation="off" if args.no_animation else "low-power" if args.low_power else "full",
+        speculative_plans=not args.no_speculation,
+        planner_budget=args.planner_budget,
+        headless=args.headless,
+        ipc_port=args.ipc_port,
+        ipc_socket=args.ipc_socket,
+        workers=args.workers,
+        typing=args.typing,
+        typing_interval=args.typing_interval,
     ).run()
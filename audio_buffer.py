@@ -0,0 +1,98 @@
+import threading
+import time
+from collections import deque
+
+try:
+    from cffi import FFI
+
+    _ffi = FFI()
+except Exception:
+    _ffi = None
+
+DROP_OLDEST = "drop-oldest"
+DROP_NEWEST = "drop-newest"
+
+
+def cbuffer(data):
+    # vosk's cffi binding takes bytes or cdata, not memoryview; wrap the slot without copying
+    if isinstance(data, bytes):
+        return data
+    if _ffi is None:
+        return bytes(data)
+    return _ffi.from_buffer(data)
+
+
+class AudioRingBuffer:
+    # Fixed pool of preallocated slots shared by the PortAudio callback (put) and the listen loop (get).
+    # get() hands out a memoryview into the slot, valid until the next get(); it is never overwritten
+    # before then, so a full buffer drops per policy instead of growing.
+    def __init__(self, slots: int = 32, slot_bytes: int = 8000, policy: str = DROP_OLDEST):
+        if slots < 2:
+            raise ValueError("ring buffer needs at least 2 slots")
+        if policy not in {DROP_OLDEST, DROP_NEWEST}:
+            raise ValueError(f"unknown overflow policy {policy!r}")
+        self.slots = slots
+        self.slot_bytes = slot_bytes
+        self.policy = policy
+        self._buf = bytearray(slots * slot_bytes)
+        self._view = memoryview(self._buf)
+        self._lengths = [0] * slots
+        self._stamps = [0.0] * slots
+        self._queue: deque[int] = deque()  # unread slots, oldest first
+        self._free = list(range(slots))
+        self._held: int | None = None  # slot currently lent out by get()
+        self._cond = threading.Condition(threading.Lock())
+
+        self.overruns = 0
+        self.truncated = 0
+        self.max_depth = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+
+    @property
+    def depth(self) -> int:
+        return len(self._queue)
+
+    def put(self, data) -> bool:
+        now = time.monotonic()
+        with self._cond:
+            if self._free:
+                idx = self._free.pop()
+            else:
+                self.overruns += 1
+                if self.policy == DROP_NEWEST:
+                    return False
+                # reuse the oldest unread slot; the one lent out by get() is never in the queue
+                idx = self._queue.popleft()
+            n = len(data)
+            if n > self.slot_bytes:
+                self.truncated += 1
+                n = self.slot_bytes
+            start = idx * self.slot_bytes
+            self._view[start:start + n] = memoryview(data).cast("B")[:n]
+            self._lengths[idx] = n
+            self._stamps[idx] = now
+            self._queue.append(idx)
+            self.max_depth = max(self.max_depth, len(self._queue))
+            self._cond.notify()
+        return True
+
+    def get(self, timeout: float | None = None) -> memoryview | None:
+        with self._cond:
+            if self._held is not None:
+                self._free.append(self._held)
+                self._held = None
+            if not self._queue and not self._cond.wait_for(lambda: self._queue, timeout):
+                return None
+            idx = self._queue.popleft()
+            self._held = idx
+            self.last_lag = time.monotonic() - self._stamps[idx]
+            self.max_lag = max(self.max_lag, self.last_lag)
+            start = idx * self.slot_bytes
+            return self._view[start:start + self._lengths[idx]]
+
+    def summary(self) -> str:
+        return (
+            f"depth={len(self._queue)}/{self.slots} max_depth={self.max_depth} overruns={self.overruns} "
+            f"lag={self.last_lag * 1000:.0f}ms max_lag={self.max_lag * 1000:.0f}ms policy={self.policy}"
+        )
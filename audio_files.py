@@ -0,0 +1,27 @@
+import wave
+from collections.abc import Iterator
+from pathlib import Path
+
+
+def wav_sample_rate(path: Path | str) -> int:
+    with wave.open(str(path), "rb") as wf:
+        return wf.getframerate()
+
+
+def iter_wav_blocks(path: Path | str, blocksize: int = 4000) -> Iterator[bytes]:
+    # yields raw int16 mono blocks, the same shape sd.RawInputStream hands to _audio_callback
+    with wave.open(str(path), "rb") as wf:
+        if wf.getnchannels() != 1 or wf.getsampwidth() != 2:
+            raise ValueError(f"{path}: expected mono 16-bit PCM wav")
+        while True:
+            data = wf.readframes(blocksize)
+            if not data:
+                return
+            yield data
+
+
+def wav_files(path: Path | str) -> list[Path]:
+    path = Path(path)
+    if path.is_dir():
+        return sorted(p for p in path.iterdir() if p.suffix.lower() == ".wav")
+    return [path]
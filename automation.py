@@ -1,11 +1,17 @@
 import platform
 import shlex
 import subprocess
+import threading
 import time
 import urllib.parse
 import webbrowser
 from pathlib import Path
 
+from app_index import AppIndex
+from readiness import Readiness
+from task_executor import cancelled
+from text_input import TextInjector
+
 try:
     import pyautogui
 except Exception:
@@ -13,55 +19,61 @@ except Exception:
 
 
 class AutomationController:
-    def __init__(self):
+    def __init__(self, windows=None, typing: str = "auto", typing_interval: float = 0.06, app_cache: Path | None = Path("app_index.json")):
         self.system = platform.system().lower()
+        self.chrome_profile: str | None = None
+        # app index loads from its cache (rescanning changed directories) without holding up startup
+        self.apps = AppIndex(self.system, app_cache)
+        threading.Thread(target=self.apps.load, name="app-index", daemon=True).start()
+        self._chrome_path: Path | None | bool = False
+        # windows: window provider for readiness checks (readiness.FakeWindowProvider in benchmarks)
+        self.ready = Readiness(windows)
+        self.text = TextInjector(self.system, typing, typing_interval)
+
+    def watch_prefs(self, prefs):
+        self.chrome_profile = prefs.get("chrome_profile")
+        prefs.subscribe("chrome_profile", lambda _key, value: setattr(self, "chrome_profile", value))
 
     def open_application(self, app_name: str) -> str:
+        return self._launch(app_name)[1]
+
+    def _launch(self, app_name: str) -> tuple[subprocess.Popen | None, str]:
         app_name = app_name.lower().strip()
-        app_map = {
-            "chrome": {"windows": ["cmd", "/c", "start", "", "chrome"], "darwin": ["open", "-a", "Google Chrome"], "linux": ["google-chrome"]},
-            "discord": {"windows": ["cmd", "/c", "start", "", "discord"], "darwin": ["open", "-a", "Discord"], "linux": ["discord"]},
-            "spotify": {"windows": ["cmd", "/c", "start", "", "spotify"], "darwin": ["open", "-a", "Spotify"], "linux": ["spotify"]},
-            "vscode": {"windows": ["cmd", "/c", "start", "", "code"], "darwin": ["open", "-a", "Visual Studio Code"], "linux": ["code"]},
-            "terminal": {"windows": ["cmd", "/c", "start", "", "cmd"], "darwin": ["open", "-a", "Terminal"], "linux": ["x-terminal-emulator"]},
-            "notepad": {"windows": ["notepad"], "darwin": ["open", "-a", "TextEdit"], "linux": ["gedit"]},
-            "whatsapp": {"windows": ["cmd", "/c", "start", "", "whatsapp"], "darwin": ["open", "-a", "WhatsApp"], "linux": ["whatsapp-for-linux"]},
-        }
+        entry = self.apps.lookup(app_name)
+        if entry is None:
+            # answered from the index; nothing is spawned for names that are not installed
+            return None, f"I could not find {app_name}. Tell me another app name and I will continue."
         try:
-            if app_name in app_map:
-                cmd = app_map[app_name].get(self.system)
-                if not cmd:
-                    return f"{app_name} is not mapped for this OS yet."
-                subprocess.Popen(cmd)
-                return f"Opening {app_name} sir"
-            if self.system == "windows":
-                subprocess.Popen(["cmd", "/c", "start", "", app_name])
-            elif self.system == "darwin":
-                subprocess.Popen(["open", "-a", app_name])
-            else:
-                subprocess.Popen([app_name])
-            return f"Trying to open {app_name} sir"
+            return subprocess.Popen(entry.command), f"Opening {entry.name} sir"
         except Exception:
-            return f"I could not find {app_name}. Tell me another app name and I will continue."
+            return None, f"I could not find {app_name}. Tell me another app name and I will continue."
 
     def send_whatsapp_message(self, contact_name: str, message: str) -> bool:
         contact_name = contact_name.strip()
         message = message.strip()
         if pyautogui and self.system in {"windows", "darwin", "linux"}:
             try:
-                self.open_application("whatsapp")
-                time.sleep(2.0)
-                # Search contact
+                before = self.ready.windows_before()
+                proc, _msg = self._launch("whatsapp")
+                if proc is None or not self.ready.wait_for_window("whatsapp", "whatsapp: window", timeout=15.0, fallback=2.0, proc=proc, before=before):
+                    raise RuntimeError("WhatsApp window did not appear")
+                # Search contact; each step waits for the screen to react instead of a fixed pause
+                before = self.ready.snapshot()
                 if self.system == "darwin":
                     pyautogui.hotkey("command", "f")
                 else:
                     pyautogui.hotkey("ctrl", "f")
-                time.sleep(0.25)
-                pyautogui.typewrite(contact_name, interval=0.06)
-                time.sleep(0.5)
+                self.ready.wait_for_change("whatsapp: search box", timeout=1.0, fallback=0.25, before=before)
+                before = self.ready.snapshot()
+                self.text.type(contact_name, "whatsapp search")
+                self.ready.wait_for_change("whatsapp: results", timeout=2.0, fallback=0.5, before=before)
+                before = self.ready.snapshot()
                 pyautogui.press("enter")
-                time.sleep(0.6)
-                pyautogui.typewrite(message, interval=0.06)
+                self.ready.wait_for_change("whatsapp: chat", timeout=2.0, fallback=0.6, before=before)
+                if cancelled():
+                    return False
+                if not self.text.type(message, "whatsapp message"):
+                    return False
                 pyautogui.press("enter")
                 return True
             except Exception:
@@ -76,23 +88,27 @@ class AutomationController:
         return False
 
     def _open_chrome(self, profile: str | None = None):
+        profile = profile or self.chrome_profile
         if self.system == "windows":
             cmd = ["cmd", "/c", "start", "", "chrome"]
             if profile:
                 cmd.append(f"--profile-directory={profile}")
-            subprocess.Popen(cmd)
-        elif self.system == "darwin":
-            subprocess.Popen(["open", "-a", "Google Chrome"])
-        else:
-            subprocess.Popen(["google-chrome"])
+            return subprocess.Popen(cmd)
+        entry = self.apps.lookup("chrome")
+        return subprocess.Popen(entry.command if entry else ["google-chrome"])
 
     def human_search(self, query: str, profile: str | None = None):
         if pyautogui:
             try:
-                self._open_chrome(profile)
-                time.sleep(1.2)
+                before = self.ready.windows_before()
+                proc = self._open_chrome(profile)
+                if not self.ready.wait_for_window("chrome", "search: chrome window", proc=proc, before=before):
+                    if cancelled():
+                        return
+                    raise RuntimeError("Chrome window did not appear")
                 pyautogui.hotkey("command", "l") if self.system == "darwin" else pyautogui.hotkey("ctrl", "l")
-                pyautogui.typewrite(query, interval=0.08)
+                if not self.text.type(query, "address bar"):
+                    return
                 pyautogui.press("enter")
                 return
             except Exception:
@@ -102,10 +118,15 @@ class AutomationController:
     def human_open_website(self, website: str, profile: str | None = None):
         if pyautogui:
             try:
-                self._open_chrome(profile)
-                time.sleep(1.2)
+                before = self.ready.windows_before()
+                proc = self._open_chrome(profile)
+                if not self.ready.wait_for_window("chrome", "open website: chrome window", proc=proc, before=before):
+                    if cancelled():
+                        return
+                    raise RuntimeError("Chrome window did not appear")
                 pyautogui.hotkey("command", "l") if self.system == "darwin" else pyautogui.hotkey("ctrl", "l")
-                pyautogui.typewrite(website, interval=0.08)
+                if not self.text.type(website, "address bar"):
+                    return
                 pyautogui.press("enter")
                 return
             except Exception:
@@ -114,12 +135,18 @@ class AutomationController:
 
     def open_and_type(self, app_name: str, text_to_type: str):
         if pyautogui and self.system == "windows":
+            before = self.ready.windows_before()
             pyautogui.hotkey("win", "r")
-            time.sleep(0.3)
-            pyautogui.typewrite("cmd" if app_name in {"terminal", "cmd"} else app_name, interval=0.06)
+            if not self.ready.wait_for_window("run", "open and type: run dialog", timeout=3.0, fallback=0.3, active_only=True, before=before):
+                return
+            self.text.type("cmd" if app_name in {"terminal", "cmd"} else app_name, "run dialog")
+            # the Run dialog counts as already open, so only the launched app's window is accepted
+            before = self.ready.windows_before()
             pyautogui.press("enter")
-            time.sleep(1.2)
-            pyautogui.typewrite(text_to_type, interval=0.06)
+            if not self.ready.wait_for_window(app_name, "open and type: app window", before=before):
+                return
+            if not self.text.type(text_to_type, app_name):
+                return
             if app_name in {"terminal", "cmd"}:
                 pyautogui.press("enter")
             return
@@ -127,11 +154,14 @@ class AutomationController:
 
     def search_in_chrome(self, query: str):
         url = f"https://www.google.com/search?q={urllib.parse.quote_plus(query)}"
-        for path in self.chrome_candidates():
-            if path.exists():
-                webbrowser.register("jarvis_chrome", None, webbrowser.BackgroundBrowser(str(path)))
-                webbrowser.get("jarvis_chrome").open_new_tab(url)
-                return
+        if self._chrome_path is False:
+            # looked up once; Chrome does not move between searches
+            self._chrome_path = next((p for p in self.chrome_candidates() if p.exists()), None)
+            if self._chrome_path:
+                webbrowser.register("jarvis_chrome", None, webbrowser.BackgroundBrowser(str(self._chrome_path)))
+        if self._chrome_path:
+            webbrowser.get("jarvis_chrome").open_new_tab(url)
+            return
         webbrowser.open_new_tab(url)
 
     def chrome_candidates(self) -> list[Path]:
@@ -146,7 +176,15 @@ class AutomationController:
 
     def run_command(self, cmd: str) -> str:
         try:
-            result = subprocess.run(shlex.split(cmd), capture_output=True, text=True, timeout=20)
-            return "Command completed." if result.returncode == 0 else "Command failed."
+            proc = subprocess.Popen(shlex.split(cmd), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
         except Exception:
             return "Unable to run that command."
+        # poll instead of blocking so a cancel (or the 20s limit) can kill the process
+        deadline = time.monotonic() + 20
+        while proc.poll() is None:
+            if cancelled() or time.monotonic() > deadline:
+                proc.kill()
+                proc.wait()
+                return "Command cancelled." if cancelled() else "Unable to run that command."
+            time.sleep(0.05)
+        return "Command completed." if proc.returncode == 0 else "Command failed."
@@ -1,13 +1,117 @@
-import json
 import re
-import threading
 from datetime import datetime
-from urllib import error, request
+
+from app_index import APP_ALIASES
+from fuzzy_match import FuzzyMatcher
+from gemini_planner import PlannerError
+from intent_router import Intent, IntentMatch, IntentRouter
+from speech_queue import URGENT
+from task_executor import DONE
+from task_plan import BARRIER, FREE, INPUT, LAUNCH, MEMORY_READ, MEMORY_WRITE, SHELL, SKIPPED, TaskPlan
+
+INPUT_TASK_TIMEOUT = 60.0
+
+# How each intent behaves inside a chained plan (see task_plan.WAITS_ON); unlisted intents are FREE.
+STEP_KINDS = {
+    "open": LAUNCH,
+    "implicit_open": LAUNCH,
+    "open_and_type": INPUT,
+    "search": INPUT,
+    "whatsapp_send_message": INPUT,
+    "run_command": SHELL,
+    "memory_read": MEMORY_READ,
+    "memory_recall": MEMORY_READ,
+    "memory_write": MEMORY_WRITE,
+    "language_switch": BARRIER,
+    "model_switch": BARRIER,
+    "cancel_tasks": BARRIER,
+}
+
+# Routing table for handle_command. Lower priority wins; order mirrors the original if-chain.
+INTENTS = [
+    Intent("cancel_tasks", 5, exact=frozenset({"cancel", "cancel that", "cancel it", "cancel task", "cancel tasks", "cancel all", "stop", "stop that", "stop it", "abort"})),
+    Intent("cancel_tasks", 6, pattern=r"^(?:cancel|stop|abort)\s+task\s+(\d+)$"),
+    Intent("task_chain", 10, keywords=(" and then ",)),
+    Intent("list_tasks", 15, exact=frozenset({"what are you doing", "running tasks", "list tasks", "show tasks", "tasks"})),
+    Intent("time_intent", 20, exact=frozenset({"time", "what is the time", "what s the time", "tell me the time"})),
+    Intent("identity_intent", 30, exact=frozenset({"who are you", "what are you", "who r you"})),
+    Intent("language_switch", 40, pattern=r"^(set|change|switch)\s+(language\s+to\s+)?(?P<lang>[a-z]+)$"),
+    Intent("language_switch", 50, pattern=r"^speak in (?P<lang>.*)$"),
+    Intent("language_list", 60, exact=frozenset({"what languages do you speak", "which languages do you speak", "languages", "list languages"})),
+    Intent("defensive_security_catalog", 70, exact=frozenset({"security tools", "cyber tools", "infosec tools", "what security tools do you support"})),
+    Intent("defensive_security_help", 80, keywords=(
+        "nmap", "ncat", "wireshark", "nikto", "skipfish", "wapiti", "owasp zap", "zap", "burpsuite", "burp suite", "autopsy", "binwalk",
+    )),
+    Intent("security_guard_sqlmap", 90, keywords=("sqlmap",)),
+    Intent("security_guard", 100, keywords=(
+        "hack", "hacking", "exploit", "payload", "sql injection", "ddos", "phishing",
+        "hydra", "sqlmap", "zphisher", "metasploit", "meterpreter", "bruteforce", "brute force", "mimikatz", "aircrack", "reaver", "john the ripper", "hashcat", "xsspy",
+    )),
+    # open whatsapp and search <name> contact and if you find her send her a hi
+    Intent("whatsapp_send_message", 110, pattern=r"^open\s+whatsapp\s+and\s+search\s+(.+?)\s+contact\s+and\s+if\s+you\s+find\s+.+?\s+send\s+.+?\s+(?:a\s+)?(.+)$"),
+    Intent("memory_write", 120, pattern=r"^remember\s+(.+)$"),
+    Intent("model_switch", 124, pattern=r"^(?:switch|change|use)\s+(?:to\s+)?(?:the\s+)?(?:voice\s+)?model\s+(?:to\s+)?(.+)$"),
+    Intent("model_switch", 125, pattern=r"^(?:switch\s+to|use)\s+(?:the\s+)?(.+?)\s+(?:voice\s+)?model$"),
+    Intent("model_prewarm", 126, pattern=r"^(?:prewarm|preload|warm\s+up)\s+(?:the\s+)?(.+?)(?:\s+(?:voice\s+)?model)?$"),
+    Intent("memory_recall", 128, pattern=r"^(?:recall|what did i say about|search (?:my )?notes? for)\s+(.+)$"),
+    Intent("memory_read", 130, exact=frozenset({"memory", "show memory", "what do you remember"})),
+    Intent("open_and_type", 140, pattern=r"^open\s+(.+?)\s+and\s+type\s+(.+)$"),
+    Intent("open", 150, pattern=r"^open (.*)$"),
+    Intent("search", 160, pattern=r"^search (.*)$"),
+    Intent("run_command", 170, pattern=r"^run (.*)$"),
+    Intent("implicit_open", 1000, catch_all=True),
+]
+
+# Leading command words worth correcting when the recognizer garbles them ("serch", "re member").
+# "run" is left out on purpose: a misheard word must never turn into a shell command.
+COMMAND_WORDS = ("open", "search", "remember", "recall", "cancel", "stop")
+
+# Answers to "which Chrome profile"; checked in order as substrings of the reply
+PROFILE_CHOICES = {
+    "default": "Default",
+    "profile 1": "Profile 1",
+    "profile one": "Profile 1",
+    "one": "Profile 1",
+    "1": "Profile 1",
+    "profile 2": "Profile 2",
+    "profile two": "Profile 2",
+    "two": "Profile 2",
+    "2": "Profile 2",
+}
+
+# Constant replies the TTS phrase cache renders ahead of time. Keep in sync with the handlers;
+# a stale entry only costs a cache miss.
+FIXED_REPLIES = (
+    "Yes sir?",
+    "Task completed sir.",
+    "Got it sir. I will remember that.",
+    "Done sir. Do you want me to continue with anything else?",
+    "Website opened sir. Want me to type anything there?",
+    "Search done sir. Should I open any result?",
+    "Command done sir.",
+    "I hit an obstacle. Tell me an alternative command or say cancel.",
+    "Sorry sir, I did not get that. Could you rephrase?",
+    "Please tell me profile 1, profile 2, or default.",
+    "Which Chrome profile should I use: profile 1, profile 2, or default?",
+    "I see multiple Chrome profiles possible. Which one should I open: profile 1, profile 2, or default?",
+    "I am Jarvis. I can open apps, search, type, run commands, and remember notes for you.",
+    "For authorized defensive workflows, I can help with nmap, ncat, wireshark, nikto, skipfish, wapiti, owasp zap, burp suite, autopsy, and binwalk.",
+    "Tell me a defensive goal and I will suggest safe next steps.",
+    "I can help with defensive and authorized use of tools like nmap, ncat, wireshark, nikto, wapiti, zap, burp suite, autopsy, and binwalk on your own systems.",
+    "Tell me your objective, like host discovery, service inventory, traffic inspection, or vulnerability review, and I will guide step by step.",
+    "I can’t help run sqlmap attacks or automate SQL injection exploitation.",
+    "I can help you with defensive SQL injection prevention: parameterized queries, input validation, least-privilege DB users, and safe test checklists for your own app.",
+    "I can only help with defensive, authorized security work. I cannot run or automate attack tools.",
+    "If you want, I can help with safe tasks like system hardening checks, patch audit steps, log review, and legal lab setup guidance.",
+)
 
 
 class BehaviorEngine:
     def __init__(self, app):
         self.app = app
+        self.router = IntentRouter(INTENTS)
+        self._handlers = {intent.name: getattr(self, f"_on_{intent.name}") for intent in self.router.intents}
+        self.command_words = FuzzyMatcher({word: word for word in COMMAND_WORDS})
 
     def cleanup(self, text: str) -> str:
         cleaned = re.sub(r"[^a-z0-9:/?&.=+_\- ]", " ", text.lower())
@@ -20,15 +124,7 @@ class BehaviorEngine:
         target = re.sub(r"^(app|application)\s+", "", target)
         target = re.sub(r"^(app|application)\s+(called|named)\s+", "", target)
         target = re.sub(r"^(called|named)\s+", "", target).strip()
-        alias = {
-            "vs code": "vscode",
-            "visual studio code": "vscode",
-            "google chrome": "chrome",
-            "command prompt": "terminal",
-            "cmd": "terminal",
-            "note pad": "notepad",
-        }
-        return alias.get(target, target)
+        return APP_ALIASES.get(target, target)
 
     def looks_like_website(self, text: str) -> bool:
         if " " in text or not text:
@@ -37,16 +133,7 @@ class BehaviorEngine:
 
     def resolve_profile(self, text: str):
         t = self.cleanup(text)
-        choices = {
-            "default": "Default",
-            "profile 1": "Profile 1",
-            "one": "Profile 1",
-            "1": "Profile 1",
-            "profile 2": "Profile 2",
-            "two": "Profile 2",
-            "2": "Profile 2",
-        }
-        for k, v in choices.items():
+        for k, v in PROFILE_CHOICES.items():
             if k in t:
                 return v
         return None
@@ -58,50 +145,60 @@ class BehaviorEngine:
         if len(raw_steps) < 3:
             return raw_steps
 
-        api_key = self.app.memory.get_pref("gemini_api_key")
+        api_key = self.app.prefs.get("gemini_api_key")
         if not api_key:
             self.app.say("This looks like a heavy multi-step task. Add a Gemini API key in memory to improve planning quality.")
             return raw_steps
 
-        self._trace(original_command, "gemini_planner", f"optimize {len(raw_steps)} step plan")
-        prompt = (
-            "You are planning desktop assistant actions. Return JSON only in the format "
-            "{\"steps\":[\"step one\",\"step two\"]}. Keep max 6 short action steps. "
-            f"User request: {original_command}"
-        )
-        payload = {
-            "contents": [{"parts": [{"text": prompt}]}],
-            "generationConfig": {"temperature": 0.2},
-        }
-        url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash:generateContent?key={api_key}"
+        # keyed on the cleaned command so "jarvis, open chrome ..." and "open chrome ..." share a plan
+        request = self.cleanup(original_command)
+        cached = self.app.planner.cached(request)
+        if cached is not None:
+            self._trace(original_command, "plan_cache", f"reuse cached {len(cached)} step plan")
+            steps = [self.cleanup(x) for x in cached if self.cleanup(x)]
+            return steps or raw_steps
 
+        self._trace(original_command, "gemini_planner", f"optimize {len(raw_steps)} step plan")
         try:
-            req = request.Request(
-                url,
-                data=json.dumps(payload).encode("utf-8"),
-                headers={"Content-Type": "application/json"},
-                method="POST",
-            )
-            with request.urlopen(req, timeout=20) as resp:
-                body = json.loads(resp.read().decode("utf-8"))
-            text = body["candidates"][0]["content"]["parts"][0]["text"].strip()
-            # tolerate markdown fenced json
-            text = text.replace("```json", "").replace("```", "").strip()
-            data = json.loads(text)
-            steps = [self.cleanup(x) for x in data.get("steps", []) if isinstance(x, str) and self.cleanup(x)]
-            if steps:
-                self.app.say("Heavy task planner is ready sir. Executing optimized steps.")
-                return steps[:6]
-        except (error.URLError, TimeoutError, KeyError, ValueError, json.JSONDecodeError):
+            planned = self.app.planner.plan(request, api_key)
+        except PlannerError:
             self.app.say("Planner failed, sir. I will continue with local step-by-step execution.")
+            return raw_steps
+        steps = [self.cleanup(x) for x in planned if self.cleanup(x)]
+        if steps:
+            self.app.say("Heavy task planner is ready sir. Executing optimized steps.")
+            return steps
         return raw_steps
 
+    def route(self, cmd: str) -> IntentMatch | None:
+        return self.router.route(cmd)
+
+    def route_fuzzy(self, cmd: str, trace: bool = True) -> tuple[str, IntentMatch]:
+        # when nothing but the catch-all matches, retry with a misheard leading command word fixed
+        routed = self.route(cmd)
+        if routed.name != "implicit_open":
+            return cmd, routed
+        words = cmd.split()
+        for n in (1, 2):
+            if len(words) <= n:
+                break
+            match = self.command_words.best(" ".join(words[:n]))
+            if match:
+                corrected = " ".join([match.value, *words[n:]])
+                rerouted = self.route(corrected)
+                if rerouted.name != "implicit_open":
+                    if trace:
+                        self._trace(cmd, "fuzzy_intent", f"treat '{' '.join(words[:n])}' as '{match.value}' ({match.score:.2f})")
+                    return corrected, rerouted
+        return cmd, routed
+
     def handle_command(self, command: str):
         cmd = self.cleanup(command)
         if not cmd:
             return
 
-        if self.app.awaiting_profile_choice and self.app.pending_action:
+        cmd, routed = self.route_fuzzy(cmd)
+        if self.app.awaiting_profile_choice and self.app.pending_action and routed.name != "cancel_tasks":
             profile = self.resolve_profile(cmd)
             if not profile:
                 self.app.say("Please tell me profile 1, profile 2, or default.")
@@ -109,177 +206,243 @@ class BehaviorEngine:
             action, payload = self.app.pending_action
             self.app.pending_action = None
             self.app.awaiting_profile_choice = False
-            self.app.memory.set_pref("chrome_profile", profile)
+            self.app.prefs.set("chrome_profile", profile)
             self.app.start_task(f"continue {action} with {profile}")
             self._trace(command, "profile_followup", f"continue {action} with {profile}")
             if action == "search":
-                threading.Thread(target=self.app.automation.human_search, args=(payload, profile), daemon=True).start()
+                self.app.executor.submit(self.app.automation.human_search, payload, profile, name=f"search {payload}", resource="input", timeout=INPUT_TASK_TIMEOUT)
             else:
-                threading.Thread(target=self.app.automation.human_open_website, args=(payload, profile), daemon=True).start()
+                self.app.executor.submit(self.app.automation.human_open_website, payload, profile, name=f"open {payload}", resource="input", timeout=INPUT_TASK_TIMEOUT)
             return
 
-        if " and then " in cmd:
-            steps = [x.strip() for x in cmd.split(" and then ") if x.strip()]
+        self._handlers[routed.name](command, cmd, routed.match)
+
+    def step_kind(self, step: str) -> str:
+        _cmd, routed = self.route_fuzzy(self.cleanup(step), trace=False)
+        if routed.name == "open" and self.looks_like_website(self.normalize_target(routed.match.group(1).strip())):
+            return INPUT
+        return STEP_KINDS.get(routed.name, FREE)
+
+    def _run_step(self, step: str):
+        # plan steps skip the profile follow-up check so a sibling step is never taken as the answer
+        cmd = self.cleanup(step)
+        if cmd:
+            cmd, routed = self.route_fuzzy(cmd)
+            self._handlers[routed.name](step, cmd, routed.match)
+
+    def _speculative_plan(self, steps: list[str], command: str, on_start) -> TaskPlan | None:
+        # starts the first local step right away and lets the planner refine the rest in parallel;
+        # past the latency budget the local plan wins (the refined plan still lands in the cache)
+        api_key = self.app.prefs.get("gemini_api_key")
+        request = self.cleanup(command)
+        if len(steps) < 3 or not api_key or self.app.planner.is_cached(request):
+            return None
+        self._trace(command, "speculative_plan", f"start step 1 while the planner refines {len(steps)} steps")
+        planning = self.app.executor.submit(self.app.planner.plan, request, api_key, name="gemini plan")
+        plan = TaskPlan.build(steps, self.step_kind)
+        self.app.say(f"Understood sir. I will execute {len(steps)} steps.", key="status")
+        plan.launch(plan.steps[0], self.app.executor, self._run_step, on_start)
+        budget = self.app.planner_budget
+        if not planning.wait(budget):
+            print(f"[plan] planner over the {budget:.1f}s budget, continuing with the local plan")
+            return plan
+        if planning.status != DONE:
+            self.app.say("Planner failed, sir. I will continue with local step-by-step execution.")
+            return plan
+        refined = [self.cleanup(x) for x in planning.result if self.cleanup(x)]
+        if not refined:
+            return plan
+        kept = plan.replace_pending(refined, self.step_kind)
+        print(f"[plan] planner answered in {planning.finished_at - planning.created_at:.2f}s, kept {kept} speculative step(s)")
+        self.app.say("Heavy task planner is ready sir. Executing optimized steps.")
+        return plan
+
+    def _on_task_chain(self, command: str, cmd: str, _m):
+        steps = [x.strip() for x in cmd.split(" and then ") if x.strip()]
+        on_start = lambda s: self.app.say(f"Step {s.index}: {s.text}", key="status")
+        plan = self._speculative_plan(steps, command, on_start) if self.app.speculative_plans else None
+        if plan is None:
             steps = self._maybe_refine_complex_steps(steps, command)
-            self._trace(command, "task_chain", f"execute {len(steps)} chained steps")
-            self.app.say(f"Understood sir. I will execute {len(steps)} steps.")
-            for i, step in enumerate(steps, 1):
-                self.app.say(f"Step {i}: {step}")
-                self.handle_command(step)
-            return
+            plan = TaskPlan.build(steps, self.step_kind)
+            self.app.say(f"Understood sir. I will execute {len(steps)} steps.", key="status")
+        self._trace(command, "task_chain", f"execute {len(plan.steps)} chained steps")
+        plan.run(self.app.executor, self._run_step, on_start=on_start)
+        print(plan.summary())
+        for step in plan.steps:
+            if step.status == SKIPPED:
+                blockers = ", ".join(str(i) for i in plan.blocked_by(step))
+                self.app.say(f"I skipped step {step.index} because step {blockers} did not finish.")
 
-        if cmd in {"time", "what is the time", "what s the time", "tell me the time"}:
-            self._trace(command, "time_intent", "reply with current time")
-            self.app.say(f"It is {datetime.now().strftime('%I:%M %p')} sir")
-            return
+    def _on_time_intent(self, command: str, _cmd: str, _m):
+        self._trace(command, "time_intent", "reply with current time")
+        self.app.say(f"It is {datetime.now().strftime('%I:%M %p')} sir")
 
-        if cmd in {"who are you", "what are you", "who r you"}:
-            self._trace(command, "identity_intent", "introduce assistant capabilities")
-            self.app.say("I am Jarvis. I can open apps, search, type, run commands, and remember notes for you.")
-            return
+    def _on_identity_intent(self, command: str, _cmd: str, _m):
+        self._trace(command, "identity_intent", "introduce assistant capabilities")
+        self.app.say("I am Jarvis. I can open apps, search, type, run commands, and remember notes for you.")
 
-        lang_match = re.match(r"^(set|change|switch)\s+(language\s+to\s+)?([a-z]+)$", cmd)
-        if lang_match:
-            lang = lang_match.group(3)
-            self._trace(command, "language_switch", f"switch TTS language to {lang}")
-            self.app.set_tts_language(lang)
-            return
-        if cmd.startswith("speak in "):
-            lang = cmd.replace("speak in ", "", 1).strip()
-            self._trace(command, "language_switch", f"switch TTS language to {lang}")
-            self.app.set_tts_language(lang)
-            return
-        if cmd in {"what languages do you speak", "which languages do you speak", "languages", "list languages"}:
-            self._trace(command, "language_list", "list installed TTS languages")
-            langs = ", ".join(self.app.available_tts_languages())
-            self.app.say(f"I can speak in: {langs}")
-            return
+    def _on_language_switch(self, command: str, _cmd: str, m):
+        lang = m.group("lang").strip()
+        self._trace(command, "language_switch", f"switch TTS language to {lang}")
+        self.app.set_tts_language(lang)
 
-        if cmd in {"security tools", "cyber tools", "infosec tools", "what security tools do you support"}:
-            self._trace(command, "defensive_security_catalog", "list supported defensive security tools")
-            self.app.say(
-                "For authorized defensive workflows, I can help with nmap, ncat, wireshark, nikto, skipfish, wapiti, owasp zap, burp suite, autopsy, and binwalk."
-            )
-            self.app.say("Tell me a defensive goal and I will suggest safe next steps.")
-            return
+    def _on_language_list(self, command: str, _cmd: str, _m):
+        self._trace(command, "language_list", "list installed TTS languages")
+        langs = ", ".join(self.app.available_tts_languages())
+        self.app.say(f"I can speak in: {langs}")
 
-        defensive_tools = [
-            "nmap", "ncat", "wireshark", "nikto", "skipfish", "wapiti", "owasp zap", "zap", "burpsuite", "burp suite", "autopsy", "binwalk",
-        ]
-        if any(k in cmd for k in defensive_tools):
-            self._trace(command, "defensive_security_help", "provide authorized defensive guidance for security tooling")
-            self.app.say(
-                "I can help with defensive and authorized use of tools like nmap, ncat, wireshark, nikto, wapiti, zap, burp suite, autopsy, and binwalk on your own systems."
-            )
-            self.app.say("Tell me your objective, like host discovery, service inventory, traffic inspection, or vulnerability review, and I will guide step by step.")
-            return
+    def _on_defensive_security_catalog(self, command: str, _cmd: str, _m):
+        self._trace(command, "defensive_security_catalog", "list supported defensive security tools")
+        self.app.say(
+            "For authorized defensive workflows, I can help with nmap, ncat, wireshark, nikto, skipfish, wapiti, owasp zap, burp suite, autopsy, and binwalk."
+        )
+        self.app.say("Tell me a defensive goal and I will suggest safe next steps.")
 
-        if "sqlmap" in cmd:
-            self._trace(command, "security_guard_sqlmap", "decline offensive sqlmap usage and redirect to defensive guidance")
-            self.app.say("I can’t help run sqlmap attacks or automate SQL injection exploitation.")
-            self.app.say("I can help you with defensive SQL injection prevention: parameterized queries, input validation, least-privilege DB users, and safe test checklists for your own app.")
-            return
+    def _on_defensive_security_help(self, command: str, _cmd: str, _m):
+        self._trace(command, "defensive_security_help", "provide authorized defensive guidance for security tooling")
+        self.app.say(
+            "I can help with defensive and authorized use of tools like nmap, ncat, wireshark, nikto, wapiti, zap, burp suite, autopsy, and binwalk on your own systems."
+        )
+        self.app.say("Tell me your objective, like host discovery, service inventory, traffic inspection, or vulnerability review, and I will guide step by step.")
 
-        blocked_security_terms = [
-            "hack", "hacking", "exploit", "payload", "sql injection", "ddos", "phishing",
-            "hydra", "sqlmap", "zphisher", "metasploit", "meterpreter", "bruteforce", "brute force", "mimikatz", "aircrack", "reaver", "john the ripper", "hashcat", "xsspy",
-        ]
-        if any(k in cmd for k in blocked_security_terms):
-            self._trace(command, "security_guard", "block offensive or unauthorized cybersecurity actions")
-            self.app.say("I can only help with defensive, authorized security work. I cannot run or automate attack tools.")
-            self.app.say("If you want, I can help with safe tasks like system hardening checks, patch audit steps, log review, and legal lab setup guidance.")
-            return
+    def _on_security_guard_sqlmap(self, command: str, _cmd: str, _m):
+        self._trace(command, "security_guard_sqlmap", "decline offensive sqlmap usage and redirect to defensive guidance")
+        self.app.say("I can’t help run sqlmap attacks or automate SQL injection exploitation.")
+        self.app.say("I can help you with defensive SQL injection prevention: parameterized queries, input validation, least-privilege DB users, and safe test checklists for your own app.")
+
+    def _on_security_guard(self, command: str, _cmd: str, _m):
+        self._trace(command, "security_guard", "block offensive or unauthorized cybersecurity actions")
+        self.app.say("I can only help with defensive, authorized security work. I cannot run or automate attack tools.")
+        self.app.say("If you want, I can help with safe tasks like system hardening checks, patch audit steps, log review, and legal lab setup guidance.")
+
+    def _on_whatsapp_send_message(self, command: str, _cmd: str, m):
+        contact = m.group(1).strip()
+        msg = m.group(2).strip()
+        self._trace(command, "whatsapp_send_message", f"open whatsapp, find {contact}, send '{msg}'")
+        self.app.start_task(f"send whatsapp message to {contact}")
 
-        # whatsapp task: open whatsapp and search <name> contact and if you find her send her a hi
-        whatsapp_match = re.match(r"^open\s+whatsapp\s+and\s+search\s+(.+?)\s+contact\s+and\s+if\s+you\s+find\s+.+?\s+send\s+.+?\s+(?:a\s+)?(.+)$", cmd)
-        if whatsapp_match:
-            contact = whatsapp_match.group(1).strip()
-            msg = whatsapp_match.group(2).strip()
-            self._trace(command, "whatsapp_send_message", f"open whatsapp, find {contact}, send '{msg}'")
-            self.app.start_task(f"send whatsapp message to {contact}")
-            ok = self.app.automation.send_whatsapp_message(contact, msg)
-            if ok:
+        def report(task):
+            if task.result:
                 self.app.finish_task(f"Message sent to {contact}, sir.")
             else:
                 self.app.finish_task(f"I could not complete message send automatically. Please check WhatsApp window for {contact}.")
-            return
 
-        mem = re.match(r"^remember\s+(.+)$", cmd)
-        if mem:
-            note = mem.group(1).strip()
-            self._trace(command, "memory_write", f"store note '{note}'")
-            self.app.memory.remember(f"user_note: {note}")
-            self.app.say("Got it sir. I will remember that.")
-            return
-        if cmd in {"memory", "show memory", "what do you remember"}:
-            self._trace(command, "memory_read", "read latest saved notes")
-            notes = self.app.memory.get_notes()
-            self.app.say(f"I remember {len(notes)} notes. Latest: {notes[-1]['note']}" if notes else "I do not have notes yet, sir.")
-            return
+        self.app.executor.submit(
+            self.app.automation.send_whatsapp_message, contact, msg,
+            name=f"whatsapp {contact}", resource="input", timeout=INPUT_TASK_TIMEOUT, on_done=report,
+        )
 
-        m = re.match(r"^open\s+(.+?)\s+and\s+type\s+(.+)$", cmd)
-        if m:
-            app_name = self.normalize_target(m.group(1).strip())
-            text_to_type = m.group(2).strip()
-            self._trace(command, "open_and_type", f"open {app_name} then type '{text_to_type}'")
-            self.app.start_task(f"open {app_name} and type")
-            threading.Thread(target=self.app.automation.open_and_type, args=(app_name, text_to_type), daemon=True).start()
-            self.app.finish_task("Done sir. Do you want me to continue with anything else?")
-            return
+    def _on_memory_write(self, command: str, _cmd: str, m):
+        note = m.group(1).strip()
+        self._trace(command, "memory_write", f"store note '{note}'")
+        self.app.memory.remember(f"user_note: {note}")
+        self.app.say("Got it sir. I will remember that.")
 
-        if cmd.startswith("open "):
-            target = self.normalize_target(cmd.replace("open ", "", 1).strip())
-            if self.looks_like_website(target):
-                pref = self.app.memory.get_pref("chrome_profile")
-                if pref:
-                    self._trace(command, "human_open_website", f"open {target} in chrome profile {pref}")
-                    self.app.start_task(f"open website in {pref}")
-                    threading.Thread(target=self.app.automation.human_open_website, args=(target, pref), daemon=True).start()
-                    self.app.finish_task("Website opened sir. Want me to type anything there?")
-                else:
-                    self._trace(command, "profile_request", "ask for chrome profile before website task")
-                    self.app.pending_action = ("website", target)
-                    self.app.awaiting_profile_choice = True
-                    self.app.say("I see multiple Chrome profiles possible. Which one should I open: profile 1, profile 2, or default?")
-                return
-            self._trace(command, "open_application", f"open app {target}")
-            self.app.start_task(f"open {target}")
-            msg = self.app.automation.open_application(target)
-            self.app.say(msg)
-            self.app.finish_task("Task completed sir.")
+    def _on_model_switch(self, command: str, _cmd: str, m):
+        name = m.group(1).strip()
+        self._trace(command, "model_switch", f"swap speech model to {name}")
+        self.app.say(self.app.switch_model(name))
+
+    def _on_model_prewarm(self, command: str, _cmd: str, m):
+        name = m.group(1).strip()
+        self._trace(command, "model_prewarm", f"load speech model {name} in the background")
+        self.app.say(self.app.prewarm_model(name))
+
+    def _on_cancel_tasks(self, command: str, _cmd: str, m):
+        task_id = int(m.group(1)) if m else None
+        self._trace(command, "cancel_tasks", f"cancel task {task_id}" if task_id else "cancel running and queued tasks")
+        self.app.pending_action = None
+        self.app.awaiting_profile_choice = False
+        self.app.say(self.app.cancel_tasks(task_id), priority=URGENT)
+
+    def _on_list_tasks(self, command: str, _cmd: str, _m):
+        self._trace(command, "list_tasks", "report running and queued tasks")
+        self.app.say(self.app.describe_tasks())
+
+    def _on_memory_read(self, command: str, _cmd: str, _m):
+        self._trace(command, "memory_read", "read latest saved notes")
+        notes = self.app.memory.get_notes(1)
+        self.app.say(f"I remember {self.app.memory.count_notes()} notes. Latest: {notes[-1]['note']}" if notes else "I do not have notes yet, sir.")
+
+    def _on_memory_recall(self, command: str, _cmd: str, m):
+        query = m.group(1).strip()
+        self._trace(command, "memory_recall", f"search saved notes for '{query}'")
+        matches = self.app.memory.search(query, limit=3)
+        if not matches:
+            self.app.say(f"I have no notes about {query}, sir.")
             return
+        found = "; ".join(n["note"].removeprefix("user_note: ") for n in matches)
+        self.app.say(f"Here is what I found: {found}")
+
+    def _on_open_and_type(self, command: str, _cmd: str, m):
+        app_name = self.normalize_target(m.group(1).strip())
+        text_to_type = m.group(2).strip()
+        self._trace(command, "open_and_type", f"open {app_name} then type '{text_to_type}'")
+        self.app.start_task(f"open {app_name} and type")
+        self.app.executor.submit(self.app.automation.open_and_type, app_name, text_to_type, name=f"open {app_name} and type", resource="input", timeout=INPUT_TASK_TIMEOUT)
+        self.app.finish_task("Done sir. Do you want me to continue with anything else?")
 
-        if cmd.startswith("search "):
-            q = cmd.replace("search ", "", 1).strip()
-            pref = self.app.memory.get_pref("chrome_profile")
+    def _on_open(self, command: str, _cmd: str, m):
+        target = self.normalize_target(m.group(1).strip())
+        if self.looks_like_website(target):
+            pref = self.app.prefs.get("chrome_profile")
             if pref:
-                self._trace(command, "human_search", f"search '{q}' with profile {pref}")
-                self.app.start_task(f"search {q}")
-                threading.Thread(target=self.app.automation.human_search, args=(q, pref), daemon=True).start()
-                self.app.finish_task("Search done sir. Should I open any result?")
+                self._trace(command, "human_open_website", f"open {target} in chrome profile {pref}")
+                self.app.start_task(f"open website in {pref}")
+                self.app.executor.submit(self.app.automation.human_open_website, target, pref, name=f"open {target}", resource="input", timeout=INPUT_TASK_TIMEOUT)
+                self.app.finish_task("Website opened sir. Want me to type anything there?")
             else:
-                self._trace(command, "profile_request", "ask for chrome profile before search")
-                self.app.pending_action = ("search", q)
+                self._trace(command, "profile_request", "ask for chrome profile before website task")
+                self.app.pending_action = ("website", target)
                 self.app.awaiting_profile_choice = True
-                self.app.say("Which Chrome profile should I use: profile 1, profile 2, or default?")
+                self.app.say("I see multiple Chrome profiles possible. Which one should I open: profile 1, profile 2, or default?")
             return
+        self._trace(command, "open_application", f"open app {target}")
+        self.app.start_task(f"open {target}")
+        msg = self.app.automation.open_application(target)
+        self.app.say(msg)
+        self.app.finish_task("Task completed sir.")
 
-        if cmd.startswith("run "):
-            c = cmd.replace("run ", "", 1).strip()
-            self._trace(command, "run_command", f"execute shell command '{c}'")
-            self.app.start_task(f"run {c}")
-            result = self.app.automation.run_command(c)
+    def _on_search(self, command: str, _cmd: str, m):
+        q = m.group(1).strip()
+        pref = self.app.prefs.get("chrome_profile")
+        if pref:
+            self._trace(command, "human_search", f"search '{q}' with profile {pref}")
+            self.app.start_task(f"search {q}")
+            self.app.executor.submit(self.app.automation.human_search, q, pref, name=f"search {q}", resource="input", timeout=INPUT_TASK_TIMEOUT)
+            self.app.finish_task("Search done sir. Should I open any result?")
+        else:
+            self._trace(command, "profile_request", "ask for chrome profile before search")
+            self.app.pending_action = ("search", q)
+            self.app.awaiting_profile_choice = True
+            self.app.say("Which Chrome profile should I use: profile 1, profile 2, or default?")
+
+    def _on_run_command(self, command: str, _cmd: str, m):
+        c = m.group(1).strip()
+        self._trace(command, "run_command", f"execute shell command '{c}'")
+        self.app.start_task(f"run {c}")
+
+        def report(task):
+            result = task.result or "Unable to run that command."
             self.app.say(result)
             self.app.finish_task("Command done sir." if result == "Command completed." else "I hit an obstacle. Tell me an alternative command or say cancel.")
-            return
 
+        self.app.executor.submit(self.app.automation.run_command, c, name=f"run {c}", resource="shell", on_done=report)
+
+    def _on_implicit_open(self, command: str, cmd: str, _m):
         normalized = self.normalize_target(cmd)
         if normalized and len(normalized.split()) <= 3:
-            self._trace(command, "open_application", f"open app {normalized}")
-            self.app.start_task(f"open {normalized}")
-            self.app.say(self.app.automation.open_application(normalized))
-            self.app.finish_task("Task completed sir.")
-            return
+            # only names the app index knows (allowing for misrecognition); anything else is not an app.
+            # Bare PATH binaries ("yes", "shutdown") need an explicit "open X"
+            entry, score = self.app.automation.apps.resolve(normalized)
+            if entry is not None and entry.source != "path":
+                self._trace(command, "open_application", f"open app {entry.name} (matched '{normalized}' at {score:.2f})")
+                self.app.start_task(f"open {entry.name}")
+                self.app.say(self.app.automation.open_application(entry.name))
+                self.app.finish_task("Task completed sir.")
+                return
+        self._on_fallback(command, cmd, None)
 
+    def _on_fallback(self, command: str, _cmd: str, _m):
         self._trace(command, "fallback", "ask user to rephrase unknown intent")
         self.app.say("Sorry sir, I did not get that. Could you rephrase?")
@@ -0,0 +1,32 @@
+import platform
+import tempfile
+import time
+from pathlib import Path
+
+from app_index import AppIndex
+
+QUERIES = ["chrome", "terminal", "python3", "visual studio", "vs code", "git", "no such app here"]
+
+
+def main(rounds: int = 2000):
+    system = platform.system().lower()
+    cache = Path(tempfile.mkdtemp()) / "app_index.json"
+
+    cold = AppIndex(system, cache)
+    cold.load()
+    warm = AppIndex(system, cache)
+    warm.load()
+    print(f"cold build: {cold.build_ms:.1f} ms ({cold.summary()})")
+    print(f"warm start: {warm.build_ms:.1f} ms from {cache.stat().st_size // 1024} KB cache (rescanned={warm.rescanned})")
+
+    for query in QUERIES:
+        start = time.perf_counter()
+        for _ in range(rounds):
+            entry = warm.lookup(query)
+        per = (time.perf_counter() - start) / rounds
+        found = f"{entry.name} -> {' '.join(entry.command)}" if entry else "not found"
+        print(f"  {query!r:<20} {per * 1e6:>7.1f} us  {found}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+import argparse
+import json
+import platform
+import re
+import sys
+import time
+from pathlib import Path
+
+from vosk import KaldiRecognizer, Model, SetLogLevel
+
+from app_index import AppIndex
+from audio_files import iter_wav_blocks, wav_files, wav_sample_rate
+from behavior import COMMAND_WORDS, INTENTS, PROFILE_CHOICES
+from command_grammar import MIN_CONFIDENCE, CommandDecoder, command_phrases
+from model_manager import MODEL_ALIASES
+from speech_queue import TTS_LANGUAGES
+from wake_word import WAKE_WORD
+
+BLOCKSIZE = 4000
+
+
+def words(text: str) -> list[str]:
+    return re.sub(r"[^a-z0-9' ]+", " ", text.lower()).split()
+
+
+def word_errors(ref: list[str], hyp: list[str]) -> int:
+    # substitutions + insertions + deletions between the two word lists
+    previous = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        current = [i]
+        for j, h in enumerate(hyp, 1):
+            current.append(min(previous[j - 1] + (r != h), previous[j] + 1, current[j - 1] + 1))
+        previous = current
+    return previous[-1]
+
+
+def decode_open(recognizer: KaldiRecognizer, path: Path) -> tuple[str, float]:
+    texts = []
+    started = time.perf_counter()
+    for block in iter_wav_blocks(path, BLOCKSIZE):
+        if recognizer.AcceptWaveform(block):
+            texts.append(json.loads(recognizer.Result()).get("text", ""))
+    texts.append(json.loads(recognizer.FinalResult()).get("text", ""))
+    seconds = time.perf_counter() - started
+    recognizer.Reset()
+    return " ".join(t for t in texts if t), seconds
+
+
+def decode_grammar(decoder: CommandDecoder, path: Path) -> tuple[str, float, list[str]]:
+    texts, used = [], []
+    started = time.perf_counter()
+    for block in iter_wav_blocks(path, BLOCKSIZE):
+        text = decoder.accept(block)
+        if text:
+            texts.append(text)
+            used.append(decoder.last_decoder)
+    text = decoder.finish()
+    if text:
+        texts.append(text)
+        used.append(decoder.last_decoder)
+    return " ".join(texts), time.perf_counter() - started, used
+
+
+def percentile(values: list[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare open-vocabulary and command-grammar decoding on recorded commands")
+    parser.add_argument("--model-path", type=Path, required=True, help="Path to Vosk model folder (contains am/ and conf/)")
+    parser.add_argument("--min-confidence", type=float, default=MIN_CONFIDENCE, help="Grammar word confidence below which the open decode is used")
+    parser.add_argument("wav", type=Path, help="Command wav (what is said after the wake word), or a directory of them; each needs a .txt transcript next to it")
+    args = parser.parse_args()
+
+    cases = []
+    for path in wav_files(args.wav):
+        transcript = path.with_suffix(".txt")
+        if not transcript.exists():
+            print(f"skipping {path.name}: no {transcript.name}")
+            continue
+        cases.append((path, words(transcript.read_text())))
+    if not cases:
+        sys.exit("no wav files with transcripts")
+
+    SetLogLevel(-1)
+    model = Model(str(args.model_path))
+    sample_rate = wav_sample_rate(cases[0][0])
+    apps = AppIndex(platform.system().lower(), None)
+    apps.load()
+    phrases = command_phrases(
+        INTENTS,
+        verbs=COMMAND_WORDS,
+        apps=apps.names(spoken=True),
+        models=MODEL_ALIASES,
+        languages=TTS_LANGUAGES,
+        profiles=[k for k in PROFILE_CHOICES if not k[-1].isdigit()],
+        extra=(WAKE_WORD,),
+    )
+    recognizer = KaldiRecognizer(model, sample_rate)
+    recognizer.SetWords(True)
+    started = time.perf_counter()
+    decoder = CommandDecoder(model, sample_rate, phrases, recognizer, args.min_confidence)
+    print(f"{len(decoder.phrases)} grammar phrases ({decoder.dropped} not in the model), built in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    audio_seconds = 0.0
+    results = {"open": [0, [], 0], "grammar": [0, [], 0]}
+    paths = {"grammar": 0, "fallback": 0}
+    ref_words = 0
+    for path, ref in cases:
+        audio_seconds += sum(len(b) for b in iter_wav_blocks(path, BLOCKSIZE)) / 2 / sample_rate
+        ref_words += len(ref)
+        open_text, open_seconds = decode_open(recognizer, path)
+        grammar_text, grammar_seconds, used = decode_grammar(decoder, path)
+        for name, text, seconds in (("open", open_text, open_seconds), ("grammar", grammar_text, grammar_seconds)):
+            errors = word_errors(ref, words(text))
+            results[name][0] += errors
+            results[name][1].append(seconds)
+            results[name][2] += errors == 0
+        for kind in used:
+            paths[kind] += 1
+        print(f"  {path.name}: ref={' '.join(ref)!r} open={open_text!r} grammar={grammar_text!r} ({'+'.join(used) or '-'})")
+
+    print(f"{len(cases)} command(s), {ref_words} words, {audio_seconds:.1f}s of audio")
+    for name, (errors, times, exact) in results.items():
+        total = sum(times)
+        print(
+            f"{name:>8}: WER {errors / max(1, ref_words) * 100:5.1f}%  exact {exact}/{len(cases)}  "
+            f"decode p50 {percentile(times, 0.5) * 1000:.0f} ms  p95 {percentile(times, 0.95) * 1000:.0f} ms  "
+            f"total {total * 1000:.0f} ms  RTF {total / max(audio_seconds, 1e-9):.3f}"
+        )
+    print(f"grammar mode: {paths['grammar']} answered by the grammar, {paths['fallback']} fell back to the open decode")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import time
+
+from app_index import APP_ALIASES, APP_MAP
+from fuzzy_match import FuzzyMatcher
+
+# names a desktop index typically adds on top of the built-ins
+DESKTOP_APPS = [
+    "firefox", "thunderbird", "libreoffice writer", "libreoffice calc", "gimp", "vlc", "steam", "slack",
+    "zoom", "telegram", "signal", "obs studio", "blender", "inkscape", "calculator", "files", "settings",
+    "text editor", "system monitor", "software", "audacity", "kdenlive", "krita", "shotwell", "rhythmbox",
+    "transmission", "virtualbox", "docker desktop", "postman", "pycharm", "intellij idea", "android studio",
+    "sublime text", "brave", "microsoft edge", "opera", "teams", "skype", "notion", "obsidian", "figma",
+    "evince", "document viewer", "image viewer", "screenshot", "disks", "gparted", "remmina", "wireshark",
+]
+
+# (what the recognizer produced, what the user meant); None means no app should match
+CORPUS = [
+    ("disc cord", "discord"), ("this cord", "discord"), ("discord", "discord"), ("dis cord", "discord"),
+    ("spot if i", "spotify"), ("spotty fi", "spotify"), ("spot a fly", "spotify"), ("spotify", "spotify"),
+    ("crome", "chrome"), ("chrome", "chrome"), ("krome", "chrome"), ("google crome", "chrome"),
+    ("whats app", "whatsapp"), ("what sap", "whatsapp"), ("whats up", "whatsapp"),
+    ("note pad", "notepad"), ("notepat", "notepad"), ("not pad", "notepad"),
+    ("v s code", "vscode"), ("vs cold", "vscode"), ("terminal", "terminal"), ("terminel", "terminal"), ("turminal", "terminal"),
+    ("fire fox", "firefox"), ("firefocks", "firefox"), ("thunder bird", "thunderbird"), ("tele gram", "telegram"),
+    ("telegraham", "telegram"), ("slak", "slack"), ("blendor", "blender"), ("ink scape", "inkscape"),
+    ("calculater", "calculator"), ("audacitee", "audacity"), ("virtual box", "virtualbox"), ("post man", "postman"),
+    ("pie charm", "pycharm"), ("sublime text", "sublime text"), ("obsidion", "obsidian"), ("wire shark", "wireshark"),
+    ("the weather", None), ("good morning", None), ("thank you", None), ("hello there", None), ("nice", None),
+    ("what", None), ("okay", None), ("never mind", None), ("music", None), ("lights on", None),
+]
+
+
+def main(rounds: int = 200):
+    names = list(APP_MAP) + DESKTOP_APPS
+    matcher = FuzzyMatcher({name: name for name in names})
+    for alias, name in APP_ALIASES.items():
+        matcher.add(alias, name)
+    print(f"{len(names)} apps + {len(APP_ALIASES)} aliases, {matcher.size} phonetic keys")
+
+    right = wrong = missed = false_accepts = 0
+    for heard, meant in CORPUS:
+        best = matcher.best(heard)
+        got = best.value if best else None
+        if got == meant:
+            right += 1
+        elif meant is None:
+            false_accepts += 1
+        elif got is None:
+            missed += 1
+        else:
+            wrong += 1
+        if got != meant:
+            print(f"  {heard!r}: wanted {meant}, got {got} {best.score if best else ''}")
+    print(f"correct {right}/{len(CORPUS)}  missed {missed}  wrong app {wrong}  false accepts {false_accepts}")
+
+    times = []
+    for _ in range(rounds):
+        for heard, _meant in CORPUS:
+            start = time.perf_counter()
+            matcher.match(heard)
+            times.append(time.perf_counter() - start)
+    times.sort()
+    print(f"lookup p50 {times[len(times) // 2] * 1e6:.1f} us  p95 {times[int(len(times) * 0.95)] * 1e6:.1f} us  max {times[-1] * 1e6:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
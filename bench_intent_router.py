@@ -0,0 +1,91 @@
+import re
+import time
+
+from behavior import BehaviorEngine
+
+CORPUS = [
+    "what is the time", "time", "tell me the time", "who are you", "who r you",
+    "set language to spanish", "switch hindi", "change language to french", "speak in german",
+    "what languages do you speak", "list languages", "security tools", "cyber tools",
+    "how do i use nmap for host discovery", "open wireshark", "burp suite proxy setup", "owasp zap scan my app",
+    "run sqlmap on my site", "hack my neighbour wifi", "write a phishing page", "use hashcat on this",
+    "nmap and hydra together", "zapper", "open whatsapp and search gauri contact and if you find her send her a hi",
+    "remember buy milk tomorrow", "memory", "what do you remember",
+    "open notepad and type i am cool", "open cmd and type whoami", "open youtube.com", "open discord",
+    "open this app spotify", "open", "search best laptops 2026", "search", "run pwd", "run ls -la",
+    "notepad", "visual studio code", "the app called discord", "tell me a really long story please",
+    "open notepad and then open chrome and then search tech news", "open chrome and then search hack",
+    "set", "speak in", "remember", "openchrome", "searching for sqlmap",
+]
+
+
+def legacy_route(cmd: str) -> str:
+    # the if-chain BehaviorEngine.handle_command used before the intent table, reduced to its decisions
+    if " and then " in cmd:
+        return "task_chain"
+    if cmd in {"time", "what is the time", "what s the time", "tell me the time"}:
+        return "time_intent"
+    if cmd in {"who are you", "what are you", "who r you"}:
+        return "identity_intent"
+    if re.match(r"^(set|change|switch)\s+(language\s+to\s+)?([a-z]+)$", cmd):
+        return "language_switch"
+    if cmd.startswith("speak in "):
+        return "language_switch"
+    if cmd in {"what languages do you speak", "which languages do you speak", "languages", "list languages"}:
+        return "language_list"
+    if cmd in {"security tools", "cyber tools", "infosec tools", "what security tools do you support"}:
+        return "defensive_security_catalog"
+    defensive_tools = [
+        "nmap", "ncat", "wireshark", "nikto", "skipfish", "wapiti", "owasp zap", "zap", "burpsuite", "burp suite", "autopsy", "binwalk",
+    ]
+    if any(k in cmd for k in defensive_tools):
+        return "defensive_security_help"
+    if "sqlmap" in cmd:
+        return "security_guard_sqlmap"
+    blocked_security_terms = [
+        "hack", "hacking", "exploit", "payload", "sql injection", "ddos", "phishing",
+        "hydra", "sqlmap", "zphisher", "metasploit", "meterpreter", "bruteforce", "brute force", "mimikatz", "aircrack", "reaver", "john the ripper", "hashcat", "xsspy",
+    ]
+    if any(k in cmd for k in blocked_security_terms):
+        return "security_guard"
+    if re.match(r"^open\s+whatsapp\s+and\s+search\s+(.+?)\s+contact\s+and\s+if\s+you\s+find\s+.+?\s+send\s+.+?\s+(?:a\s+)?(.+)$", cmd):
+        return "whatsapp_send_message"
+    if re.match(r"^remember\s+(.+)$", cmd):
+        return "memory_write"
+    if cmd in {"memory", "show memory", "what do you remember"}:
+        return "memory_read"
+    if re.match(r"^open\s+(.+?)\s+and\s+type\s+(.+)$", cmd):
+        return "open_and_type"
+    if cmd.startswith("open "):
+        return "open"
+    if cmd.startswith("search "):
+        return "search"
+    if cmd.startswith("run "):
+        return "run_command"
+    return "implicit_open"
+
+
+def _time_per_call(fn, corpus: list[str], rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for cmd in corpus:
+            fn(cmd)
+    return (time.perf_counter() - start) / (rounds * len(corpus))
+
+
+def main(rounds: int = 2000):
+    engine = BehaviorEngine(app=None)
+    corpus = [engine.cleanup(c) for c in CORPUS]
+    for cmd in corpus:
+        old, new = legacy_route(cmd), engine.route(cmd).name
+        assert old == new, f"routing mismatch for '{cmd}': legacy={old} router={new}"
+
+    legacy = _time_per_call(legacy_route, corpus, rounds)
+    routed = _time_per_call(engine.route, corpus, rounds)
+    print(f"{len(corpus)} commands, identical routing decisions")
+    print(f"legacy if-chain: {legacy * 1e6:.2f} us/command")
+    print(f"intent router:   {routed * 1e6:.2f} us/command ({legacy / routed:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
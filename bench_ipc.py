@@ -0,0 +1,68 @@
+import argparse
+import threading
+import time
+from pathlib import Path
+
+from ipc_server import DEFAULT_PORT, CommandClient
+
+# replies that never touch the keyboard, mouse or shell, so the load test is safe to run anywhere
+COMMANDS = ["what is the time", "who are you", "what do you remember", "recall milk", "what are you doing"]
+
+
+def worker(args, count: int, results: list, lock: threading.Lock):
+    client = CommandClient(args.port, args.socket)
+    try:
+        for i in range(count):
+            text = COMMANDS[i % len(COMMANDS)]
+            started = time.perf_counter()
+            first = None
+            status = "no reply"
+            for event in client.command(text):
+                if first is None and event["type"] != "accepted":
+                    first = time.perf_counter() - started
+                if event["type"] == "done":
+                    status = event["status"]
+            with lock:
+                results.append((first or 0.0, time.perf_counter() - started, status))
+    finally:
+        client.close()
+
+
+def pct(values: list[float], p: float) -> float:
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test a running `assistant.py --headless` daemon")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--socket", type=Path, default=None)
+    parser.add_argument("--commands", type=int, default=200, help="Commands per concurrency level")
+    parser.add_argument("--concurrency", type=int, action="append", default=None, help="Parallel clients (repeatable)")
+    args = parser.parse_args()
+
+    print(f"{'clients':>7} {'cmd/s':>8} {'first p50':>10} {'first p95':>10} {'done p50':>9} {'done p95':>9} {'failed':>7}")
+    for clients in args.concurrency or [1, 4, 16]:
+        results: list = []
+        lock = threading.Lock()
+        per = max(1, args.commands // clients)
+        threads = [threading.Thread(target=worker, args=(args, per, results, lock)) for _ in range(clients)]
+        started = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - started
+        first = [r[0] for r in results]
+        done = [r[1] for r in results]
+        failed = sum(1 for r in results if r[2] != "done")
+        print(
+            f"{clients:>7} {len(results) / elapsed:>8.1f} {pct(first, 0.5):>7.1f} ms {pct(first, 0.95):>7.1f} ms "
+            f"{pct(done, 0.5):>6.1f} ms {pct(done, 0.95):>6.1f} ms {failed:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import itertools
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from sqlite_memory_store import SQLiteMemoryStore
+
+WORDS = (
+    "buy milk bread eggs call mom dentist appointment monday tuesday friday project deadline invoice "
+    "password router wifi meeting notes birthday gift anniversary flight hotel booking passport renew "
+    "car service oil change gym workout recipe pasta garden water plants library book return exam "
+    "python script backup server deploy release review budget tax receipts insurance doctor pharmacy"
+).split()
+
+SYLLABLES = "ka lo mi ne ru ta shi po an el or us ing er ve da fi go".split()
+
+QUERIES = ["dentist appointment", "wifi password", "flight hotel", "tax receipts", "birthday gift", "oil change", "zebra"]
+
+
+def vocabulary(rng: random.Random, size: int = 20_000) -> tuple[list[str], list[float]]:
+    # everyday words plus a long tail of rarer ones with Zipf-like frequencies, like real notes
+    tail = {"".join(rng.choices(SYLLABLES, k=rng.randint(2, 4))) for _ in range(size)}
+    words = WORDS + sorted(tail - set(WORDS))
+    return words, list(itertools.accumulate(1 / (rank + 1) for rank in range(len(words))))
+
+
+def fill(store: SQLiteMemoryStore, count: int, seed: int = 7):
+    rng = random.Random(seed)
+    words, cum_weights = vocabulary(rng)
+    db = store._db
+    db.execute("BEGIN")
+    db.executemany(
+        "INSERT INTO notes(ts, note) VALUES (?, ?)",
+        (("2026-01-01T00:00:00", "user_note: " + " ".join(rng.choices(words, cum_weights=cum_weights, k=rng.randint(4, 12)))) for _ in range(count)),
+    )
+    db.execute("COMMIT")
+
+
+def main(sizes=(10_000, 1_000_000), rounds: int = 50):
+    print(f"{'notes':>9} {'fill':>8} {'open':>8} {'recall p50':>11} {'recall p95':>11} {'remember':>9}")
+    for size in sizes:
+        path = Path(tempfile.mkdtemp()) / "memory.db"
+        store = SQLiteMemoryStore(path)
+        start = time.perf_counter()
+        fill(store, size)
+        filled = time.perf_counter() - start
+        store.close()
+
+        start = time.perf_counter()
+        store = SQLiteMemoryStore(path)
+        opened = time.perf_counter() - start
+        assert store.count_notes() == size
+
+        timings = []
+        for _ in range(rounds):
+            for query in QUERIES:
+                start = time.perf_counter()
+                matches = store.search(query, limit=3)
+                timings.append(time.perf_counter() - start)
+                assert query == "zebra" or matches, f"no match for {query}"
+        timings.sort()
+
+        start = time.perf_counter()
+        for i in range(200):
+            store.remember(f"bench note {i}")
+        remember = (time.perf_counter() - start) / 200
+        assert store.search("bench note 199")[0]["note"].startswith("bench note")
+        store.close()
+        print(
+            f"{size:>9} {filled:>7.1f}s {opened * 1e3:>6.1f}ms {timings[len(timings) // 2] * 1e3:>9.2f}ms "
+            f"{timings[int(len(timings) * 0.95)] * 1e3:>9.2f}ms {remember * 1e6:>7.0f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
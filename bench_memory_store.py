@@ -0,0 +1,51 @@
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from memory_store import MemoryStore
+
+
+def legacy_write(path: Path, data: dict, note: str):
+    # what every remember()/set_pref() used to cost: rewrite the whole file with indent=2
+    data["notes"].append({"ts": "2026-01-01T00:00:00", "note": note})
+    data["notes"] = data["notes"][-100:]
+    path.write_text(json.dumps(data, indent=2))
+
+
+def seed(path: Path, prefs: int) -> dict:
+    data = {"notes": [{"ts": "2026-01-01T00:00:00", "note": f"note {i}"} for i in range(100)], "prefs": {f"pref_{i}": "x" * 40 for i in range(prefs)}}
+    path.write_text(json.dumps(data, indent=2))
+    return data
+
+
+def main(writes: int = 300):
+    print(f"{'prefs':>7} {'legacy rewrite':>16} {'journal write':>15} {'close+compact':>15} {'load':>9}")
+    for prefs in (10, 1_000, 10_000):
+        root = Path(tempfile.mkdtemp())
+        data = seed(root / "legacy.json", prefs)
+        start = time.perf_counter()
+        for i in range(writes):
+            legacy_write(root / "legacy.json", data, f"bench {i}")
+        legacy = (time.perf_counter() - start) / writes
+
+        seed(root / "journal.json", prefs)
+        store = MemoryStore(root / "journal.json", durability="batch")
+        start = time.perf_counter()
+        for i in range(writes):
+            store.remember(f"bench {i}")
+        written = (time.perf_counter() - start) / writes
+        start = time.perf_counter()
+        store.close()
+        flushed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        reloaded = MemoryStore(root / "journal.json")
+        load = time.perf_counter() - start
+        assert reloaded.get_notes()[-1]["note"] == f"bench {writes - 1}" and len(reloaded.data["prefs"]) == prefs
+        reloaded.close()
+        print(f"{prefs:>7} {legacy * 1e3:>13.3f} ms {written * 1e6:>12.1f} us {flushed * 1e3:>12.1f} ms {load * 1e3:>6.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
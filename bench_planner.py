@@ -0,0 +1,109 @@
+import json
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from gemini_planner import GeminiPlanner, PlannerError
+
+STEPS = ["open chrome", "search tech news", "open first result"]
+
+
+class StubGemini(ThreadingHTTPServer):
+    # local stand-in for the generateContent endpoint: answers with a fixed plan after `delay` seconds
+    daemon_threads = True
+
+    def __init__(self, delay: float = 0.3):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.delay = delay
+        self.fail = False
+        self.requests = 0
+        self.connections = 0
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/v1beta/models/gemini-1.5-flash:generateContent"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.server.requests += 1
+        time.sleep(self.server.delay)
+        if self.server.fail:
+            body = b"{}"
+            self.send_response(500)
+        else:
+            text = "```json\n" + json.dumps({"steps": STEPS}) + "\n```"
+            body = json.dumps({"candidates": [{"content": {"parts": [{"text": text}]}}]}).encode("utf-8")
+            self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args):
+        pass
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main(delay: float = 0.3):
+    server = StubGemini(delay)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    cache = Path(tempfile.mkdtemp()) / "plan_cache.json"
+    command = "open chrome and then search tech news and then open first result"
+
+    planner = GeminiPlanner(server.url, cache, max_entries=3)
+    steps, cold = _timed(planner.plan, command, "test-key")
+    assert steps == STEPS and server.requests == 1
+    steps, hit = _timed(planner.plan, "Open Chrome, and then search  tech news and then open first result!", "test-key")
+    assert steps == STEPS and server.requests == 1, "normalized command should hit the cache"
+    print(f"cold plan:      {cold * 1000:7.1f} ms ({server.requests} request)")
+    print(f"cached plan:    {hit * 1000:7.3f} ms")
+
+    before = server.requests
+    with ThreadPoolExecutor(8) as pool:
+        start = time.perf_counter()
+        results = list(pool.map(lambda _i: planner.plan("open notepad and then type hi and then save", "test-key"), range(8)))
+        burst = time.perf_counter() - start
+    assert all(r == STEPS for r in results) and server.requests == before + 1, "identical in-flight plans should share one request"
+    print(f"8 identical concurrent plans: {burst * 1000:.1f} ms, {server.requests - before} request")
+
+    for i in range(3):
+        planner.plan(f"open app {i} and then type hi and then save", "test-key")
+    assert planner.cached(command) is None and len(planner._plans) == 3, "size bound should evict the least recently used plan"
+    assert server.connections == 1, f"expected one keep-alive connection, saw {server.connections}"
+    print(f"{server.requests} requests over {server.connections} connection, {len(planner._plans)} plans kept (max 3)")
+    planner.close()
+
+    reloaded = GeminiPlanner(server.url, cache, max_entries=3)
+    assert reloaded.cached("open app 2 and then type hi and then save") == STEPS, "plans should persist across restarts"
+    expired = GeminiPlanner(server.url, cache, ttl=0)
+    assert expired.cached("open app 2 and then type hi and then save") is None, "expired plans must not be served"
+
+    server.fail = True
+    try:
+        reloaded.plan("something new and then fail and then stop", "test-key")
+        raise AssertionError("HTTP 500 should raise PlannerError")
+    except PlannerError:
+        pass
+    print("persistence, TTL expiry and error handling ok")
+    print(f"[planner] {reloaded.summary()}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import time
+
+from readiness import FakeWindowProvider, Readiness
+
+FIXED_SLEEP = 1.2  # what human_search/human_open_website used to wait for Chrome
+
+
+def main():
+    # how long the action waits before typing, and whether the window was really there by then
+    print(f"{'window after':>12} {'fixed sleep':>12} {'ready?':>7} {'readiness':>10} {'ready?':>7}")
+    for appears in (0.05, 0.3, 0.8, 2.5):
+        fake = FakeWindowProvider()
+        fake.open_window("New Tab - Google Chrome", after=appears)
+        time.sleep(FIXED_SLEEP)
+        fixed_ok = bool(fake.windows())
+
+        fake = FakeWindowProvider()
+        fake.open_window("New Tab - Google Chrome", after=appears)
+        ready = Readiness(fake)
+        started = time.monotonic()
+        ok = ready.wait_for_window("chrome", "chrome window", timeout=10.0)
+        waited = time.monotonic() - started
+        assert ok and fake.active_title
+        print(f"{appears * 1000:>9.0f} ms {FIXED_SLEEP * 1000:>9.0f} ms {'yes' if fixed_ok else 'NO':>7} {waited * 1000:>7.0f} ms {'yes':>7}")
+
+    fake = FakeWindowProvider()
+    fake.change_screen(after=0.12)
+    ready = Readiness(fake)
+    started = time.monotonic()
+    ready.wait_for_change("search box", before=fake.snapshot())
+    print(f"screen change after 120 ms noticed after {(time.monotonic() - started) * 1000:.0f} ms (fixed: 250 ms)")
+
+    fake = FakeWindowProvider()
+    started = time.monotonic()
+    ok = Readiness(fake).wait_for_window("whatsapp", "missing window", timeout=1.0)
+    print(f"missing window: gave up after {(time.monotonic() - started) * 1000:.0f} ms (ok={ok})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+import json
+import re
+import time
+from collections.abc import Iterable
+
+from vosk import KaldiRecognizer, Model
+
+from audio_buffer import cbuffer
+from intent_router import Intent
+
+UNKNOWN = "[unk]"
+# lowest per-word confidence a grammar result may have; anything less goes to the open-vocabulary decode
+MIN_CONFIDENCE = 0.8
+_PHRASE = re.compile(r"[a-z']+(?: [a-z']+)*")
+
+
+def command_phrases(
+    intents: list[Intent],
+    verbs: Iterable[str] = (),
+    apps: Iterable[str] = (),
+    models: Iterable[str] = (),
+    languages: Iterable[str] = (),
+    profiles: Iterable[str] = (),
+    extra: Iterable[str] = (),
+) -> list[str]:
+    # Everything a follow-up command can be said as without free text. Verbs that take free text
+    # ("search", "remember") are listed alone so the grammar answers "search [unk]" rather than
+    # forcing the closest known phrase; that [unk] is what sends the audio to the open decode.
+    phrases = set(verbs) | set(extra) | set(profiles)
+    for intent in intents:
+        phrases.update(intent.exact)
+    for app in apps:
+        phrases.update((app, f"open {app}"))
+    for model in models:
+        phrases.update((f"switch model to {model}", f"switch to {model} model", f"use {model} model"))
+    for language in languages:
+        phrases.update((f"speak in {language}", f"set language to {language}", f"switch language to {language}"))
+    return sorted(p for p in phrases if _PHRASE.fullmatch(p))
+
+
+class CommandDecoder:
+    # Decodes the utterance after the wake word with a grammar-restricted recognizer built from
+    # command_phrases(). The utterance audio is kept; when the grammar result contains an unknown
+    # word or a word below min_confidence, the open-vocabulary recognizer decodes the same audio
+    # and its text is used instead. Phrases with words the model does not know are left out.
+    def __init__(self, model: Model, sample_rate: int, phrases: list[str], fallback: KaldiRecognizer, min_confidence: float = MIN_CONFIDENCE):
+        self.phrases = [p for p in phrases if all(model.vosk_model_find_word(w) >= 0 for w in p.split())]
+        self.dropped = len(phrases) - len(self.phrases)
+        self.recognizer = KaldiRecognizer(model, sample_rate, json.dumps(self.phrases + [UNKNOWN]))
+        self.recognizer.SetWords(True)
+        self.fallback = fallback
+        self.min_confidence = min_confidence
+        self.last_decoder = ""
+        self.grammar_hits = 0
+        self.fallbacks = 0
+        self.grammar_seconds = 0.0
+        self.fallback_seconds = 0.0
+        self._audio: list[bytes] = []
+
+    def reset(self):
+        self.recognizer.Reset()
+        self._audio.clear()
+
+    def accept(self, data: memoryview | bytes) -> str | None:
+        # returns the command text at an endpoint, None while the utterance is still going
+        # ring-buffer slots are recycled, so the fallback keeps its own copy of the audio
+        self._audio.append(bytes(data))
+        started = time.perf_counter()
+        ended = self.recognizer.AcceptWaveform(cbuffer(data))
+        self.grammar_seconds += time.perf_counter() - started
+        if not ended:
+            return None
+        return self._settle(json.loads(self.recognizer.Result()))
+
+    def partial(self) -> str:
+        return json.loads(self.recognizer.PartialResult()).get("partial", "").strip()
+
+    def finish(self) -> str:
+        started = time.perf_counter()
+        result = json.loads(self.recognizer.FinalResult())
+        self.grammar_seconds += time.perf_counter() - started
+        return self._settle(result)
+
+    def confident(self, result: dict) -> bool:
+        words = result.get("result") or []
+        return bool(words) and all(w.get("word") != UNKNOWN and w.get("conf", 0.0) >= self.min_confidence for w in words)
+
+    def _settle(self, result: dict) -> str:
+        audio, self._audio = self._audio, []
+        self.recognizer.Reset()
+        if not result.get("text"):
+            # silence: nothing for the open decode to find either
+            return ""
+        if self.confident(result):
+            self.grammar_hits += 1
+            self.last_decoder = "grammar"
+            return result["text"].strip()
+        self.fallbacks += 1
+        self.last_decoder = "fallback"
+        started = time.perf_counter()
+        self.fallback.Reset()
+        if self.fallback.AcceptWaveform(b"".join(audio)):
+            text = json.loads(self.fallback.Result()).get("text", "")
+        else:
+            text = json.loads(self.fallback.FinalResult()).get("text", "")
+        self.fallback.Reset()
+        self.fallback_seconds += time.perf_counter() - started
+        return text.strip()
+
+    def summary(self) -> str:
+        total = self.grammar_hits + self.fallbacks
+        fallback_ms = self.fallback_seconds * 1000 / self.fallbacks if self.fallbacks else 0.0
+        return (
+            f"phrases={len(self.phrases)} dropped={self.dropped} commands={total} grammar={self.grammar_hits} "
+            f"fallback={self.fallbacks} decode={self.grammar_seconds * 1000:.0f}ms fallback_avg={fallback_ms:.0f}ms"
+        )
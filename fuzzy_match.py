@@ -0,0 +1,134 @@
+import re
+from typing import NamedTuple
+
+# spelling -> sound rewrites applied before comparing, so ASR spellings of the same sound meet
+_SOUNDS = [
+    ("ph", "f"), ("ght", "t"), ("ck", "k"), ("sch", "sk"), ("ch", "k"), ("sh", "s"), ("wh", "w"),
+    ("qu", "kw"), ("q", "k"), ("x", "ks"), ("dg", "j"), ("z", "s"),
+]
+_SOFT_C = re.compile(r"c(?=[eiy])")
+_VOWELS = re.compile(r"(?<!^)[aeiouy]+")
+_REPEATS = re.compile(r"(.)\1+")
+
+
+def compact(text: str) -> str:
+    # "Disc Cord" -> "disccord": ASR splits and joins words freely, so spaces carry no signal
+    return re.sub(r"[^a-z0-9]+", "", text.lower())
+
+
+def phonetic(text: str) -> str:
+    # rough sound key: "spot if i", "spotify" -> "spatafa"; "crome", "chrome" -> "krama"
+    key = compact(text)
+    for spelling, sound in _SOUNDS:
+        key = key.replace(spelling, sound)
+    key = _SOFT_C.sub("s", key).replace("c", "k")
+    # vowels are what recognizers get wrong most; keep only where they are
+    key = _VOWELS.sub("a", key)
+    return _REPEATS.sub(r"\1", key)
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    # Levenshtein distance, or limit + 1 as soon as it is certain to exceed limit
+    if a == b:
+        return 0
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    if len(a) < len(b):
+        a, b = b, a
+    if not b:
+        return len(a)
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        left = best = i
+        for j, cb in enumerate(b):
+            cost = previous[j] + (ca != cb)
+            if previous[j + 1] + 1 < cost:
+                cost = previous[j + 1] + 1
+            if left + 1 < cost:
+                cost = left + 1
+            current.append(cost)
+            left = cost
+            if cost < best:
+                best = cost
+        if best > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+def max_distance(key: str) -> int:
+    # short keys must sound the same; longer ones may be off by one or two edits
+    return (len(key) >= 5) + (len(key) >= 8)
+
+
+class FuzzyMatch(NamedTuple):
+    value: str
+    term: str
+    score: float
+
+
+def _bigrams(key: str) -> set[str]:
+    padded = f"^{key}$"
+    return {padded[i:i + 2] for i in range(len(padded) - 1)}
+
+
+class FuzzyMatcher:
+    # Phonetic keys of known terms (app names, aliases, command words) with a bigram index. Within
+    # k edits a key keeps all but at most 2k of its bigrams, so only keys sharing enough bigrams
+    # with the query get a (bounded) edit-distance check. Candidates are scored by both sound and
+    # spelling distance: 1.0 is an exact match.
+    def __init__(self, terms: dict[str, str] | None = None):
+        self._keys: dict[str, dict[str, str]] = {}
+        self._grams: dict[str, set[str]] = {}
+        self._exact: dict[str, FuzzyMatch] = {}
+        for term, value in (terms or {}).items():
+            self.add(term, value)
+
+    @property
+    def size(self) -> int:
+        return len(self._keys)
+
+    def add(self, term: str, value: str):
+        plain = compact(term)
+        if not plain:
+            return
+        self._exact.setdefault(plain, FuzzyMatch(value, term, 1.0))
+        key = phonetic(term)
+        if key not in self._keys:
+            for gram in _bigrams(key):
+                self._grams.setdefault(gram, set()).add(key)
+        self._keys.setdefault(key, {}).setdefault(term, value)
+
+    def match(self, query: str, limit: int = 3) -> list[FuzzyMatch]:
+        plain = compact(query)
+        if not plain:
+            return []
+        if plain in self._exact:
+            return [self._exact[plain]]
+        key = phonetic(query)
+        radius = max_distance(key)
+        grams = _bigrams(key)
+        need = len(grams) - 2 * radius
+        shared: dict[str, int] = {}
+        for gram in grams:
+            for candidate in self._grams.get(gram, ()):
+                shared[candidate] = shared.get(candidate, 0) + 1
+        found: dict[str, FuzzyMatch] = {}
+        for candidate, count in shared.items():
+            if count < need:
+                continue
+            d = edit_distance(key, candidate, radius)
+            if d > radius:
+                continue
+            for term, value in self._keys[candidate].items():
+                term_plain = compact(term)
+                spelled = edit_distance(plain, term_plain, len(plain) + len(term_plain))
+                score = 1 - (d / max(len(key), len(candidate)) + spelled / max(len(plain), len(term_plain))) / 2
+                if value not in found or score > found[value].score:
+                    found[value] = FuzzyMatch(value, term, round(score, 3))
+        return sorted(found.values(), key=lambda m: -m.score)[:limit]
+
+    def best(self, query: str, threshold: float = 0.8) -> FuzzyMatch | None:
+        matches = self.match(query, 1)
+        return matches[0] if matches and matches[0].score >= threshold else None
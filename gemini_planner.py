@@ -0,0 +1,223 @@
+import http.client
+import json
+import queue
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from urllib.parse import urlsplit
+
+GEMINI_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash:generateContent"
+
+
+class PlannerError(Exception):
+    pass
+
+
+def plan_key(command: str) -> str:
+    # "Open Chrome, and then ..." and "open chrome and then ..." share one cache entry
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", command.lower()).split())
+
+
+class ConnectionPool:
+    # Keep-alive HTTP(S) connections to one host, reused across planner calls so a plan
+    # after the first one skips the TCP + TLS handshake.
+    def __init__(self, url: str, size: int = 2, timeout: float = 20.0):
+        parts = urlsplit(url)
+        self.https = parts.scheme == "https"
+        self.host = parts.hostname
+        self.port = parts.port
+        self.path = parts.path or "/"
+        self.timeout = timeout
+        self._idle: queue.LifoQueue = queue.LifoQueue(maxsize=size)
+        self.opened = 0
+
+    def _connect(self) -> http.client.HTTPConnection:
+        self.opened += 1
+        cls = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+        return cls(self.host, self.port, timeout=self.timeout)
+
+    def post_json(self, query: str, payload: dict) -> dict:
+        body = json.dumps(payload).encode("utf-8")
+        headers = {"Content-Type": "application/json", "Connection": "keep-alive"}
+        target = f"{self.path}?{query}" if query else self.path
+        for attempt in range(2):
+            try:
+                conn = self._idle.get_nowait()
+                reused = True
+            except queue.Empty:
+                conn = self._connect()
+                reused = False
+            try:
+                conn.request("POST", target, body=body, headers=headers)
+                resp = conn.getresponse()
+                data = resp.read()
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                # the server may have dropped an idle keep-alive connection; retry once on a fresh one
+                if reused and attempt == 0:
+                    continue
+                raise
+            if resp.will_close:
+                conn.close()
+            else:
+                try:
+                    self._idle.put_nowait(conn)
+                except queue.Full:
+                    conn.close()
+            if resp.status != 200:
+                raise PlannerError(f"planner returned HTTP {resp.status}")
+            return json.loads(data.decode("utf-8"))
+        raise PlannerError("planner connection failed")
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class GeminiPlanner:
+    # Gemini step planner with a persistent plan cache (TTL + LRU bound, saved as JSON) and
+    # in-flight deduplication: concurrent requests for the same command share one HTTP call.
+    def __init__(
+        self,
+        endpoint: str = GEMINI_URL,
+        cache_path: Path | str | None = "plan_cache.json",
+        ttl: float = 7 * 24 * 3600,
+        max_entries: int = 200,
+        timeout: float = 20.0,
+    ):
+        self.endpoint = endpoint
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.pool = ConnectionPool(endpoint, timeout=timeout)
+        self._plans: OrderedDict[str, tuple[list[str], float]] = OrderedDict()
+        self._inflight: dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._load()
+
+    def is_cached(self, command: str) -> bool:
+        with self._lock:
+            entry = self._plans.get(plan_key(command))
+            return entry is not None and time.time() - entry[1] <= self.ttl
+
+    def cached(self, command: str) -> list[str] | None:
+        key = plan_key(command)
+        with self._lock:
+            entry = self._plans.get(key)
+            if entry is None:
+                return None
+            steps, stored_at = entry
+            if time.time() - stored_at > self.ttl:
+                del self._plans[key]
+                return None
+            self._plans.move_to_end(key)
+            self.hits += 1
+            return list(steps)
+
+    def plan(self, command: str, api_key: str) -> list[str]:
+        # raises PlannerError when the planner is unreachable or returns nothing usable
+        steps = self.cached(command)
+        if steps is not None:
+            return steps
+        key = plan_key(command)
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+        if not owner:
+            return list(future.result())
+
+        try:
+            steps = self._request(command, api_key)
+        except Exception as exc:
+            err = exc if isinstance(exc, PlannerError) else PlannerError(str(exc) or type(exc).__name__)
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(err)
+            if err is exc:
+                raise
+            raise err from exc
+        with self._lock:
+            self._plans[key] = (steps, time.time())
+            self._plans.move_to_end(key)
+            self._evict()
+            self._inflight.pop(key, None)
+        future.set_result(steps)
+        self._save()
+        return list(steps)
+
+    def _request(self, command: str, api_key: str) -> list[str]:
+        prompt = (
+            "You are planning desktop assistant actions. Return JSON only in the format "
+            "{\"steps\":[\"step one\",\"step two\"]}. Keep max 6 short action steps. "
+            f"User request: {command}"
+        )
+        payload = {
+            "contents": [{"parts": [{"text": prompt}]}],
+            "generationConfig": {"temperature": 0.2},
+        }
+        body = self.pool.post_json(f"key={api_key}", payload)
+        try:
+            text = body["candidates"][0]["content"]["parts"][0]["text"].strip()
+            # tolerate markdown fenced json
+            text = text.replace("```json", "").replace("```", "").strip()
+            steps = [x for x in json.loads(text).get("steps", []) if isinstance(x, str) and x.strip()]
+        except (KeyError, IndexError, TypeError, AttributeError, ValueError) as exc:
+            raise PlannerError("planner returned an unexpected response") from exc
+        if not steps:
+            raise PlannerError("planner returned no steps")
+        return steps[:6]
+
+    def _evict(self):
+        now = time.time()
+        for key in [k for k, (_s, at) in self._plans.items() if now - at > self.ttl]:
+            del self._plans[key]
+        while len(self._plans) > self.max_entries:
+            self._plans.popitem(last=False)
+
+    def _load(self):
+        if not self.cache_path or not self.cache_path.exists():
+            return
+        try:
+            data = json.loads(self.cache_path.read_text())
+            for key, entry in sorted(data.items(), key=lambda kv: kv[1]["used"]):
+                self._plans[key] = (list(entry["steps"]), float(entry["at"]))
+        except (OSError, ValueError, KeyError, TypeError):
+            return
+        self._evict()
+
+    def _save(self):
+        if not self.cache_path:
+            return
+        # plans finishing together would otherwise write the same .tmp file at once; the snapshot
+        # is taken under the save lock so the last write always has the newest plans
+        with self._save_lock:
+            with self._lock:
+                data = {key: {"steps": steps, "at": at, "used": i} for i, (key, (steps, at)) in enumerate(self._plans.items())}
+            try:
+                tmp = self.cache_path.with_suffix(".tmp")
+                tmp.write_text(json.dumps(data, indent=2))
+                tmp.replace(self.cache_path)
+            except OSError:
+                pass
+
+    def summary(self) -> str:
+        return f"hits={self.hits} misses={self.misses} coalesced={self.coalesced} cached={len(self._plans)} connections={self.pool.opened}"
+
+    def close(self):
+        self._save()
+        self.pool.close()
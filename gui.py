@@ -1,13 +1,43 @@
 import math
-import random
+import time
 import tkinter as tk
 
+import numpy as np
+
+from ui_bus import UIBus
+
+PARTICLES = 180
+
+# frame delays (ms) per animation mode: while active, after IDLE_AFTER s without speech or
+# UI changes, and after DEEP_IDLE_AFTER s
+ANIMATION_MODES = {
+    "full": (33, 100, 250),
+    "low-power": (100, 250, 1000),
+}
+IDLE_AFTER = 2.0
+DEEP_IDLE_AFTER = 60.0
+
 
 class JarvisGUI:
-    def __init__(self, on_submit):
+    def __init__(self, on_submit, show_fps: bool = False, animation: str = "full"):
         self.on_submit = on_submit
+        self.show_fps = show_fps
+        # "full", "low-power", or "off" (one still frame, no animation loop)
+        self.animation = animation
+        self.active_ms, self.idle_ms, self.deep_idle_ms = ANIMATION_MODES.get(animation, ANIMATION_MODES["low-power"])
+        self._last_activity = time.perf_counter()
+        self._after_id: str | None = None
+        self._frame_delay = 0
+        self.paused = False
+        # set_* / pulse_speaking may be called from any thread; the Tk thread applies them with the
+        # next frame, or right away when the bus wakes an idle / paused window (_on_ui_pending)
+        self.ui = UIBus(on_pending=self._notify_pending)
         self.phase = 0.0
         self.speaking_level = 0.0
+        self.frames = 0
+        self.frame_time_total = 0.0
+        self.frame_time_max = 0.0
+        self._fps_window = (time.perf_counter(), 0, 0.0)
 
         self.root = tk.Tk()
         self.root.title("JARVIS")
@@ -22,7 +52,12 @@ class JarvisGUI:
         self.mode_var = tk.StringVar(value="Listening for wake word")
 
         self._build_ui()
-        self._init_particles()
+        self._init_scene()
+        # stop drawing while nobody can see the orb
+        self.root.bind("<Unmap>", self._on_hidden, add="+")
+        self.root.bind("<Map>", self._on_shown, add="+")
+        self.orb.bind("<Visibility>", self._on_visibility)
+        self.root.bind("<<UIPending>>", self._on_ui_pending)
         self._animate_scene()
 
     def _build_ui(self) -> None:
@@ -83,89 +118,199 @@ class JarvisGUI:
         entry.bind("<Return>", self._on_submit)
         tk.Button(entry_wrap, text="SEND", command=self._on_submit, bg="#FF9E4A", fg="#1A0D03", relief="flat", padx=12, pady=6, font=("Segoe UI", 9, "bold")).pack(side="left", padx=(8, 0))
 
-    def _init_particles(self):
+    def _init_scene(self):
+        # every canvas item is created once here and only moved/recolored per frame
         self.cx, self.cy = 215, 190
-        self.particles = []
-        for _ in range(180):
-            angle = random.uniform(0, 2 * math.pi)
-            radius = random.uniform(55, 150)
-            speed = random.uniform(0.004, 0.018)
-            drift = random.uniform(-0.20, 0.20)
-            size = random.uniform(1.0, 3.0)
-            self.particles.append({"a": angle, "r": radius, "s": speed, "d": drift, "size": size})
+        rng = np.random.default_rng()
+        self.p_angle = rng.uniform(0, 2 * math.pi, PARTICLES)
+        self.p_radius = rng.uniform(55, 150, PARTICLES)
+        self.p_speed = rng.uniform(0.004, 0.018, PARTICLES)
+        self.p_drift = rng.uniform(-0.20, 0.20, PARTICLES)
+        self.p_size = rng.uniform(1.0, 3.0, PARTICLES)
+
+        wave_deg = np.arange(0, 360, 8)
+        self._wave_cos = np.cos(np.radians(wave_deg))
+        self._wave_sin = np.sin(np.radians(wave_deg))
+        self._wave_offset = wave_deg / 26.0
+
+        self._rings = [self.orb.create_oval(0, 0, 0, 0, outline=color, width=2) for color in ["#5F3112", "#8A4618", "#B85D23"]]
+        self._wave = self.orb.create_line(*([self.cx, self.cy] * len(wave_deg)), fill="#FFB066", width=2, smooth=True)
+        self._glow = "#FFB977"
+        self._particles = [self.orb.create_oval(0, 0, 0, 0, fill=self._glow, outline="", tags="particle") for _ in range(PARTICLES)]
+        self._core = self.orb.create_oval(0, 0, 0, 0, fill="#FF8E3B", outline="#FFD0A1", width=2)
+        self._fps_text = self.orb.create_text(8, 8, anchor="nw", fill="#8A6A4A", font=("Consolas", 8), text="", state="normal" if self.show_fps else "hidden")
 
     def _on_submit(self, _event=None):
         txt = self.input_var.get().strip()
         if not txt:
             return
         self.input_var.set("")
-        self.last_heard_var.set(f"Manual: {txt}")
+        self.set_heard(f"Manual: {txt}")
         self.on_submit(txt)
 
     def _animate_scene(self):
+        self._after_id = None
+        self.ui.drain()
+        started = time.perf_counter()
         self.phase += 0.12
-        self.orb.delete("all")
+        level = self.speaking_level
+        orb = self.orb
 
-        wave_amp = 12 + (28 * self.speaking_level)
-        ring_jitter = 5 + (9 * self.speaking_level)
+        wave_amp = 12 + (28 * level)
+        ring_jitter = 5 + (9 * level)
 
         # background rings
-        for i, color in enumerate(["#5F3112", "#8A4618", "#B85D23"]):
-            base = 60 + (i * 26)
-            dynamic = base + math.sin(self.phase + i) * ring_jitter
-            self.orb.create_oval(self.cx - dynamic, self.cy - dynamic, self.cx + dynamic, self.cy + dynamic, outline=color, width=2)
+        for i, ring in enumerate(self._rings):
+            dynamic = 60 + (i * 26) + math.sin(self.phase + i) * ring_jitter
+            orb.coords(ring, self.cx - dynamic, self.cy - dynamic, self.cx + dynamic, self.cy + dynamic)
 
         # waveform ring reacts to speaking
-        points = []
-        for deg in range(0, 360, 8):
-            a = math.radians(deg)
-            wav = math.sin((deg / 26.0) + (self.phase * 1.8)) * wave_amp
-            r = 95 + wav
-            x = self.cx + math.cos(a) * r
-            y = self.cy + math.sin(a) * r
-            points.extend([x, y])
-        self.orb.create_line(points, fill="#FFB066", width=2, smooth=True)
-
-        # particles
-        for p in self.particles:
-            p["a"] += p["s"] + (self.speaking_level * 0.012)
-            p["r"] += p["d"] + math.sin(self.phase + p["a"]) * 0.10
-            if p["r"] < 50:
-                p["r"] = 50
-                p["d"] = abs(p["d"])
-            if p["r"] > 170:
-                p["r"] = 170
-                p["d"] = -abs(p["d"])
-            x = self.cx + math.cos(p["a"]) * p["r"]
-            y = self.cy + math.sin(p["a"]) * p["r"]
-            glow = "#FFDAA8" if self.speaking_level > 0.15 else "#FFB977"
-            s = p["size"] + (self.speaking_level * 1.4)
-            self.orb.create_oval(x - s, y - s, x + s, y + s, fill=glow, outline="")
+        r = 95 + np.sin(self._wave_offset + (self.phase * 1.8)) * wave_amp
+        points = np.empty(r.size * 2)
+        points[0::2] = self.cx + self._wave_cos * r
+        points[1::2] = self.cy + self._wave_sin * r
+        orb.coords(self._wave, *points.tolist())
+
+        # particles: state lives in arrays and is stepped for all particles at once
+        self.p_angle += self.p_speed + (level * 0.012)
+        self.p_radius += self.p_drift + np.sin(self.phase + self.p_angle) * 0.10
+        low = self.p_radius < 50
+        high = self.p_radius > 170
+        self.p_radius[low] = 50
+        self.p_drift[low] = np.abs(self.p_drift[low])
+        self.p_radius[high] = 170
+        self.p_drift[high] = -np.abs(self.p_drift[high])
+        x = self.cx + np.cos(self.p_angle) * self.p_radius
+        y = self.cy + np.sin(self.p_angle) * self.p_radius
+        s = self.p_size + (level * 1.4)
+        for item, box in zip(self._particles, np.column_stack((x - s, y - s, x + s, y + s)).tolist()):
+            orb.coords(item, *box)
+        glow = "#FFDAA8" if level > 0.15 else "#FFB977"
+        if glow != self._glow:
+            self._glow = glow
+            orb.itemconfigure("particle", fill=glow)
 
         # core
-        core = 34 + math.sin(self.phase * 1.7) * (4 + (self.speaking_level * 8))
-        self.orb.create_oval(self.cx - core, self.cy - core, self.cx + core, self.cy + core, fill="#FF8E3B", outline="#FFD0A1", width=2)
+        core = 34 + math.sin(self.phase * 1.7) * (4 + (level * 8))
+        orb.coords(self._core, self.cx - core, self.cy - core, self.cx + core, self.cy + core)
 
         # decay speaking level (so voice wave fades)
         self.speaking_level = max(0.0, self.speaking_level - 0.035)
-        self.root.after(33, self._animate_scene)
+        self._count_frame(time.perf_counter() - started)
+        # an update applied above may already have scheduled the next frame (_wake)
+        if self.animation != "off" and not self.paused and self._after_id is None:
+            self._schedule(self._next_delay())
+
+    def _next_delay(self) -> int:
+        if self.speaking_level > 0:
+            return self.active_ms
+        idle = time.perf_counter() - self._last_activity
+        if idle < IDLE_AFTER:
+            return self.active_ms
+        return self.idle_ms if idle < DEEP_IDLE_AFTER else self.deep_idle_ms
+
+    def _schedule(self, delay_ms: int):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+        self._frame_delay = delay_ms
+        self._after_id = self.root.after(delay_ms, self._animate_scene)
+
+    def _wake(self):
+        # something changed: go back to the full frame rate now instead of after the idle delay
+        self._last_activity = time.perf_counter()
+        if self.animation != "off" and not self.paused and self._frame_delay > self.active_ms:
+            self._schedule(0)
+
+    def _pause(self):
+        self.paused = True
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _resume(self):
+        if self.paused:
+            self.paused = False
+            self._last_activity = time.perf_counter()
+            if self.animation != "off":
+                self._schedule(0)
+
+    def _on_hidden(self, event):
+        if event.widget is self.root:
+            self._pause()
+
+    def _on_shown(self, event):
+        if event.widget is self.root:
+            self._resume()
+
+    def _on_visibility(self, event):
+        # X11 reports when the window is fully covered by others
+        if event.state == "VisibilityFullyObscured":
+            self._pause()
+        else:
+            self._resume()
+
+    def _count_frame(self, took: float):
+        self.frames += 1
+        self.frame_time_total += took
+        self.frame_time_max = max(self.frame_time_max, took)
+        window_start, frames, busy = self._fps_window
+        frames += 1
+        busy += took
+        now = time.perf_counter()
+        if now - window_start >= 1.0:
+            if self.show_fps:
+                self.orb.itemconfigure(self._fps_text, text=f"{frames / (now - window_start):.0f} fps  {busy / frames * 1000:.2f} ms/frame")
+            self._fps_window = (now, 0, 0.0)
+        else:
+            self._fps_window = (window_start, frames, busy)
+
+    def frame_stats(self) -> str:
+        if not self.frames:
+            return "no frames rendered"
+        return f"frames={self.frames} frame_avg={self.frame_time_total / self.frames * 1000:.2f}ms frame_max={self.frame_time_max * 1000:.2f}ms"
 
     def toggle_always_on_top(self):
         self.always_on_top = not self.always_on_top
         self.root.attributes("-topmost", self.always_on_top)
         self.pin_button.configure(text="PIN ON" if self.always_on_top else "PIN OFF")
 
+    def _notify_pending(self):
+        # any thread: the bus just went from empty to non-empty
+        try:
+            self.root.event_generate("<<UIPending>>", when="tail")
+        except Exception:
+            pass  # window already destroyed
+
+    def _on_ui_pending(self, _event):
+        self.ui.drain()
+
+    def call(self, fn, *args, key: str | None = None):
+        # run fn on the Tk thread at the next tick; safe from any thread
+        self.ui.post(key, fn, *args)
+
     def set_speaking(self, active: bool):
-        self.speaking_level = 1.0 if active else max(self.speaking_level, 0.2)
+        self.ui.post("speaking", self._apply_speaking, active)
 
     def pulse_speaking(self, strength: float = 0.65):
-        self.speaking_level = max(self.speaking_level, min(1.0, strength))
+        self.ui.post("pulse", self._apply_pulse, strength)
 
     def set_status(self, text: str):
-        self.status_var.set(text)
+        self.ui.post("status", self._apply_text, self.status_var, text)
 
     def set_mode(self, text: str):
-        self.mode_var.set(text)
+        self.ui.post("mode", self._apply_text, self.mode_var, text)
 
     def set_heard(self, text: str):
-        self.last_heard_var.set(text)
+        self.ui.post("heard", self._apply_text, self.last_heard_var, text)
+
+    def _apply_speaking(self, active: bool):
+        self.speaking_level = 1.0 if active else max(self.speaking_level, 0.2)
+        self._wake()
+
+    def _apply_pulse(self, strength: float):
+        self.speaking_level = max(self.speaking_level, min(1.0, strength))
+        self._wake()
+
+    def _apply_text(self, var: tk.StringVar, text: str):
+        var.set(text)
+        self._wake()
@@ -0,0 +1,90 @@
+import heapq
+import itertools
+import threading
+import time
+
+
+class HeadlessLoop:
+    # The parts of Tk's root the assistant uses (after, after_cancel, mainloop, destroy) on a plain
+    # timer heap, so callbacks scheduled for "the UI thread" run on the main thread without a display.
+    def __init__(self):
+        self._timers: list[tuple] = []
+        self._ids = itertools.count(1)
+        self._cancelled: set[int] = set()
+        self._cond = threading.Condition()
+        self._destroyed = False
+
+    def after(self, ms: int, fn, *args) -> int:
+        with self._cond:
+            timer_id = next(self._ids)
+            heapq.heappush(self._timers, (time.monotonic() + ms / 1000, timer_id, fn, args))
+            self._cond.notify()
+        return timer_id
+
+    def after_cancel(self, timer_id: int):
+        with self._cond:
+            self._cancelled.add(timer_id)
+
+    def protocol(self, *_args):
+        pass
+
+    def mainloop(self):
+        while True:
+            with self._cond:
+                while not self._destroyed:
+                    if self._timers:
+                        wait = self._timers[0][0] - time.monotonic()
+                        if wait <= 0:
+                            break
+                        self._cond.wait(wait)
+                    else:
+                        self._cond.wait()
+                if self._destroyed:
+                    return
+                _due, timer_id, fn, args = heapq.heappop(self._timers)
+                if timer_id in self._cancelled:
+                    self._cancelled.discard(timer_id)
+                    continue
+            try:
+                fn(*args)
+            except Exception as exc:
+                print(f"[headless] callback failed: {exc}")
+
+    def destroy(self):
+        with self._cond:
+            self._destroyed = True
+            self._cond.notify_all()
+
+
+class HeadlessUI:
+    # Stands in for JarvisGUI when there is no display: same thread-safe update methods, but the
+    # latest status/mode/heard text is only kept in `state` (mode changes are also printed).
+    def __init__(self):
+        self.root = HeadlessLoop()
+        self.state = {"status": "", "mode": "", "heard": "", "speaking": False}
+        self._lock = threading.Lock()
+
+    def call(self, fn, *args, key: str | None = None):
+        self.root.after(0, fn, *args)
+
+    def _set(self, key: str, value) -> bool:
+        with self._lock:
+            changed = self.state[key] != value
+            self.state[key] = value
+        return changed
+
+    def set_status(self, text: str):
+        self._set("status", text)
+
+    def set_mode(self, text: str):
+        if self._set("mode", text):
+            print(f"[mode] {text}")
+
+    def set_heard(self, text: str):
+        self._set("heard", text)
+
+    def set_speaking(self, speaking: bool):
+        self._set("speaking", speaking)
+
+    def pulse_speaking(self, _level: float):
+        pass
@@ -0,0 +1,122 @@
+import re
+from dataclasses import dataclass
+from typing import NamedTuple
+
+_NAMED_GROUP = re.compile(r"\(\?P<\w+>")
+
+
+@dataclass(frozen=True)
+class Intent:
+    name: str
+    priority: int
+    exact: frozenset[str] = frozenset()
+    keywords: tuple[str, ...] = ()
+    pattern: str | None = None
+    catch_all: bool = False
+
+
+class IntentMatch(NamedTuple):
+    name: str
+    match: re.Match | None = None
+
+
+class IntentRouter:
+    # compiled once: exact phrases -> dict, all keywords -> one lookahead alternation,
+    # patterns -> priority-sorted regexes walked only while they can still win (lowest priority wins)
+    def __init__(self, intents: list[Intent]):
+        self.intents = sorted(intents, key=lambda i: i.priority)
+        self._exact: dict[str, Intent] = {}
+        keyword_owner: dict[str, Intent] = {}
+        self._patterns: list[tuple[Intent, re.Pattern]] = []
+        self._catch_all: Intent | None = None
+        self._bare = {intent.name: IntentMatch(intent.name) for intent in self.intents}
+
+        for intent in self.intents:
+            for phrase in intent.exact:
+                self._exact.setdefault(phrase, intent)
+            for kw in intent.keywords:
+                keyword_owner.setdefault(kw, intent)
+            if intent.pattern:
+                self._patterns.append((intent, re.compile(intent.pattern)))
+            if intent.catch_all and self._catch_all is None:
+                self._catch_all = intent
+
+        self._pattern_re: re.Pattern | None = None
+        if self._patterns:
+            self._pattern_re = re.compile("|".join(
+                f"(?P<_p{i}>{_NAMED_GROUP.sub('(', rx.pattern)})" for i, (_intent, rx) in enumerate(self._patterns)
+            ))
+
+        # A text containing keyword K also contains every keyword that is a substring of K,
+        # so K resolves to the best intent among them. With longest-first alternation the
+        # lookahead only reports the longest keyword per position; this keeps that exact.
+        self._keyword_intent: dict[str, Intent] = {}
+        for kw, owner in keyword_owner.items():
+            best = owner
+            for other, other_owner in keyword_owner.items():
+                if other in kw and other_owner.priority < best.priority:
+                    best = other_owner
+            self._keyword_intent[kw] = best
+
+        self._keyword_re: re.Pattern | None = None
+        self._keyword_scan: re.Pattern | None = None
+        if self._keyword_intent:
+            alternation = _trie_regex(list(self._keyword_intent))
+            self._keyword_re = re.compile(alternation)
+            self._keyword_scan = re.compile(f"(?=({alternation}))")
+
+    def route(self, cmd: str) -> IntentMatch | None:
+        best = self._exact.get(cmd)
+        best_match = None
+
+        first = self._keyword_re.search(cmd) if self._keyword_re is not None else None
+        if first is not None:
+            for hit in self._keyword_scan.finditer(cmd, first.start()):
+                intent = self._keyword_intent[hit.group(1)]
+                if best is None or intent.priority < best.priority:
+                    best = intent
+
+        # one combined match finds the first (highest priority) pattern that fits;
+        # only the winner is re-run on its own to get its capture groups
+        hit = self._pattern_re.match(cmd) if self._pattern_re is not None else None
+        if hit is not None:
+            intent, rx = self._patterns[int(hit.lastgroup[2:])]
+            if best is None or intent.priority < best.priority:
+                best, best_match = intent, rx.match(cmd)
+
+        if best is None:
+            best = self._catch_all
+        if best is None:
+            return None
+        if best_match is None:
+            return self._bare[best.name]
+        return IntentMatch(best.name, best_match)
+
+    def phrases(self) -> list[str]:
+        return sorted(self._exact)
+
+    def keywords(self) -> list[str]:
+        return sorted(self._keyword_intent)
+
+
+def _trie_regex(words: list[str]) -> str:
+    # factor shared prefixes so the regex engine does not retry every keyword at every offset;
+    # branches are longest-first, so at any offset the longest keyword is the one reported
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        optional = "" in node
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if optional:
+            return f"(?:{body})?"
+        return body
+
+    return build(trie)
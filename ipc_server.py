@@ -0,0 +1,258 @@
+import http.client
+import json
+import os
+import queue
+import socket
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from task_executor import current_task, on_settled, root_task
+
+DEFAULT_PORT = 8765
+
+
+class CommandSession:
+    # events for one command, in the order they happened; "done" is always last
+    def __init__(self, text: str):
+        self.text = text
+        self.events: queue.Queue = queue.Queue()
+        self.started = time.perf_counter()
+
+    def put(self, kind: str, **fields):
+        self.events.put({"type": kind, "ms": round((time.perf_counter() - self.started) * 1000, 1), **fields})
+
+
+# listen backlog: the socketserver default of 5 drops/retries connects from a burst of clients
+LISTEN_BACKLOG = 64
+
+
+class _TCPHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = LISTEN_BACKLOG
+
+
+class _UnixHTTPServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+    request_queue_size = LISTEN_BACKLOG
+
+
+class CommandServer:
+    # Local command API: POST /command streams what Jarvis says while handling the command as
+    # JSON lines ({"type": "say", ...}) instead of speaking it, ending with {"type": "done", ...}.
+    # GET /tasks lists running tasks and POST /cancel cancels one (body {"id": 3}) or all.
+    # Every line said by the command, its plan steps or the actions they start is routed back to
+    # that command's stream by the root of its task tree, so any number of clients can run at once.
+    def __init__(self, app, port: int | None = None, socket_path: Path | str | None = None, host: str = "127.0.0.1"):
+        self.app = app
+        self.port = port
+        self.socket_path = Path(socket_path) if socket_path else None
+        self.host = host
+        self._sessions: dict[int, CommandSession] = {}
+        self._lock = threading.Lock()
+        self._servers: list[socketserver.BaseServer] = []
+        self.latencies: list[float] = []
+
+    def start(self):
+        handler = self._handler()
+        if self.port is not None:
+            # events are small writes; don't let Nagle hold them back waiting for an ACK.
+            # TCP only: setting TCP_NODELAY on a Unix socket fails and resets the connection
+            tcp_handler = type("TCPHandler", (handler,), {"disable_nagle_algorithm": True})
+            server = _TCPHTTPServer((self.host, self.port), tcp_handler)
+            self.port = server.server_address[1]
+            self._servers.append(server)
+        if self.socket_path:
+            if self.socket_path.exists():
+                self.socket_path.unlink()
+            server = _UnixHTTPServer(str(self.socket_path), handler)
+            os.chmod(self.socket_path, 0o600)
+            self._servers.append(server)
+        for server in self._servers:
+            threading.Thread(target=server.serve_forever, name="ipc-server", daemon=True).start()
+
+    def describe(self) -> str:
+        where = []
+        if self.port is not None:
+            where.append(f"http://{self.host}:{self.port}")
+        if self.socket_path:
+            where.append(f"unix:{self.socket_path}")
+        return "listening on " + ", ".join(where)
+
+    def submit(self, text: str) -> CommandSession:
+        session = CommandSession(text)
+
+        def run():
+            task = current_task()
+            with self._lock:
+                self._sessions[task.id] = session
+            session.put("accepted", task=task.id)
+            self.app.behavior.handle_command(text)
+
+        # queued behind the same "command" slots as manual and voice commands
+        handle = self.app.executor.submit(run, name=text, resource="command")
+        on_settled(handle, lambda h: self._finish(session, h))
+        return session
+
+    def _finish(self, session: CommandSession, handle):
+        with self._lock:
+            self._sessions.pop(handle.id, None)
+            self.latencies.append(time.perf_counter() - session.started)
+        fields = {"status": handle.status}
+        if handle.error is not None:
+            fields["error"] = str(handle.error)
+        session.put("done", **fields)
+
+    def emit(self, kind: str, **fields) -> bool:
+        # called from whatever task is running; False when it does not belong to an IPC command
+        task = root_task()
+        if task is None:
+            return False
+        with self._lock:
+            session = self._sessions.get(task.id)
+        if session is None:
+            return False
+        session.put(kind, **fields)
+        return True
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *_args):
+                pass
+
+            def _body(self) -> dict:
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length).decode("utf-8", "replace") if length else ""
+                if self.headers.get("Content-Type", "").startswith("application/json"):
+                    try:
+                        data = json.loads(raw or "{}")
+                    except ValueError:
+                        return {}
+                    return data if isinstance(data, dict) else {}
+                return {"text": raw}
+
+            def _json(self, code: int, data: dict):
+                payload = json.dumps(data).encode()
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                if self.path == "/tasks":
+                    tasks = [{"id": t.id, "name": t.name, "status": t.status} for t in server.app.executor.active()]
+                    self._json(200, {"tasks": tasks})
+                else:
+                    self._json(404, {"error": "not found"})
+
+            def do_POST(self):
+                body = self._body()
+                if self.path == "/cancel":
+                    task_id = body.get("id")
+                    try:
+                        task_id = None if task_id in (None, "") else int(task_id)
+                    except (TypeError, ValueError):
+                        self._json(400, {"error": "id must be a task number"})
+                        return
+                    self._json(200, {"reply": server.app.cancel_tasks(task_id)})
+                    return
+                if self.path != "/command":
+                    self._json(404, {"error": "not found"})
+                    return
+                text = str(body.get("text") or "").strip()
+                if not text:
+                    self._json(400, {"error": "empty command"})
+                    return
+                session = server.submit(text)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                try:
+                    while True:
+                        event = session.events.get()
+                        line = (json.dumps(event) + "\n").encode()
+                        self.wfile.write(f"{len(line):x}\r\n".encode() + line + b"\r\n")
+                        self.wfile.flush()
+                        if event["type"] == "done":
+                            break
+                    self.wfile.write(b"0\r\n\r\n")
+                except OSError:
+                    # client went away; the command itself keeps running
+                    self.close_connection = True
+
+        return Handler
+
+    def summary(self) -> str:
+        with self._lock:
+            times = sorted(self.latencies)
+        if not times:
+            return "commands=0"
+        p50 = times[len(times) // 2] * 1000
+        p95 = times[min(len(times) - 1, int(len(times) * 0.95))] * 1000
+        return f"commands={len(times)} p50={p50:.1f}ms p95={p95:.1f}ms"
+
+    def close(self):
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+        self._servers = []
+        if self.socket_path and self.socket_path.exists():
+            self.socket_path.unlink()
+
+
+class _UnixConnection(http.client.HTTPConnection):
+    def __init__(self, path: str, timeout: float):
+        super().__init__("localhost", timeout=timeout)
+        self.path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.path)
+
+
+class _TCPConnection(http.client.HTTPConnection):
+    def connect(self):
+        super().connect()
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+
+class CommandClient:
+    # keep-alive client for scripts and load tests; one instance per thread
+    def __init__(self, port: int | None = DEFAULT_PORT, socket_path: Path | str | None = None, host: str = "127.0.0.1", timeout: float = 120.0):
+        if socket_path:
+            self.conn = _UnixConnection(str(socket_path), timeout)
+        else:
+            self.conn = _TCPConnection(host, port, timeout=timeout)
+
+    def _request(self, method: str, path: str, data: dict | None = None) -> http.client.HTTPResponse:
+        body = json.dumps(data).encode() if data is not None else None
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        self.conn.request(method, path, body=body, headers=headers)
+        return self.conn.getresponse()
+
+    def command(self, text: str):
+        # yields each event as it arrives
+        resp = self._request("POST", "/command", {"text": text})
+        if resp.status != 200:
+            raise RuntimeError(json.loads(resp.read() or b"{}").get("error", f"HTTP {resp.status}"))
+        for line in resp:
+            if line.strip():
+                yield json.loads(line)
+
+    def tasks(self) -> list[dict]:
+        return json.loads(self._request("GET", "/tasks").read())["tasks"]
+
+    def cancel(self, task_id: int | None = None) -> str:
+        return json.loads(self._request("POST", "/cancel", {"id": task_id}).read())["reply"]
+
+    def close(self):
+        self.conn.close()
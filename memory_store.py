@@ -1,41 +1,232 @@
 import json
+import os
+import re
+import threading
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+MAX_NOTES = 100
+
+BACKENDS = ("sqlite", "json")
+
+# durability modes: "async" hands writes to the OS (may lose the last interval on power loss),
+# "batch" fsyncs every flushed batch, "sync" also makes the caller wait until its write is on disk
+DURABILITY = ("async", "batch", "sync")
+
 
 class MemoryStore:
-    def __init__(self, path: Path | str = "jarvis_memory.json"):
+    # Snapshot (jarvis_memory.json) plus an append-only JSON Lines journal of changes since it.
+    # Writes update memory at once and are appended to the journal by a background flusher in
+    # batches; once the journal grows past compact_bytes it is folded into a new snapshot that
+    # replaces the old one atomically. Every record carries a sequence number so a crash between
+    # the snapshot rename and the journal reset never replays a change twice.
+    def __init__(
+        self,
+        path: Path | str = "jarvis_memory.json",
+        durability: str = "batch",
+        flush_interval: float = 0.2,
+        compact_bytes: int = 256 * 1024,
+    ):
+        if durability not in DURABILITY:
+            raise ValueError(f"durability must be one of {', '.join(DURABILITY)}")
         self.path = Path(path)
+        self.journal_path = self.path.with_name(self.path.name + ".journal")
+        self.durability = durability
+        self.flush_interval = flush_interval
+        self.compact_bytes = compact_bytes
+        self.last_error: Exception | None = None
+        self._seq = 0
+        self._committed = 0
+        self._pending: list[dict[str, Any]] = []
+        self._cond = threading.Condition()
+        self._io_lock = threading.Lock()
+        self._closed = False
+        self._journal = None
         self.data: dict[str, Any] = self._load()
+        self._flusher = threading.Thread(target=self._flush_loop, name="memory-flusher", daemon=True)
+        self._flusher.start()
 
     def _load(self) -> dict[str, Any]:
+        data: dict[str, Any] = {"notes": [], "prefs": {}}
         if self.path.exists():
             try:
-                return json.loads(self.path.read_text())
-            except Exception:
-                pass
-        return {"notes": [], "prefs": {}}
-
-    def save(self) -> None:
+                data = json.loads(self.path.read_text())
+            except (OSError, ValueError) as exc:
+                self._report(exc, "could not read snapshot")
+        data.setdefault("notes", [])
+        data.setdefault("prefs", {})
+        self._seq = int(data.pop("seq", 0))
         try:
-            self.path.write_text(json.dumps(self.data, indent=2))
-        except Exception:
+            with open(self.journal_path, "rb+") as f:
+                good = 0
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # torn final line from a crash mid-append: cut it off so new records start clean
+                        f.truncate(good)
+                        break
+                    good += len(line)
+                    if record.get("seq", 0) > self._seq:
+                        self._apply(data, record)
+                        self._seq = record["seq"]
+        except FileNotFoundError:
             pass
+        except OSError as exc:
+            self._report(exc, "could not read journal")
+        self._committed = self._seq
+        return data
+
+    @staticmethod
+    def _apply(data: dict[str, Any], record: dict[str, Any]):
+        if record["op"] == "note":
+            notes = data["notes"]
+            notes.append({"ts": record["ts"], "note": record["note"]})
+            if len(notes) > MAX_NOTES:
+                del notes[0]
+        elif record["op"] == "pref":
+            data["prefs"][record["key"]] = record["value"]
+
+    def _write(self, record: dict[str, Any]):
+        with self._cond:
+            self._seq += 1
+            record["seq"] = seq = self._seq
+            self._apply(self.data, record)
+            self._pending.append(record)
+            self._cond.notify_all()
+            if self.durability == "sync":
+                while self._committed < seq and not self._closed:
+                    self._cond.wait()
 
     def remember(self, note: str) -> None:
-        notes = self.data.setdefault("notes", [])
-        notes.append({"ts": datetime.now().isoformat(timespec="seconds"), "note": note})
-        self.data["notes"] = notes[-100:]
-        self.save()
+        self._write({"op": "note", "ts": datetime.now().isoformat(timespec="seconds"), "note": note})
+
+    def get_notes(self, limit: int = MAX_NOTES) -> list[dict[str, str]]:
+        return self.data.get("notes", [])[-limit:]
+
+    def count_notes(self) -> int:
+        return len(self.data.get("notes", []))
 
-    def get_notes(self) -> list[dict[str, str]]:
-        return self.data.get("notes", [])
+    def search(self, query: str, limit: int = 5) -> list[dict[str, str]]:
+        # plain scan is fine for MAX_NOTES notes: rank by matched words, newest first on ties
+        words = set(re.findall(r"[a-z0-9]+", query.lower()))
+        if not words:
+            return []
+        scored = []
+        for i, note in enumerate(self.get_notes()):
+            hits = len(words & set(re.findall(r"[a-z0-9]+", note["note"].lower())))
+            if hits:
+                scored.append((hits, i, note))
+        scored.sort(key=lambda s: (s[0], s[1]), reverse=True)
+        return [note for _hits, _i, note in scored[:limit]]
 
     def set_pref(self, key: str, value: str) -> None:
-        prefs = self.data.setdefault("prefs", {})
-        prefs[key] = value
-        self.save()
+        self._write({"op": "pref", "key": key, "value": value})
 
     def get_pref(self, key: str) -> str | None:
         return self.data.get("prefs", {}).get(key)
+
+    def get_prefs(self) -> dict[str, str]:
+        with self._cond:
+            return dict(self.data.get("prefs", {}))
+
+    def _flush_loop(self):
+        while True:
+            with self._cond:
+                if not self._pending and not self._closed:
+                    self._cond.wait()
+                if self.durability != "sync" and not self._closed:
+                    # group commit: let writes arriving within the interval share one append
+                    self._cond.wait(self.flush_interval)
+                closed = self._closed
+            self.flush()
+            if closed:
+                return
+
+    def flush(self) -> bool:
+        with self._io_lock:
+            with self._cond:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return True
+            try:
+                if self._journal is None:
+                    self._journal = open(self.journal_path, "a", encoding="utf-8")
+                self._journal.write("".join(json.dumps(r) + "\n" for r in batch))
+                self._journal.flush()
+                if self.durability != "async":
+                    os.fsync(self._journal.fileno())
+            except OSError as exc:
+                self._report(exc, "could not append to journal")
+                self._close_journal()
+                with self._cond:
+                    # keep the batch for the next attempt
+                    self._pending[:0] = batch
+                    if self.durability == "sync":
+                        self._cond.wait(self.flush_interval)
+                return False
+            with self._cond:
+                self._committed = batch[-1]["seq"]
+                self.last_error = None
+                self._cond.notify_all()
+            if self._journal.tell() >= self.compact_bytes:
+                self._compact()
+            return True
+
+    def _compact(self):
+        # caller holds _io_lock and the journal is fully flushed
+        with self._cond:
+            # everything applied in memory, pending records included; replay skips them by seq
+            snapshot = json.dumps({"seq": self._seq, "notes": list(self.data["notes"]), "prefs": dict(self.data["prefs"])})
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(snapshot)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+            self._close_journal()
+            open(self.journal_path, "w").close()
+        except OSError as exc:
+            self._report(exc, "could not compact journal")
+
+    def save(self) -> None:
+        # writes everything to disk now and folds the journal into the snapshot
+        self.flush()
+        with self._io_lock:
+            self._compact()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._flusher.join(timeout=5)
+        self.flush()
+        with self._io_lock:
+            if self._journal is not None and self._journal.tell():
+                # leave a single snapshot behind so the next start has no journal to replay
+                self._compact()
+            self._close_journal()
+
+    def _close_journal(self):
+        if self._journal is not None:
+            try:
+                self._journal.close()
+            except OSError:
+                pass
+            self._journal = None
+
+    def _report(self, exc: Exception, what: str):
+        # a failing disk retries every flush; only print when the error changes
+        if str(exc) != str(self.last_error):
+            print(f"[memory] {what}: {exc}")
+        self.last_error = exc
+
+
+def open_memory_store(backend: str = "sqlite", durability: str = "batch", json_path: Path | str = "jarvis_memory.json", db_path: Path | str = "jarvis_memory.db"):
+    if backend == "json":
+        return MemoryStore(json_path, durability=durability)
+    from sqlite_memory_store import SQLiteMemoryStore
+
+    return SQLiteMemoryStore(db_path, durability=durability, import_from=json_path)
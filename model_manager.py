@@ -0,0 +1,91 @@
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from vosk import Model
+
+# spoken / typed names for the installed models, matched against model folder names
+MODEL_ALIASES = {
+    "small": "small-en-us", "fast": "small-en-us",
+    "large": "en-us-0.22", "big": "en-us-0.22", "accurate": "en-us-0.22",
+    "indian": "en-in", "india": "en-in", "en in": "en-in",
+}
+
+
+def model_size_mb(path: Path) -> float:
+    # on-disk size is a close stand-in for resident size: Vosk maps the graph and AM into memory
+    return sum(p.stat().st_size for p in path.rglob("*") if p.is_file()) / (1024 * 1024)
+
+
+class ModelManager:
+    # LRU cache of loaded Vosk models bounded by an approximate memory budget.
+    # Concurrent requests for the same model share one load; the active model is never evicted.
+    def __init__(self, budget_mb: float = 4096.0):
+        self.budget_mb = budget_mb
+        self.active: Path | None = None
+        self._models: OrderedDict[Path, tuple[Model, float]] = OrderedDict()
+        self._loading: dict[Path, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def is_loaded(self, path: Path) -> bool:
+        with self._lock:
+            return path in self._models
+
+    def loaded(self) -> list[Path]:
+        with self._lock:
+            return list(self._models)
+
+    def used_mb(self) -> float:
+        with self._lock:
+            return sum(size for _model, size in self._models.values())
+
+    def get(self, path: Path) -> Model:
+        while True:
+            with self._lock:
+                if path in self._models:
+                    self._models.move_to_end(path)
+                    return self._models[path][0]
+                waiter = self._loading.get(path)
+                if waiter is None:
+                    waiter = self._loading[path] = threading.Event()
+                    break
+            waiter.wait()
+
+        try:
+            model = Model(str(path))
+            size = model_size_mb(path)
+            with self._lock:
+                self._models[path] = (model, size)
+                self._evict(keep=path)
+            return model
+        finally:
+            with self._lock:
+                self._loading.pop(path, None)
+            waiter.set()
+
+    def activate(self, path: Path) -> Model:
+        model = self.get(path)
+        with self._lock:
+            self.active = path
+            self._evict()
+        return model
+
+    def prewarm(self, path: Path) -> threading.Thread:
+        def load():
+            try:
+                self.get(path)
+            except Exception:
+                print(f"[models] could not pre-warm {path}")
+
+        thread = threading.Thread(target=load, daemon=True)
+        thread.start()
+        return thread
+
+    def _evict(self, keep: Path | None = None):
+        used = sum(size for _model, size in self._models.values())
+        for path in list(self._models):
+            if used <= self.budget_mb:
+                return
+            if path in {self.active, keep}:
+                continue
+            used -= self._models.pop(path)[1]
@@ -0,0 +1,93 @@
+import threading
+
+# value types for known preferences; anything else is kept as a string.
+# Values are stored as strings so the memory file format stays the same.
+PREF_TYPES = {
+    "chrome_profile": str,
+    "language": str,
+    "gemini_api_key": str,
+    "gemini_prompted": bool,
+}
+
+
+def _decode(kind, raw: str | None):
+    if raw is None:
+        return None
+    if kind is bool:
+        return raw.strip().lower() in {"yes", "true", "1", "on"}
+    try:
+        return kind(raw)
+    except (TypeError, ValueError):
+        return None
+
+
+def _encode(value) -> str:
+    if isinstance(value, bool):
+        return "yes" if value else "no"
+    return str(value)
+
+
+class Preferences:
+    # Typed in-memory view of the store's preferences. Reads never touch the store; writes update
+    # the cache at once, notify subscribers, and reach the store after `debounce` seconds so a burst
+    # of changes becomes one write. flush() (called from shutdown) writes anything still pending.
+    def __init__(self, store, debounce: float = 0.5, types: dict[str, type] | None = None):
+        self.store = store
+        self.debounce = debounce
+        self.types = dict(PREF_TYPES if types is None else types)
+        self._values = {key: _decode(self.types.get(key, str), raw) for key, raw in store.get_prefs().items()}
+        self._dirty: dict[str, object] = {}
+        self._observers: dict[str | None, list] = {}
+        self._timer: threading.Timer | None = None
+        self._lock = threading.Lock()
+        self.writes = 0
+
+    def get(self, key: str, default=None):
+        value = self._values.get(key)
+        return default if value is None else value
+
+    def set(self, key: str, value):
+        kind = self.types.get(key, str)
+        if value is not None and not isinstance(value, kind):
+            value = _decode(kind, _encode(value))
+        with self._lock:
+            if self._values.get(key) == value:
+                return
+            self._values[key] = value
+            self._dirty[key] = value
+            if self._timer is None:
+                self._timer = threading.Timer(self.debounce, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+            observers = self._observers.get(key, []) + self._observers.get(None, [])
+        for callback in observers:
+            try:
+                callback(key, value)
+            except Exception as exc:
+                print(f"[prefs] observer for {key} failed: {exc}")
+
+    def subscribe(self, key: str | None, callback):
+        # callback(key, value) runs on the setting thread; key=None watches every preference
+        with self._lock:
+            self._observers.setdefault(key, []).append(callback)
+
+        def unsubscribe():
+            with self._lock:
+                self._observers.get(key, []).remove(callback)
+
+        return unsubscribe
+
+    def flush(self):
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            dirty, self._dirty = self._dirty, {}
+        for key, value in dirty.items():
+            try:
+                self.store.set_pref(key, _encode(value))
+                self.writes += 1
+            except Exception as exc:
+                print(f"[prefs] could not save {key}: {exc}")
+                with self._lock:
+                    self._dirty.setdefault(key, value)
@@ -0,0 +1,255 @@
+import hashlib
+import shutil
+import subprocess
+import threading
+import time
+from dataclasses import dataclass
+
+from task_executor import cancelled
+
+try:
+    import pyautogui
+except Exception:
+    pyautogui = None
+
+try:
+    import pygetwindow
+except Exception:
+    pygetwindow = None
+
+# window title fragments to wait for after launching an app (lowercase); anything else uses its own name
+WINDOW_TITLES = {
+    "chrome": ("chrome", "chromium"),
+    "whatsapp": ("whatsapp",),
+    "notepad": ("notepad", "textedit", "gedit"),
+    "cmd": ("command prompt", "cmd.exe", "terminal"),
+    "terminal": ("command prompt", "cmd.exe", "terminal"),
+    "run": ("run",),
+    "vscode": ("visual studio code",),
+}
+
+FIRST_POLL = 0.02
+MAX_POLL = 0.25
+
+
+@dataclass
+class Window:
+    title: str
+    handle: object = None
+    id: object = None  # stable window id when the platform has one, else the title stands in
+    pid: int | None = None
+
+    @property
+    def key(self) -> object:
+        return self.id if self.id is not None else self.title
+
+
+class DesktopWindows:
+    # Real desktop: pygetwindow on Windows/macOS, wmctrl + xdotool on Linux/X11, pyautogui screenshots
+    # for region changes. available() is False when none of them work (e.g. Wayland without tools).
+    def __init__(self):
+        self.wmctrl = shutil.which("wmctrl")
+        self.xdotool = shutil.which("xdotool")
+
+    def available(self) -> bool:
+        return pygetwindow is not None or self.wmctrl is not None
+
+    def windows(self) -> list[Window]:
+        if pygetwindow is not None:
+            try:
+                return [Window(w.title, w, getattr(w, "_hWnd", None)) for w in pygetwindow.getAllWindows() if w.title]
+            except Exception:
+                return []
+        try:
+            out = subprocess.run([self.wmctrl, "-lp"], capture_output=True, text=True, timeout=1).stdout
+        except Exception:
+            return []
+        # "<id> <desktop> <pid> <host> <title...>"
+        return [
+            Window(parts[4], parts[0], int(parts[0], 16), int(parts[2]) or None)
+            for parts in (line.split(None, 4) for line in out.splitlines()) if len(parts) == 5
+        ]
+
+    def active(self) -> Window | None:
+        if pygetwindow is not None:
+            try:
+                w = pygetwindow.getActiveWindow()
+            except Exception:
+                return None
+            return Window(w.title, w, getattr(w, "_hWnd", None)) if w else None
+        if self.xdotool is None:
+            return None
+        try:
+            wid = int(subprocess.run([self.xdotool, "getactivewindow"], capture_output=True, text=True, timeout=1).stdout.strip())
+            title = subprocess.run([self.xdotool, "getwindowname", str(wid)], capture_output=True, text=True, timeout=1).stdout.strip()
+        except Exception:
+            return None
+        return Window(title, hex(wid), wid)
+
+    def activate(self, window: Window):
+        try:
+            if pygetwindow is not None:
+                window.handle.activate()
+            elif self.wmctrl is not None:
+                subprocess.run([self.wmctrl, "-i", "-a", hex(window.id) if isinstance(window.id, int) else str(window.handle)], timeout=1)
+        except Exception:
+            pass
+
+    def snapshot(self, region: tuple[int, int, int, int] | None = None) -> bytes | None:
+        if pyautogui is None:
+            return None
+        try:
+            return hashlib.blake2b(pyautogui.screenshot(region=region).tobytes(), digest_size=16).digest()
+        except Exception:
+            return None
+
+
+class FakeWindowProvider:
+    # Scripted stand-in for a desktop: windows appear (and the screen changes) at set times after
+    # the fake's clock starts, so readiness code can be exercised without a display.
+    def __init__(self):
+        self.started = time.monotonic()
+        self._windows: list[tuple[float, Window]] = []
+        self._changes: list[float] = []
+        self.active_title: str | None = None
+        self._active: Window | None = None
+
+    def open_window(self, title: str, after: float = 0.0, pid: int | None = None, active: bool = False) -> Window:
+        window = Window(title, id=len(self._windows) + 1, pid=pid)
+        self._windows.append((self.started + after, window))
+        if active:
+            self.activate(window)
+        return window
+
+    def change_screen(self, after: float = 0.0):
+        self._changes.append(self.started + after)
+
+    def available(self) -> bool:
+        return True
+
+    def windows(self) -> list[Window]:
+        now = time.monotonic()
+        return [window for at, window in self._windows if at <= now]
+
+    def active(self) -> Window | None:
+        return self._active
+
+    def activate(self, window: Window):
+        self._active = window
+        self.active_title = window.title
+
+    def snapshot(self, region=None) -> bytes | None:
+        now = time.monotonic()
+        return str(sum(1 for at in self._changes if at <= now)).encode()
+
+
+def poll(check, timeout: float, first: float = FIRST_POLL, limit: float = MAX_POLL):
+    # calls check() with exponential backoff until it returns something truthy, the deadline
+    # passes, or the running task is cancelled; returns check's last result
+    deadline = time.monotonic() + timeout
+    interval = first
+    while True:
+        result = check()
+        if result or cancelled():
+            return result
+        left = deadline - time.monotonic()
+        if left <= 0:
+            return result
+        time.sleep(min(interval, left))
+        interval = min(interval * 2, limit)
+
+
+class Readiness:
+    # Waits for what an action needs (a window, a screen change) instead of sleeping a fixed time.
+    # Without a usable provider each wait falls back to the old fixed delay. Every wait is timed
+    # per action so summary() shows how long actions really waited and how often they gave up.
+    def __init__(self, provider=None):
+        self.provider = provider or DesktopWindows()
+        self._stats: dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def _record(self, action: str, started: float, ok: bool):
+        with self._lock:
+            self._stats.setdefault(action, []).append((time.monotonic() - started, ok))
+
+    def windows_before(self) -> frozenset | None:
+        # take before launching: wait_for_window only accepts windows that are not in here
+        if not self.provider.available():
+            return None
+        keys = {w.key for w in self.provider.windows()}
+        active = self.provider.active()
+        if active is not None:
+            keys.add(active.key)
+        return frozenset(keys)
+
+    def wait_for_window(self, app: str, action: str, timeout: float = 10.0, fallback: float = 1.2, proc: subprocess.Popen | None = None, active_only: bool = False, before: frozenset | None = None) -> bool:
+        # true once a window shows up that was not open before the launch (see windows_before(), taken
+        # now when not given) or that belongs to proc; it is brought to the front. An already open
+        # window with a matching title (an old Notepad, Jarvis's own terminal) never counts. The
+        # title hints only pick between several new windows. active_only waits for the new window
+        # to be the focused one (dialogs that open on top, e.g. Run)
+        started = time.monotonic()
+        if not self.provider.available():
+            time.sleep(fallback)
+            self._record(action, started, not cancelled())
+            return not cancelled()
+        hints = WINDOW_TITLES.get(app, (app.lower(),))
+        if before is None:
+            before = self.windows_before()
+        pid = proc.pid if proc is not None else None
+
+        def fits(window: Window) -> bool:
+            return window.key not in before or (pid is not None and window.pid == pid)
+
+        def rank(window: Window, active: Window | None) -> tuple:
+            owned = pid is not None and window.pid == pid
+            return owned, any(h in window.title.lower() for h in hints), active is not None and window.key == active.key
+
+        def find():
+            if proc is not None and proc.poll() not in (None, 0):
+                # launcher already failed; nothing will show up
+                return "failed"
+            active = self.provider.active()
+            if active_only:
+                return active if active is not None and fits(active) else None
+            candidates = [w for w in self.provider.windows() if fits(w)]
+            if active is not None and fits(active) and all(w.key != active.key for w in candidates):
+                candidates.append(active)
+            if not candidates:
+                return None
+            window = max(candidates, key=lambda w: rank(w, active))
+            if active is None or window.key != active.key:
+                self.provider.activate(window)
+            return window
+
+        found = poll(find, timeout)
+        ok = isinstance(found, Window) and not cancelled()
+        self._record(action, started, ok)
+        return ok
+
+    def wait_for_change(self, action: str, timeout: float = 1.5, fallback: float = 0.5, region: tuple[int, int, int, int] | None = None, before: bytes | None = None) -> bool:
+        # true once the screen (or region) differs from `before` (taken now when not given)
+        started = time.monotonic()
+        before = before if before is not None else self.provider.snapshot(region)
+        if before is None:
+            time.sleep(fallback)
+            self._record(action, started, not cancelled())
+            return not cancelled()
+        changed = poll(lambda: self.provider.snapshot(region) != before, timeout)
+        self._record(action, started, bool(changed) and not cancelled())
+        return bool(changed)
+
+    def snapshot(self, region: tuple[int, int, int, int] | None = None) -> bytes | None:
+        return self.provider.snapshot(region)
+
+    def summary(self) -> str:
+        with self._lock:
+            stats = {k: list(v) for k, v in self._stats.items()}
+        if not stats:
+            return "no waits"
+        parts = []
+        for action, waits in sorted(stats.items()):
+            times = sorted(t for t, _ok in waits)
+            misses = sum(1 for _t, ok in waits if not ok)
+            parts.append(f"{action}: n={len(waits)} p50={times[len(times) // 2] * 1000:.0f}ms max={times[-1] * 1000:.0f}ms missed={misses}")
+        return "; ".join(parts)
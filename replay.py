@@ -0,0 +1,140 @@
+import csv
+import json
+import threading
+import time
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+
+from audio_files import iter_wav_blocks
+from vad import VoiceActivityGate
+
+ACK_TEXT = "Yes sir?"
+
+
+@dataclass
+class UtteranceTiming:
+    model: str
+    file: str
+    text: str = ""
+    decoder: str = ""
+    audio_end_to_final_ms: float | None = None
+    wake_to_ack_ms: float | None = None
+    command_to_first_tts_ms: float | None = None
+    wake_at: float | None = None
+    command_at: float | None = None
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 1)
+
+
+class ReplayMetrics:
+    # Collects per-utterance latencies from hooks in JarvisAssistant while recorded audio is replayed.
+    def __init__(self):
+        self.rows: list[UtteranceTiming] = []
+        self.model = ""
+        self.file = ""
+        self.last_voiced_at: float | None = None
+        self._lock = threading.Lock()
+        self._open: UtteranceTiming | None = None
+        self._last_final: UtteranceTiming | None = None
+        self._ack_row: UtteranceTiming | None = None
+        self._command_row: UtteranceTiming | None = None
+
+    def _row(self) -> UtteranceTiming:
+        if self._open is None:
+            self._open = UtteranceTiming(self.model, self.file)
+        return self._open
+
+    def on_audio(self, voiced: bool):
+        if voiced:
+            self.last_voiced_at = time.perf_counter()
+
+    def on_wake(self):
+        with self._lock:
+            row = self._row()
+            row.wake_at = time.perf_counter()
+            self._ack_row = row
+
+    def on_final(self, text: str, decoder: str = ""):
+        now = time.perf_counter()
+        with self._lock:
+            row = self._row()
+            row.text = text
+            row.decoder = decoder
+            if self.last_voiced_at is not None:
+                row.audio_end_to_final_ms = _ms(now - self.last_voiced_at)
+            self.rows.append(row)
+            self._open = None
+            self._last_final = row
+
+    def on_command(self):
+        with self._lock:
+            row = self._last_final or self._row()
+            row.command_at = time.perf_counter()
+            self._command_row = row
+
+    def on_tts_start(self, text: str):
+        now = time.perf_counter()
+        with self._lock:
+            if text == ACK_TEXT and self._ack_row is not None:
+                self._ack_row.wake_to_ack_ms = _ms(now - self._ack_row.wake_at)
+                self._ack_row = None
+            elif self._command_row is not None:
+                self._command_row.command_to_first_tts_ms = _ms(now - self._command_row.command_at)
+                self._command_row = None
+
+    def finish_file(self):
+        with self._lock:
+            if self._open is not None and self._open.wake_at is not None:
+                self.rows.append(self._open)
+            self._open = None
+            self._last_final = None
+            self.last_voiced_at = None
+
+    def write(self, path: Path):
+        columns = [f.name for f in fields(UtteranceTiming) if f.name not in {"wake_at", "command_at"}]
+        records = [{k: v for k, v in asdict(r).items() if k in columns} for r in self.rows]
+        if path.suffix.lower() == ".csv":
+            with path.open("w", newline="") as fh:
+                writer = csv.DictWriter(fh, fieldnames=columns)
+                writer.writeheader()
+                writer.writerows(records)
+        else:
+            path.write_text(json.dumps(records, indent=2))
+
+
+def replay_files(app, files: list[Path], speed: float, blocksize: int):
+    # Feeds wav blocks into the same _process_audio path the microphone uses.
+    # speed=1.0 is real time, 0 feeds as fast as the recognizer can take it.
+    metrics: ReplayMetrics = app.metrics
+    level_probe = VoiceActivityGate(app.sample_rate)
+    block_seconds = blocksize / app.sample_rate
+    for path in files:
+        metrics.file = path.name
+        app.awaiting_command = False
+        next_at = time.perf_counter()
+        for block in iter_wav_blocks(path, blocksize):
+            if app.stop_event.is_set():
+                return
+            if speed > 0:
+                next_at += block_seconds / speed
+                delay = next_at - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            metrics.on_audio(level_probe.frame_levels(block).max() >= level_probe.stop_db)
+            app._process_audio(block)
+        app._end_utterance()
+        metrics.finish_file()
+
+
+def wait_for_idle(app, timeout: float = 15.0, settle: float = 1.0):
+    # let running commands and queued speech finish before the report is written
+    deadline = time.monotonic() + timeout
+    quiet_since = time.monotonic()
+    while time.monotonic() < deadline:
+        if not app.tts_queue.empty() or app.tts_busy or app.executor.active():
+            quiet_since = time.monotonic()
+        elif time.monotonic() - quiet_since > settle:
+            return
+        time.sleep(0.05)
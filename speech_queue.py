@@ -0,0 +1,120 @@
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+URGENT = 0
+NORMAL = 1
+
+STATUS_MAX_AGE = 4.0
+
+# languages looked for in the installed TTS voices' names
+TTS_LANGUAGES = ["english", "hindi", "spanish", "french", "german", "italian", "japanese", "korean", "chinese", "arabic", "russian", "portuguese"]
+
+
+@dataclass(order=True)
+class SpeechItem:
+    priority: int
+    seq: int
+    text: str = field(compare=False)
+    key: str | None = field(default=None, compare=False)
+    queued_at: float = field(default_factory=time.perf_counter, compare=False)
+    started_at: float | None = field(default=None, compare=False)
+    cancelled: bool = field(default=False, compare=False)
+    interrupted: bool = field(default=False, compare=False)
+
+
+class SpeechQueue:
+    # Priority queue for TTS. Items sharing a key (status narration) replace each other while pending
+    # and are dropped if they went stale; URGENT items cut off whatever is being spoken (barge-in).
+    # on_interrupt is called from the putting thread and must stop the current playback.
+    def __init__(self, on_interrupt=None, history: int = 200):
+        self.on_interrupt = on_interrupt
+        self._heap: list[SpeechItem] = []
+        self._seq = itertools.count()
+        self._keyed: dict[str, SpeechItem] = {}
+        self._cond = threading.Condition(threading.Lock())
+        self.current: SpeechItem | None = None
+        self.history: deque[tuple[str, float, float, bool]] = deque(maxlen=history)
+        self.coalesced = 0
+        self.dropped = 0
+        self.interrupted = 0
+
+    def put(self, text: str, priority: int = NORMAL, key: str | None = None) -> SpeechItem:
+        item = SpeechItem(priority, next(self._seq), text, key)
+        with self._cond:
+            if key is not None:
+                superseded = self._keyed.get(key)
+                if superseded is not None and not superseded.cancelled:
+                    superseded.cancelled = True
+                    self.coalesced += 1
+                self._keyed[key] = item
+            heapq.heappush(self._heap, item)
+            self._cond.notify()
+            barge_in = priority == URGENT and self.current is not None and self.current.priority > URGENT
+        if barge_in:
+            self.interrupt()
+        return item
+
+    def get(self, timeout: float | None = None) -> SpeechItem | None:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                while self._heap:
+                    item = heapq.heappop(self._heap)
+                    if item.key is not None and self._keyed.get(item.key) is item:
+                        del self._keyed[item.key]
+                    if item.cancelled:
+                        continue
+                    if item.key is not None and time.perf_counter() - item.queued_at > STATUS_MAX_AGE:
+                        self.dropped += 1
+                        continue
+                    item.started_at = time.perf_counter()
+                    self.current = item
+                    return item
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+
+    def done(self, item: SpeechItem):
+        finished = time.perf_counter()
+        with self._cond:
+            if self.current is item:
+                self.current = None
+        started = item.started_at or finished
+        self.history.append((item.text, started - item.queued_at, finished - started, item.interrupted))
+
+    def interrupt(self):
+        with self._cond:
+            current = self.current
+            if current is None or current.interrupted:
+                return
+            current.interrupted = True
+            self.interrupted += 1
+        if self.on_interrupt:
+            self.on_interrupt()
+
+    def clear(self, keep_urgent: bool = True):
+        with self._cond:
+            for item in self._heap:
+                if not item.cancelled and not (keep_urgent and item.priority == URGENT):
+                    item.cancelled = True
+                    self.dropped += 1
+
+    def empty(self) -> bool:
+        with self._cond:
+            return not any(not item.cancelled for item in self._heap)
+
+    def summary(self) -> str:
+        spoken = list(self.history)
+        if not spoken:
+            return "no speech"
+        waits = sorted(w for _t, w, _s, _i in spoken)
+        speaks = sorted(s for _t, _w, s, _i in spoken)
+        return (
+            f"spoken={len(spoken)} wait_p50={waits[len(waits) // 2] * 1000:.0f}ms wait_max={waits[-1] * 1000:.0f}ms "
+            f"speak_p50={speaks[len(speaks) // 2] * 1000:.0f}ms coalesced={self.coalesced} dropped={self.dropped} interrupted={self.interrupted}"
+        )
@@ -0,0 +1,131 @@
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from memory_store import DURABILITY, MemoryStore
+
+SYNCHRONOUS = {"async": "OFF", "batch": "NORMAL", "sync": "FULL"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS notes (id INTEGER PRIMARY KEY, ts TEXT NOT NULL, note TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS prefs (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5(note, content='notes', content_rowid='id');
+CREATE TRIGGER IF NOT EXISTS notes_ai AFTER INSERT ON notes BEGIN
+    INSERT INTO notes_fts(rowid, note) VALUES (new.id, new.note);
+END;
+CREATE TRIGGER IF NOT EXISTS notes_ad AFTER DELETE ON notes BEGIN
+    INSERT INTO notes_fts(notes_fts, rowid, note) VALUES ('delete', old.id, old.note);
+END;
+"""
+
+
+class SQLiteMemoryStore:
+    # MemoryStore API on SQLite: every note is kept (no 100-note cap), nothing is loaded at startup,
+    # and notes are searchable through an FTS5 index ranked by bm25. WAL mode keeps writes cheap;
+    # durability maps onto PRAGMA synchronous. One connection shared behind a lock.
+    def __init__(self, path: Path | str = "jarvis_memory.db", durability: str = "batch", import_from: Path | str | None = None):
+        if durability not in DURABILITY:
+            raise ValueError(f"durability must be one of {', '.join(DURABILITY)}")
+        self.path = Path(path)
+        self.durability = durability
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(f"PRAGMA synchronous={SYNCHRONOUS[durability]}")
+        self._db.executescript(SCHEMA)
+        try:
+            self._db.executescript(FTS_SCHEMA)
+            self.fts = True
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5: recall falls back to LIKE scans
+            self.fts = False
+        if import_from:
+            self._import_json(Path(import_from))
+
+    def _import_json(self, path: Path):
+        # one-time migration of the JSON store (snapshot + journal) into this database
+        with self._lock:
+            if self._db.execute("SELECT 1 FROM meta WHERE key = 'imported_json'").fetchone():
+                return
+        if path.exists() or path.with_name(path.name + ".journal").exists():
+            old = MemoryStore(path)
+            old.close()
+            with self._lock, self._db:
+                self._db.execute("BEGIN")
+                self._db.executemany("INSERT INTO notes(ts, note) VALUES (?, ?)", [(n["ts"], n["note"]) for n in old.data["notes"]])
+                self._db.executemany("INSERT OR IGNORE INTO prefs(key, value) VALUES (?, ?)", list(old.data["prefs"].items()))
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO meta(key, value) VALUES ('imported_json', ?)", (str(path),))
+
+    def remember(self, note: str) -> None:
+        with self._lock:
+            self._db.execute("INSERT INTO notes(ts, note) VALUES (?, ?)", (datetime.now().isoformat(timespec="seconds"), note))
+
+    def get_notes(self, limit: int = 100) -> list[dict[str, str]]:
+        with self._lock:
+            rows = self._db.execute("SELECT ts, note FROM notes ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+        return [{"ts": ts, "note": note} for ts, note in reversed(rows)]
+
+    def count_notes(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM notes").fetchone()[0]
+
+    def search(self, query: str, limit: int = 5) -> list[dict[str, str]]:
+        words = re.findall(r"[a-z0-9]+", query.lower())
+        if not words:
+            return []
+        with self._lock:
+            if self.fts:
+                # notes with every word first; if none, any word. bm25 ranks rarer-word matches higher
+                terms = [f'"{w}"*' for w in words]
+                rows = []
+                for match in dict.fromkeys([" AND ".join(terms), " OR ".join(terms)]):
+                    rows = self._db.execute(
+                        "SELECT n.ts, n.note FROM notes_fts JOIN notes n ON n.id = notes_fts.rowid "
+                        "WHERE notes_fts MATCH ? ORDER BY rank LIMIT ?",
+                        (match, limit),
+                    ).fetchall()
+                    if rows:
+                        break
+            else:
+                clause = " AND ".join("note LIKE ?" for _ in words)
+                rows = self._db.execute(
+                    f"SELECT ts, note FROM notes WHERE {clause} ORDER BY id DESC LIMIT ?",
+                    (*[f"%{w}%" for w in words], limit),
+                ).fetchall()
+        return [{"ts": ts, "note": note} for ts, note in rows]
+
+    def set_pref(self, key: str, value: str) -> None:
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO prefs(key, value) VALUES (?, ?)", (key, value))
+
+    def get_pref(self, key: str) -> str | None:
+        with self._lock:
+            row = self._db.execute("SELECT value FROM prefs WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def get_prefs(self) -> dict[str, str]:
+        with self._lock:
+            return dict(self._db.execute("SELECT key, value FROM prefs"))
+
+    def flush(self) -> bool:
+        return True
+
+    def save(self) -> None:
+        with self._lock:
+            self._db.execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+    def close(self):
+        with self._lock:
+            try:
+                self._db.execute("PRAGMA optimize")
+            except sqlite3.Error:
+                pass
+            self._db.close()
+
@@ -0,0 +1,41 @@
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StartupProfile:
+    # Records how long each startup phase takes (across the main and loader threads)
+    # and prints one breakdown once every expected milestone has been reached.
+    def __init__(self, enabled: bool, origin: float, milestones: set[str]):
+        self.enabled = enabled
+        self.origin = origin
+        self.rows: list[tuple[str, float, float]] = []
+        self.milestones: dict[str, float] = {}
+        self._pending = set(milestones)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.rows.append((name, start - self.origin, time.perf_counter() - start))
+
+    def milestone(self, name: str):
+        with self._lock:
+            self.milestones[name] = time.perf_counter() - self.origin
+            self._pending.discard(name)
+            finished = not self._pending
+        if finished and self.enabled:
+            print(self.report())
+
+    def report(self) -> str:
+        with self._lock:
+            lines = [f"[startup] {'phase':<45}{'at':>9}{'took':>10}"]
+            for name, at, took in sorted(self.rows, key=lambda r: r[1]):
+                lines.append(f"  {name:<53}{at * 1000:>7.0f}ms{took * 1000:>8.0f}ms")
+            for name, at in sorted(self.milestones.items(), key=lambda m: m[1]):
+                lines.append(f"[startup] {name} after {at:.2f}s")
+        return "\n".join(lines)
@@ -0,0 +1,233 @@
+import itertools
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+TIMED_OUT = "timed out"
+
+_local = threading.local()
+
+
+def current_task() -> "TaskHandle | None":
+    return getattr(_local, "task", None)
+
+
+def cancelled() -> bool:
+    # cooperative check for long actions: true once the running task was cancelled or timed out
+    task = current_task()
+    return task is not None and task.cancel_event.is_set()
+
+
+def root_task(task: "TaskHandle | None" = None) -> "TaskHandle | None":
+    # the top-level task (usually a command) that the given or running task was submitted under
+    task = task or current_task()
+    while task is not None and task.parent is not None:
+        task = task.parent
+    return task
+
+
+class TaskHandle:
+    def __init__(self, task_id: int, name: str, fn, args: tuple, resource: str | None, timeout: float | None):
+        self.id = task_id
+        self.name = name
+        self.fn = fn
+        self.args = args
+        self.resource = resource
+        self.timeout = timeout
+        self.status = PENDING
+        self.result = None
+        self.error: BaseException | None = None
+        self.created_at = time.perf_counter()
+        self.started_at: float | None = None
+        self.finished_at: float | None = None
+        self.cancel_event = threading.Event()
+        self._done = threading.Event()
+        self._callbacks: list = []
+        self._lock = threading.Lock()
+        self.parent: TaskHandle | None = None
+        self.children: list[TaskHandle] = []
+
+    @property
+    def finished(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        return self._done.wait(timeout)
+
+    def add_done_callback(self, fn):
+        with self._lock:
+            if not self._done.is_set():
+                self._callbacks.append(fn)
+                return
+        fn(self)
+
+    def _finish(self, status: str):
+        with self._lock:
+            if self._done.is_set():
+                return
+            if self.status not in {CANCELLED, TIMED_OUT}:
+                self.status = status
+            self.finished_at = time.perf_counter()
+            self._done.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for cb in callbacks:
+            try:
+                cb(self)
+            except Exception:
+                pass
+
+    def describe(self) -> str:
+        return f"task {self.id} {self.name} ({self.status})"
+
+    def tree(self):
+        yield self
+        for child in list(self.children):
+            yield from child.tree()
+
+
+def on_settled(handle: TaskHandle, fn):
+    # calls fn(handle) once the task and every task it submitted (recursively) have finished
+    def finished(_h):
+        children = list(handle.children)
+        if not children:
+            fn(handle)
+            return
+        remaining = [len(children)]
+        lock = threading.Lock()
+
+        def child_settled(_c):
+            with lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            if last:
+                fn(handle)
+
+        for child in children:
+            on_settled(child, child_settled)
+
+    handle.add_done_callback(finished)
+
+
+class TaskExecutor:
+    # Bounded worker pool for commands and automation actions. Tasks that name a resource are
+    # held back until that resource has a free slot, so e.g. all keyboard/mouse work ("input",
+    # limit 1) runs strictly one at a time while unrelated tasks run in parallel.
+    def __init__(self, max_workers: int = 8, limits: dict[str, int] | None = None):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="jarvis-task")
+        self.limits = dict(limits or {})
+        self._ids = itertools.count(1)
+        self._tasks: dict[int, TaskHandle] = {}
+        self._running: dict[str, int] = {}
+        self._waiting: dict[str, deque[TaskHandle]] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, name: str | None = None, resource: str | None = None, timeout: float | None = None, on_done=None) -> TaskHandle:
+        handle = TaskHandle(next(self._ids), name or getattr(fn, "__name__", "task"), fn, args, resource, timeout)
+        if on_done:
+            handle.add_done_callback(on_done)
+        parent = current_task()
+        if parent is not None:
+            handle.parent = parent
+            parent.children.append(handle)
+        with self._lock:
+            self._tasks[handle.id] = handle
+            if resource is not None and self._running.get(resource, 0) >= self.limits.get(resource, 1 << 30):
+                self._waiting.setdefault(resource, deque()).append(handle)
+                return handle
+            if resource is not None:
+                self._running[resource] = self._running.get(resource, 0) + 1
+        self._pool.submit(self._run, handle)
+        return handle
+
+    def _run(self, handle: TaskHandle):
+        # checked and set under the handle lock, so a cancel() racing with the start is never lost
+        with handle._lock:
+            skip = handle.cancel_event.is_set()
+            if not skip:
+                handle.status = RUNNING
+                handle.started_at = time.perf_counter()
+        if skip:
+            handle._finish(CANCELLED)
+            self._release(handle)
+            return
+        timer = None
+        if handle.timeout:
+            timer = threading.Timer(handle.timeout, self._expire, args=(handle,))
+            timer.daemon = True
+            timer.start()
+        _local.task = handle
+        try:
+            handle.result = handle.fn(*handle.args)
+            handle._finish(DONE)
+        except Exception as exc:
+            handle.error = exc
+            handle._finish(FAILED)
+        finally:
+            _local.task = None
+            if timer:
+                timer.cancel()
+            self._release(handle)
+
+    def _expire(self, handle: TaskHandle):
+        with handle._lock:
+            if not handle.finished:
+                handle.status = TIMED_OUT
+                handle.cancel_event.set()
+
+    def _release(self, handle: TaskHandle):
+        nxt = None
+        skipped = []
+        with self._lock:
+            self._tasks.pop(handle.id, None)
+            if handle.resource is None:
+                return
+            queue = self._waiting.get(handle.resource)
+            while queue:
+                candidate = queue.popleft()
+                if candidate.cancel_event.is_set():
+                    self._tasks.pop(candidate.id, None)
+                    skipped.append(candidate)
+                    continue
+                nxt = candidate
+                break
+            if nxt is None:
+                self._running[handle.resource] -= 1
+        for t in skipped:
+            t._finish(CANCELLED)
+        if nxt is not None:
+            self._pool.submit(self._run, nxt)
+
+    def cancel(self, task_id: int | None = None) -> list[TaskHandle]:
+        # cancels one task, or every active task except the caller's own
+        me = current_task()
+        with self._lock:
+            targets = [t for t in self._tasks.values() if (task_id is None and t is not me) or t.id == task_id]
+        for t in targets:
+            with t._lock:
+                if not t.finished:
+                    t.status = CANCELLED
+                    t.cancel_event.set()
+        dropped = []
+        with self._lock:
+            for queue in self._waiting.values():
+                for t in [t for t in queue if t.cancel_event.is_set()]:
+                    queue.remove(t)
+                    self._tasks.pop(t.id, None)
+                    dropped.append(t)
+        for t in dropped:
+            t._finish(CANCELLED)
+        return targets
+
+    def active(self) -> list[TaskHandle]:
+        with self._lock:
+            return sorted(self._tasks.values(), key=lambda t: t.id)
+
+    def shutdown(self):
+        self.cancel()
+        self._pool.shutdown(wait=False, cancel_futures=True)
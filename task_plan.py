@@ -0,0 +1,167 @@
+import threading
+import time
+from dataclasses import dataclass
+
+from task_executor import CANCELLED, DONE, FAILED, PENDING, RUNNING, cancelled, on_settled
+
+SKIPPED = "skipped"
+
+# Step kinds. A step waits for every earlier step whose kind is in WAITS_ON[kind];
+# BARRIER steps wait for everything before them and hold back everything after.
+FREE = "free"
+LAUNCH = "launch"
+INPUT = "input"
+SHELL = "shell"
+MEMORY_READ = "memory read"
+MEMORY_WRITE = "memory write"
+BARRIER = "barrier"
+
+WAITS_ON = {
+    FREE: set(),
+    # launching steals focus, so it must not start while something is being typed
+    LAUNCH: {INPUT},
+    # typing goes to the focused window: wait for earlier launches and earlier typing
+    INPUT: {LAUNCH, INPUT},
+    SHELL: {SHELL},
+    MEMORY_READ: {MEMORY_WRITE},
+    MEMORY_WRITE: {MEMORY_READ, MEMORY_WRITE},
+}
+
+
+@dataclass
+class PlanStep:
+    index: int
+    text: str
+    kind: str
+    needs: frozenset[int]
+    status: str = PENDING
+    started_at: float | None = None
+    finished_at: float | None = None
+
+    @property
+    def duration(self) -> float:
+        if self.started_at is None or self.finished_at is None:
+            return 0.0
+        return self.finished_at - self.started_at
+
+
+class TaskPlan:
+    # Dependency graph for a chained command. Steps run as executor tasks as soon as the steps they
+    # need have settled (their own task and everything it submitted finished), so independent steps
+    # overlap and dependent ones start the moment their inputs are really done.
+    def __init__(self):
+        self.steps: list[PlanStep] = []
+        self.started_at: float | None = None
+        self.finished_at: float | None = None
+        self._cond = threading.Condition()
+        self._settled: dict[int, bool] = {}
+        self._launched: set[int] = set()
+
+    @classmethod
+    def build(cls, texts: list[str], kind_of) -> "TaskPlan":
+        plan = cls()
+        plan.extend(texts, kind_of)
+        return plan
+
+    def extend(self, texts: list[str], kind_of):
+        with self._cond:
+            for text in texts:
+                kind = kind_of(text)
+                if kind == BARRIER:
+                    needs = {s.index for s in self.steps}
+                else:
+                    waits = WAITS_ON.get(kind, set())
+                    needs = {s.index for s in self.steps if s.kind in waits}
+                    barriers = [s.index for s in self.steps if s.kind == BARRIER]
+                    if barriers:
+                        needs.add(barriers[-1])
+                self.steps.append(PlanStep(len(self.steps) + 1, text, kind, frozenset(needs)))
+
+    def replace_pending(self, texts: list[str], kind_of, same=lambda a, b: a == b) -> int:
+        # swaps the not-yet-started steps for a new plan; new steps that repeat a step already
+        # launched (wherever they appear in the new plan) are dropped, so nothing runs twice.
+        # Each launched step absorbs at most one new step. Returns how many launched steps the new plan kept.
+        with self._cond:
+            self.steps = [s for s in self.steps if s.index in self._launched]
+            unmatched = list(self.steps)
+            fresh = []
+            for text in texts:
+                match = next((s for s in unmatched if same(s.text, text)), None)
+                if match is None:
+                    fresh.append(text)
+                else:
+                    unmatched.remove(match)
+            self.extend(fresh, kind_of)
+        return len(texts) - len(fresh)
+
+    def launch(self, step: PlanStep, executor, run_step, on_start=None):
+        def finished(handle):
+            ok = all(t.status == DONE for t in handle.tree())
+            with self._cond:
+                step.finished_at = time.perf_counter()
+                step.status = DONE if ok else (CANCELLED if handle.status == CANCELLED else FAILED)
+                self._settled[step.index] = ok
+                self._cond.notify()
+
+        with self._cond:
+            if self.started_at is None:
+                self.started_at = time.perf_counter()
+            self._launched.add(step.index)
+            step.status = RUNNING
+            step.started_at = time.perf_counter()
+        if on_start:
+            on_start(step)
+        handle = executor.submit(run_step, step.text, name=f"step {step.index}: {step.text}")
+        on_settled(handle, finished)
+        return handle
+
+    def run(self, executor, run_step, on_start=None) -> "TaskPlan":
+        with self._cond:
+            if self.started_at is None:
+                self.started_at = time.perf_counter()
+            while len(self._settled) < len(self.steps):
+                if cancelled():
+                    for step in self.steps:
+                        if step.index not in self._launched:
+                            step.status = CANCELLED
+                    break
+                for step in self.steps:
+                    if step.index in self._launched or not step.needs <= self._settled.keys():
+                        continue
+                    if not all(self._settled[i] for i in step.needs):
+                        self._launched.add(step.index)
+                        step.status = SKIPPED
+                        self._settled[step.index] = False
+                        continue
+                    self.launch(step, executor, run_step, on_start)
+                self._cond.wait(0.2)
+        self.finished_at = time.perf_counter()
+        return self
+
+    @property
+    def wall_time(self) -> float:
+        if self.started_at is None or self.finished_at is None:
+            return 0.0
+        return self.finished_at - self.started_at
+
+    @property
+    def serial_time(self) -> float:
+        # what the same steps would have taken back to back
+        return sum(s.duration for s in self.steps)
+
+    def blocked_by(self, step: PlanStep) -> list[int]:
+        return sorted(i for i in step.needs if self._step(i).status != DONE)
+
+    def _step(self, index: int) -> PlanStep:
+        return self.steps[index - 1]
+
+    def summary(self) -> str:
+        wall = self.wall_time
+        serial = self.serial_time
+        speedup = f" ({serial / wall:.1f}x)" if wall > 0 and serial > 0 else ""
+        lines = [f"[plan] {len(self.steps)} steps in {wall:.2f}s, serial {serial:.2f}s{speedup}"]
+        for s in self.steps:
+            needs = ",".join(str(i) for i in sorted(s.needs)) or "-"
+            at = f"+{s.started_at - self.started_at:.2f}s" if s.started_at is not None else "-"
+            lines.append(f"  {s.index}. {s.text:<36} {s.kind:<12} needs {needs:<6} start {at:<7} took {s.duration:.2f}s {s.status}")
+        return "\n".join(lines)
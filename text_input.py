@@ -0,0 +1,138 @@
+import random
+import threading
+import time
+
+from task_executor import cancelled
+
+try:
+    import pyautogui
+except Exception:
+    pyautogui = None
+
+try:
+    import pyperclip
+except Exception:
+    pyperclip = None
+
+STRATEGIES = ("auto", "clipboard", "bulk", "human")
+
+# "auto" picks per target: short single-line fields are typed in one go, longer free text is pasted
+TARGET_STRATEGY = {
+    "address bar": "bulk",
+    "run dialog": "bulk",
+    "whatsapp search": "bulk",
+    "whatsapp message": "clipboard",
+    "terminal": "bulk",
+    "cmd": "bulk",
+}
+LONG_TEXT = 40
+
+CLIPBOARD_RESTORE_DELAY = 0.5
+
+
+class TextInjector:
+    # Enters text into the focused window with one of three strategies:
+    #   clipboard: copy + paste shortcut (any length costs about the same; the clipboard is restored)
+    #   bulk:      every key sent back to back with no per-key delay
+    #   human:     one key at a time with a jittered delay, like before (cancellable between keys)
+    # Characters per second are tracked per strategy and printed on exit.
+    def __init__(self, system: str, strategy: str = "auto", interval: float = 0.06, jitter: float = 0.4):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"typing strategy must be one of {', '.join(STRATEGIES)}")
+        self.system = system
+        self.strategy = strategy
+        self.interval = interval
+        self.jitter = jitter
+        self._stats: dict[str, list] = {}
+        self._lock = threading.Lock()
+        self._saved_clipboard: str | None = None
+        self._restore: threading.Timer | None = None
+
+    def choose(self, text: str, target: str | None) -> str:
+        strategy = self.strategy
+        if strategy == "auto":
+            strategy = TARGET_STRATEGY.get(target or "") or ("clipboard" if len(text) > LONG_TEXT else "bulk")
+        if strategy == "bulk" and not self._typeable(text):
+            # pyautogui silently drops keys it has no name for (accents, emoji, ...)
+            strategy = "clipboard"
+        if strategy == "clipboard" and pyperclip is None:
+            strategy = "bulk"
+        return strategy
+
+    @staticmethod
+    def _typeable(text: str) -> bool:
+        keys = pyautogui.KEYBOARD_KEYS if pyautogui else ()
+        return all(ch in keys for ch in text)
+
+    def type(self, text: str, target: str | None = None) -> bool:
+        # returns False when cancelled part-way through
+        if not text:
+            return True
+        strategy = self.choose(text, target)
+        started = time.perf_counter()
+        if strategy == "clipboard":
+            done = self._paste(text, target)
+        elif strategy == "bulk":
+            pyautogui.write(text, interval=0)
+            done = True
+        else:
+            done = self._type_humanized(text)
+        with self._lock:
+            stats = self._stats.setdefault(strategy, [0, 0, 0.0])
+            stats[0] += 1
+            stats[1] += len(text)
+            stats[2] += time.perf_counter() - started
+        return done
+
+    def _type_humanized(self, text: str) -> bool:
+        for ch in text:
+            if cancelled():
+                return False
+            pyautogui.write(ch)
+            time.sleep(max(0.0, self.interval * random.uniform(1 - self.jitter, 1 + self.jitter)))
+        return True
+
+    def _paste_keys(self, target: str | None) -> tuple[str, ...]:
+        if self.system == "darwin":
+            return ("command", "v")
+        if self.system == "linux" and target in {"terminal", "cmd"}:
+            return ("ctrl", "shift", "v")
+        return ("ctrl", "v")
+
+    def _paste(self, text: str, target: str | None) -> bool:
+        with self._lock:
+            if self._restore is not None:
+                # a restore from the previous paste is still pending; keep the user's original clipboard
+                self._restore.cancel()
+            else:
+                try:
+                    self._saved_clipboard = pyperclip.paste()
+                except Exception:
+                    self._saved_clipboard = None
+            pyperclip.copy(text)
+            pyautogui.hotkey(*self._paste_keys(target))
+            # apps read the clipboard asynchronously after the shortcut; restore a little later
+            self._restore = threading.Timer(CLIPBOARD_RESTORE_DELAY, self._restore_clipboard)
+            self._restore.daemon = True
+            self._restore.start()
+        return True
+
+    def _restore_clipboard(self):
+        with self._lock:
+            self._restore = None
+            saved, self._saved_clipboard = self._saved_clipboard, None
+        if saved is not None:
+            try:
+                pyperclip.copy(saved)
+            except Exception:
+                pass
+
+    def summary(self) -> str:
+        with self._lock:
+            stats = {k: list(v) for k, v in self._stats.items()}
+        if not stats:
+            return "nothing typed"
+        return " ".join(
+            f"{name}: n={n} chars={chars} cps={chars / seconds if seconds else float('inf'):.0f}"
+            for name, (n, chars, seconds) in sorted(stats.items())
+        )
@@ -0,0 +1,172 @@
+import hashlib
+import threading
+import wave
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+
+@dataclass
+class Clip:
+    samples: np.ndarray
+    sample_rate: int
+
+    @property
+    def nbytes(self) -> int:
+        return self.samples.nbytes
+
+
+class PhraseCache:
+    # Pre-rendered TTS audio keyed by (text, voice, rate). Clips live in an in-memory LRU bounded
+    # by max_bytes and are mirrored as wav files in cache_dir (at most max_files / max_bytes, oldest
+    # used dropped first) so the next start only reads them back. Besides the warmed fixed replies,
+    # a short reply without numbers (those are times, counts, ids) is rendered once it repeats.
+    # Rendering needs the pyttsx3 engine, so it happens on the TTS worker thread while it is idle.
+    def __init__(
+        self,
+        cache_dir: Path | str = "tts_cache",
+        max_bytes: int = 32 * 1024 * 1024,
+        max_files: int = 256,
+        repeat_threshold: int = 2,
+        max_chars: int = 80,
+        max_tracked: int = 512,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self.repeat_threshold = repeat_threshold
+        self.max_chars = max_chars
+        self.max_tracked = max_tracked
+        self._clips: OrderedDict[str, Clip] = OrderedDict()
+        self._bytes = 0
+        # miss counts of recent uncached replies, LRU-bounded by max_tracked
+        self._misses: OrderedDict[str, int] = OrderedDict()
+        self._disk_files = 0
+        self._disk_bytes = 0
+        self._pending: OrderedDict[str, tuple[str, str, int]] = OrderedDict()
+        self._failed: set[str] = set()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.miss_count = 0
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._prune_disk()
+        except OSError:
+            pass
+
+    @staticmethod
+    def key(text: str, voice: str, rate: int) -> str:
+        return hashlib.sha1(f"{voice}|{rate}|{text}".encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.wav"
+
+    def get(self, text: str, voice: str, rate: int) -> Clip | None:
+        key = self.key(text, voice, rate)
+        with self._lock:
+            clip = self._clips.get(key)
+            if clip is not None:
+                self._clips.move_to_end(key)
+                self.hits += 1
+                return clip
+        clip = self._read(self._path(key))
+        with self._lock:
+            if clip is None:
+                self.miss_count += 1
+                if not self.reusable(text):
+                    return None
+                seen = self._misses.pop(key, 0) + 1
+                if seen >= self.repeat_threshold:
+                    if key not in self._failed:
+                        self._pending.setdefault(key, (text, voice, rate))
+                else:
+                    self._misses[key] = seen
+                    if len(self._misses) > self.max_tracked:
+                        self._misses.popitem(last=False)
+                return None
+            self.hits += 1
+            self._store(key, clip)
+        return clip
+
+    def reusable(self, text: str) -> bool:
+        return len(text) <= self.max_chars and not any(c.isdigit() for c in text)
+
+    def warm(self, phrases: list[str] | tuple[str, ...], voice: str, rate: int):
+        with self._lock:
+            for text in phrases:
+                key = self.key(text, voice, rate)
+                if key not in self._clips and key not in self._failed:
+                    self._pending.setdefault(key, (text, voice, rate))
+
+    def has_pending(self) -> bool:
+        return bool(self._pending)
+
+    def render_next(self, engine) -> bool:
+        # renders one queued phrase with the given engine; returns False when nothing was pending
+        with self._lock:
+            if not self._pending:
+                return False
+            key, (text, voice, rate) = self._pending.popitem(last=False)
+        path = self._path(key)
+        clip = self._read(path)
+        written = clip is None
+        if written:
+            try:
+                engine.save_to_file(text, str(path))
+                engine.runAndWait()
+            except Exception:
+                pass
+            clip = self._read(path)
+        with self._lock:
+            if clip is None:
+                self._failed.add(key)
+            else:
+                self._store(key, clip, path if written else None)
+        return True
+
+    def _store(self, key: str, clip: Clip, written: Path | None = None):
+        if key in self._clips:
+            self._bytes -= self._clips.pop(key).nbytes
+        self._clips[key] = clip
+        self._bytes += clip.nbytes
+        while self._bytes > self.max_bytes and len(self._clips) > 1:
+            _old, evicted = self._clips.popitem(last=False)
+            self._bytes -= evicted.nbytes
+        if written is not None:
+            # a new file on disk: count it and prune once the folder is over its limits
+            try:
+                self._disk_files += 1
+                self._disk_bytes += written.stat().st_size
+                if self._disk_files > self.max_files or self._disk_bytes > self.max_bytes:
+                    self._prune_disk()
+            except OSError:
+                pass
+
+    def _read(self, path: Path) -> Clip | None:
+        try:
+            with wave.open(str(path), "rb") as wf:
+                if wf.getsampwidth() != 2 or not wf.getnframes():
+                    return None
+                samples = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+                clip = Clip(samples.reshape(-1, wf.getnchannels()), wf.getframerate())
+            path.touch()
+            return clip
+        except (OSError, EOFError, wave.Error):
+            return None
+
+    def _prune_disk(self):
+        # reads touch their file, so the newest mtimes are the most recently used clips
+        files = sorted(((p, p.stat()) for p in self.cache_dir.glob("*.wav")), key=lambda f: f[1].st_mtime, reverse=True)
+        kept = size = 0
+        for path, st in files:
+            if kept < self.max_files and size + st.st_size <= self.max_bytes:
+                kept += 1
+                size += st.st_size
+            else:
+                path.unlink(missing_ok=True)
+        self._disk_files, self._disk_bytes = kept, size
+
+    def summary(self) -> str:
+        return f"hits={self.hits} misses={self.miss_count} clips={len(self._clips)} memory={self._bytes / 1024:.0f}KB"
@@ -0,0 +1,52 @@
+import threading
+
+
+class UIBus:
+    # Thread-safe queue of UI updates for the Tk thread to apply in one batch per tick.
+    # Keyed updates replace a still-pending update with the same key (only the latest status,
+    # heard text, mode, ... is applied) and keep their original place in the order.
+    # on_pending is called (from the posting thread) when the bus goes from empty to non-empty,
+    # so the Tk thread only needs waking once per batch.
+    def __init__(self, on_pending=None):
+        self.on_pending = on_pending
+        self._pending: dict[object, tuple] = {}
+        self._lock = threading.Lock()
+        self._anon = 0
+        self.posted = 0
+        self.merged = 0
+        self.applied = 0
+        self.batches = 0
+
+    def post(self, key: str | None, fn, *args):
+        with self._lock:
+            self.posted += 1
+            was_empty = not self._pending
+            if key is None:
+                self._anon += 1
+                key = ("anon", self._anon)
+            elif key in self._pending:
+                self.merged += 1
+            self._pending[key] = (fn, args)
+        if was_empty and self.on_pending:
+            self.on_pending()
+
+    def pending(self) -> bool:
+        return bool(self._pending)
+
+    def drain(self) -> int:
+        # call on the Tk thread only
+        if not self._pending:
+            return 0
+        with self._lock:
+            batch, self._pending = self._pending, {}
+        for fn, args in batch.values():
+            try:
+                fn(*args)
+            except Exception as exc:
+                print(f"[ui] update failed: {exc}")
+        self.applied += len(batch)
+        self.batches += 1
+        return len(batch)
+
+    def summary(self) -> str:
+        return f"posted={self.posted} applied={self.applied} merged={self.merged} batches={self.batches}"
@@ -0,0 +1,118 @@
+import argparse
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+from audio_files import iter_wav_blocks, wav_files, wav_sample_rate
+
+
+@dataclass
+class GateResult:
+    frames: list[memoryview | bytes] = field(default_factory=list)
+    started: bool = False
+    ended: bool = False
+
+
+class VoiceActivityGate:
+    # Energy gate with hysteresis: speech starts when any 20ms frame in a block reaches start_db
+    # and ends after hangover_ms below stop_db. Silent blocks are held as pre-roll and dropped.
+    def __init__(
+        self,
+        sample_rate: int,
+        start_db: float = -42.0,
+        stop_db: float = -48.0,
+        hangover_ms: int = 500,
+        preroll_ms: int = 300,
+        frame_ms: int = 20,
+    ):
+        self.sample_rate = sample_rate
+        self.start_db = start_db
+        self.stop_db = stop_db
+        self.frame_len = max(1, sample_rate * frame_ms // 1000)
+        self.hangover_samples = sample_rate * hangover_ms // 1000
+        self.preroll_samples = sample_rate * preroll_ms // 1000
+
+        self.active = False
+        self._quiet_samples = 0
+        self._preroll: deque[bytes] = deque()
+        self._preroll_len = 0
+        self.total_samples = 0
+        self.skipped_samples = 0
+        self.utterances = 0
+
+    @property
+    def skipped_fraction(self) -> float:
+        return self.skipped_samples / self.total_samples if self.total_samples else 0.0
+
+    def frame_levels(self, data: memoryview | bytes) -> np.ndarray:
+        pcm = np.frombuffer(data, dtype=np.int16)
+        usable = len(pcm) - len(pcm) % self.frame_len
+        frames = pcm[:usable].reshape(-1, self.frame_len) if usable else pcm.reshape(1, -1)
+        frames = frames.astype(np.float32)
+        rms = np.sqrt(np.mean(frames * frames, axis=1))
+        return 20.0 * np.log10(np.maximum(rms, 1.0) / 32768.0)
+
+    def process(self, data: memoryview | bytes) -> GateResult:
+        samples = len(data) // 2
+        if not samples:
+            return GateResult()
+        self.total_samples += samples
+        levels = self.frame_levels(data)
+
+        if not self.active:
+            if levels.max() < self.start_db:
+                self._hold(data, samples)
+                return GateResult()
+            self.active = True
+            self._quiet_samples = 0
+            self.utterances += 1
+            frames = [*self._preroll, data]
+            self.skipped_samples -= self._preroll_len
+            self._preroll.clear()
+            self._preroll_len = 0
+            return GateResult(frames, started=True)
+
+        loud = np.flatnonzero(levels >= self.stop_db)
+        if loud.size:
+            self._quiet_samples = (len(levels) - 1 - int(loud[-1])) * self.frame_len
+        else:
+            self._quiet_samples += samples
+        if self._quiet_samples >= self.hangover_samples:
+            self.active = False
+            self._quiet_samples = 0
+            return GateResult([data], ended=True)
+        return GateResult([data])
+
+    def _hold(self, data: memoryview | bytes, samples: int):
+        self.skipped_samples += samples
+        # ring-buffer slots are recycled, so pre-roll keeps its own copy
+        self._preroll.append(bytes(data))
+        self._preroll_len += samples
+        while self._preroll and self._preroll_len - len(self._preroll[0]) // 2 >= self.preroll_samples:
+            self._preroll_len -= len(self._preroll.popleft()) // 2
+
+    def summary(self) -> str:
+        seconds = self.total_samples / self.sample_rate
+        return f"skipped {self.skipped_fraction * 100:.1f}% of {seconds:.1f}s audio across {self.utterances} utterance(s)"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report how much recorded audio the Jarvis VAD gate would drop")
+    parser.add_argument("wav", type=Path, help="Mono 16-bit wav file, or a directory of them")
+    parser.add_argument("--start-db", type=float, default=-42.0)
+    parser.add_argument("--stop-db", type=float, default=-48.0)
+    parser.add_argument("--hangover-ms", type=int, default=500)
+    parser.add_argument("--preroll-ms", type=int, default=300)
+    args = parser.parse_args()
+
+    for path in wav_files(args.wav):
+        gate = VoiceActivityGate(wav_sample_rate(path), args.start_db, args.stop_db, args.hangover_ms, args.preroll_ms)
+        for block in iter_wav_blocks(path):
+            gate.process(block)
+        print(f"{path.name}: {gate.summary()}")
+
+
+if __name__ == "__main__":
+    main()
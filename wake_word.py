@@ -0,0 +1,134 @@
+import argparse
+import json
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from vosk import KaldiRecognizer, Model
+
+from audio_buffer import cbuffer
+from audio_files import iter_wav_blocks, wav_files, wav_sample_rate
+
+WAKE_WORD = "jarvis"
+
+
+@dataclass
+class WakeEvent:
+    audio_position: float  # seconds of audio consumed when the wake word fired
+    word_end: float | None  # end of the wake word in the audio, when the recognizer reports it
+    detect_latency: float  # wall-clock seconds from receiving the triggering block to firing
+
+    @property
+    def audio_latency(self) -> float | None:
+        return None if self.word_end is None else self.audio_position - self.word_end
+
+
+class WakeWordDetector:
+    # Grammar-restricted recognizer that only knows the wake word, so idle audio never
+    # reaches the large-vocabulary decoder. Keeps the last few blocks as pre-roll so the
+    # full recognizer can still hear "jarvis open discord" spoken as one utterance.
+    def __init__(self, model: Model, sample_rate: int, wake_word: str = WAKE_WORD, preroll_blocks: int = 2, block_bytes: int = 8000):
+        self.wake_word = wake_word
+        self.sample_rate = sample_rate
+        self.recognizer = KaldiRecognizer(model, sample_rate, json.dumps([wake_word, "[unk]"]))
+        self.recognizer.SetWords(True)
+        # ring-buffer slots are recycled, so pre-roll is copied into its own preallocated slots
+        # (no allocation per idle block); take_preroll() only materializes them when the wake word fires
+        self.block_bytes = block_bytes
+        self._preroll = bytearray(preroll_blocks * block_bytes)
+        self._preroll_lengths = [0] * preroll_blocks
+        self._preroll_next = 0
+        self._preroll_count = 0
+        self.samples_seen = 0
+        self.events: list[WakeEvent] = []
+
+    def accept(self, data: memoryview | bytes, received_at: float | None = None) -> WakeEvent | None:
+        if received_at is None:
+            received_at = time.perf_counter()
+        self._keep(data)
+        self.samples_seen += len(data) // 2
+
+        word_end = None
+        if self.recognizer.AcceptWaveform(cbuffer(data)):
+            result = json.loads(self.recognizer.Result())
+            words = [w for w in result.get("result", []) if w.get("word") == self.wake_word]
+            if not words:
+                return None
+            word_end = float(words[-1]["end"])
+        # the grammar only has two tokens, so a substring check on the raw partial avoids json parsing
+        elif self.wake_word not in self.recognizer.PartialResult():
+            return None
+
+        event = WakeEvent(
+            audio_position=self.samples_seen / self.sample_rate,
+            word_end=word_end,
+            detect_latency=time.perf_counter() - received_at,
+        )
+        self.events.append(event)
+        self.recognizer.Reset()
+        return event
+
+    def finish(self) -> WakeEvent | None:
+        # utterance boundary: flush whatever the decoder still holds, then start clean
+        result = json.loads(self.recognizer.FinalResult())
+        self.reset()
+        words = [w for w in result.get("result", []) if w.get("word") == self.wake_word]
+        if not words:
+            return None
+        event = WakeEvent(audio_position=self.samples_seen / self.sample_rate, word_end=float(words[-1]["end"]), detect_latency=0.0)
+        self.events.append(event)
+        return event
+
+    def _keep(self, data: memoryview | bytes):
+        n = len(data)
+        if n > self.block_bytes:
+            # larger blocks than planned for: grow the slots once
+            self.block_bytes = n
+            self._preroll = bytearray(len(self._preroll_lengths) * n)
+            self._preroll_count = 0
+        idx = self._preroll_next
+        start = idx * self.block_bytes
+        self._preroll[start:start + n] = data
+        self._preroll_lengths[idx] = n
+        self._preroll_next = (idx + 1) % len(self._preroll_lengths)
+        self._preroll_count = min(self._preroll_count + 1, len(self._preroll_lengths))
+
+    def take_preroll(self) -> list[bytes]:
+        slots = len(self._preroll_lengths)
+        frames = []
+        for i in range(self._preroll_next - self._preroll_count, self._preroll_next):
+            idx = i % slots
+            start = idx * self.block_bytes
+            frames.append(bytes(self._preroll[start:start + self._preroll_lengths[idx]]))
+        self._preroll_count = 0
+        return frames
+
+    def reset(self):
+        self.recognizer.Reset()
+        self._preroll_count = 0
+
+
+def detect_in_wav(model: Model, path: Path | str, blocksize: int = 4000) -> list[WakeEvent]:
+    detector = WakeWordDetector(model, wav_sample_rate(path))
+    for block in iter_wav_blocks(path, blocksize):
+        detector.accept(block)
+    return detector.events
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the Jarvis wake-word stage over recorded audio")
+    parser.add_argument("--model-path", type=Path, required=True, help="Path to Vosk model folder (contains am/ and conf/)")
+    parser.add_argument("wav", type=Path, help="Mono 16-bit wav file, or a directory of them")
+    args = parser.parse_args()
+
+    model = Model(str(args.model_path))
+    for path in wav_files(args.wav):
+        events = detect_in_wav(model, path)
+        print(f"{path.name}: {len(events)} wake event(s)")
+        for e in events:
+            audio = f"{e.audio_latency * 1000:.0f}ms" if e.audio_latency is not None else "n/a"
+            print(f"  at {e.audio_position:.2f}s detect={e.detect_latency * 1000:.1f}ms audio_lag={audio}")
+
+
+if __name__ == "__main__":
+    main()